@@ -1,9 +1,10 @@
-from fastapi import Header, HTTPException
+from fastapi import Header, HTTPException, Request
 from core.config import get_settings
 from models.response import ApiResponse
 from fastapi import status
 from services.template_service import TemplateService
 from services.share_service import ShareService
+from services.job_queue import JobQueue
 
 async def verify_api_key(api_key: str = Header(alias="api-key", description="API Key for authentication")):
     """API anahtarını doğrular."""
@@ -28,10 +29,17 @@ async def verify_api_key(api_key: str = Header(alias="api-key", description="API
         )
     return api_key
 
-def get_template_service() -> TemplateService:
-    """Template servisi için dependency fonksiyonu."""
-    return TemplateService()
+def get_template_service(request: Request) -> TemplateService:
+    """Template servisi için dependency fonksiyonu.
+    Servis lifespan sırasında bir kez oluşturulup app.state üzerinde tutulur."""
+    return request.app.state.template_service
 
-def get_share_service() -> ShareService:
-    """Paylaşım servisi için dependency fonksiyonu."""
-    return ShareService() 
\ No newline at end of file
+def get_share_service(request: Request) -> ShareService:
+    """Paylaşım servisi için dependency fonksiyonu.
+    Servis lifespan sırasında bir kez oluşturulup app.state üzerinde tutulur."""
+    return request.app.state.share_service
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Görsel üretim iş kuyruğu için dependency fonksiyonu.
+    Kuyruk lifespan sırasında bir kez oluşturulup app.state üzerinde tutulur."""
+    return request.app.state.job_queue
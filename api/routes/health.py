@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from core.config import get_settings
 from core.version import __version__, __build__, __author__, __description__
 from models.response import ApiResponse
+from services.artifact_store import get_artifact_store
 
 router = APIRouter()
 
@@ -20,7 +21,8 @@ async def root():
 async def health():
     """Servis sağlık durumunu döndürür. :)"""
     settings = get_settings()
-    
+    artifact_store = get_artifact_store()
+
     return ApiResponse.success_response(
         data={
             "status": "healthy",
@@ -29,6 +31,8 @@ async def health():
             "environment": settings.ENVIRONMENT,
             "service": "graficast",
             "author": __author__,
-            "description": __description__
+            "description": __description__,
+            # Görsel deposu isabet/kaçırma sayaçları ve boyutu (kapasite planlaması için)
+            "artifact_store": artifact_store.stats() if artifact_store is not None else None
         }
     )
\ No newline at end of file
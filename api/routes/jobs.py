@@ -0,0 +1,75 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from models.job import BatchImageJobResponse, ImageJobResponse
+from models.share import GenerateImageRequest
+from db.models import ApiShare
+from services.job_queue import JobQueue, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED
+from models.response import ApiResponse
+from api.dependencies import verify_api_key, get_job_queue
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    dependencies=[Depends(verify_api_key)]
+)
+
+JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED)
+
+
+@router.post("/image-create", response_model=ApiResponse[ImageJobResponse], status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_image_create(
+        request: GenerateImageRequest,
+        job_queue: JobQueue = Depends(get_job_queue)
+) -> ApiResponse[ImageJobResponse]:
+    """Görsel oluşturma işini kuyruğa ekler ve hemen iş bilgisini döndürür.
+    Sonuç GET /jobs/{job_id} ile takip edilir; tamamlanan işte güncel paylaşım kaydı döner."""
+    try:
+        job = await job_queue.enqueue(ApiShare(**request.model_dump()))
+        return ApiResponse.success_response(
+            data=ImageJobResponse.from_document(job),
+            message="İş kuyruğa eklendi",
+            code=status.HTTP_202_ACCEPTED
+        )
+    except Exception as e:
+        return ApiResponse.error_response(
+            message=str(e),
+            code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.get("/{job_id}", response_model=ApiResponse[ImageJobResponse])
+async def get_job(
+        job_id: str,
+        job_queue: JobQueue = Depends(get_job_queue)
+) -> ApiResponse[ImageJobResponse]:
+    """İşin durumunu getirir."""
+    job = await job_queue.get(job_id)
+    if not job:
+        return ApiResponse.error_response(
+            message=f"İş bulunamadı: {job_id}",
+            code=status.HTTP_404_NOT_FOUND
+        )
+    return ApiResponse.success_response(
+        data=ImageJobResponse.from_document(job),
+        code=status.HTTP_200_OK
+    )
+
+
+@router.get("/", response_model=ApiResponse[BatchImageJobResponse])
+async def list_jobs(
+        job_status: Optional[str] = Query(None, alias="status", description="queued, running, succeeded veya failed"),
+        comment_id: Optional[int] = None,
+        limit: int = Query(50, ge=1, le=500),
+        job_queue: JobQueue = Depends(get_job_queue)
+) -> ApiResponse[BatchImageJobResponse]:
+    """İşleri en yeniden eskiye listeler."""
+    if job_status and job_status not in JOB_STATUSES:
+        return ApiResponse.error_response(
+            message=f"Geçersiz iş durumu: '{job_status}'",
+            code=status.HTTP_400_BAD_REQUEST
+        )
+    jobs = await job_queue.list(status=job_status, comment_id=comment_id, limit=limit)
+    return ApiResponse.success_response(
+        data=BatchImageJobResponse(jobs=[ImageJobResponse.from_document(job) for job in jobs]),
+        code=status.HTTP_200_OK
+    )
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import time
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from models.share import (
     BatchCommentRequest,
+    BatchGenerateImageRequest,
+    BatchImageCreateResponse,
+    BatchImageCreateResult,
     BatchShareResponse,
     DatabaseShare,
     GenerateImageRequest,
@@ -9,10 +14,13 @@ from models.share import (
     UpdateErrorRequest,
     UpdateTagsRequest
 )
+from core.config import get_settings
 from db.models import ApiShare
+from services.preview_token import create_preview_token, read_preview_token
 from services.share_service import ShareService
 from services.google_photos_service import GooglePhotosError
-from models.response import ApiResponse
+from services.render_executor import RenderQueueFullError
+from models.response import ApiResponse, stream_success_response
 from api.dependencies import verify_api_key, get_share_service
 
 router = APIRouter(
@@ -21,12 +29,20 @@ router = APIRouter(
     dependencies=[Depends(verify_api_key)]  # Tüm shares endpoint'leri için API key kontrolü
 )
 
+# İmzalı önizleme URL'leri API key istemez; imza yetkiyi taşır ve ara sunucular yanıtı önbelleğe alabilir
+public_router = APIRouter(prefix="/shares", tags=["shares"])
+
+PreviewFormat = Literal["jpeg", "png", "webp"]
+
 @router.post("/batch", response_model=ApiResponse[BatchShareResponse])
 async def get_shares_batch(
         request: BatchCommentRequest,
+        stream: bool = Query(False, description="Yanıtı model oluşturmadan doğrudan JSON olarak akıt"),
         share_service: ShareService = Depends(get_share_service)
 ) -> ApiResponse[BatchShareResponse]:
-    """Toplu paylaşım bilgilerini getirir."""
+    """Toplu paylaşım bilgilerini getirir.
+    stream=true ile yanıt aynı yapıda, Pydantic modelleri oluşturulmadan parça parça gönderilir;
+    büyük sayfalarda doğrulama ve kopyalama maliyetini ortadan kaldırır."""
     if not request.comment_ids:
         return ApiResponse.error_response(
             message="En az bir comment_id gerekli",
@@ -34,6 +50,10 @@ async def get_shares_batch(
         )
 
     try:
+        if stream:
+            documents = await share_service.get_shares_batch_documents(request.comment_ids)
+            return stream_success_response("shares", documents)
+
         shares = await share_service.get_shares_batch(request.comment_ids)
         return ApiResponse.success_response(
             data=BatchShareResponse(shares=shares),
@@ -73,6 +93,12 @@ async def image_create(
             data=ShareResponse(**share.model_dump())
         )
 
+    except RenderQueueFullError as e:
+        print(f"Render kuyruğu dolu: {str(e)}")
+        ApiResponse.error_response(
+            message=str(e),
+            code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
     except GooglePhotosError as e:
         print(f"Google Photos hatası: {str(e)}")
         ApiResponse.error_response(
@@ -95,6 +121,121 @@ async def image_create(
         )
     
 
+@router.post("/image-create/batch", response_model=ApiResponse[BatchImageCreateResponse])
+async def image_create_batch(
+        request: BatchGenerateImageRequest,
+        share_service: ShareService = Depends(get_share_service)
+) -> ApiResponse[BatchImageCreateResponse]:
+    """Birden fazla yorum için görsel oluşturur ve Google Photos'a toplu yükler.
+    Her isteğin sonucu ayrı döner; bir isteğin hatası diğerlerini etkilemez."""
+    if not request.requests:
+        return ApiResponse.error_response(
+            message="En az bir görsel isteği gerekli",
+            code=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        results = await share_service.create_images_batch([
+            ApiShare(**item.model_dump()) for item in request.requests
+        ])
+        return ApiResponse.success_response(
+            data=BatchImageCreateResponse(results=[
+                BatchImageCreateResult(
+                    **{key: value for key, value in result.items() if key != "share"},
+                    share=ShareResponse.model_construct(**result["share"]) if result["share"] else None
+                )
+                for result in results
+            ]),
+            code=status.HTTP_200_OK
+        )
+    except GooglePhotosError as e:
+        print(f"Google Photos hatası: {str(e)}")
+        return ApiResponse.error_response(
+            message=f"Google Photos hatası: {str(e)}",
+            code=int(e.error_code)
+        )
+    except Exception as e:
+        print(f"Beklenmeyen hata: {str(e)}")
+        return ApiResponse.error_response(
+            message=str(e),
+            code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığının ETag ile eşleşip eşleşmediğini döndürür (zayıf karşılaştırma)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def _preview_response(share_service: ShareService, api_share_data: ApiShare, format: str,
+                            if_none_match: Optional[str], headers: dict) -> Response:
+    """Önizlemeyi üretir. İstemcideki sürüm güncelse render yapılmadan 304 döner."""
+    try:
+        etag = share_service.preview_etag(api_share_data, format)
+        headers = {**headers, "ETag": etag}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        image = await share_service.render_preview(api_share_data, format)
+        return Response(content=image.data, media_type=image.mime_type, headers=headers)
+    except RenderQueueFullError as e:
+        print(f"Render kuyruğu dolu: {str(e)}")
+        return ApiResponse.error_response(
+            message=str(e),
+            code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    except ValueError as e:
+        return ApiResponse.error_response(
+            message=str(e),
+            code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+@router.post("/preview", response_class=Response)
+async def preview(
+        request: GenerateImageRequest,
+        format: PreviewFormat = Query("jpeg", description="Görsel formatı"),
+        if_none_match: Optional[str] = Header(None),
+        share_service: ShareService = Depends(get_share_service)
+) -> Response:
+    """Görseli yalnızca üretip döndürür; Google Photos'a yüklemez ve veritabanına yazmaz.
+    Yanıt render girdilerinden türetilen ETag taşır, If-None-Match eşleşirse 304 döner.
+    Content-Location başlığındaki imzalı GET adresi ara sunucularda önbelleğe alınabilir."""
+    api_share_data = ApiShare(**request.model_dump())
+    headers = {"Cache-Control": "private, no-cache"}
+    token = create_preview_token(api_share_data, format)
+    # Çok uzun yorumlarda token GET ile kabul edilmeyeceği için adres verilmez
+    if len(token) <= get_settings().PREVIEW_TOKEN_MAX_LENGTH:
+        headers["Content-Location"] = f"{router.prefix}/preview/{token}"
+    return await _preview_response(share_service, api_share_data, format, if_none_match, headers)
+
+
+@public_router.get("/preview/{token}", response_class=Response)
+async def preview_signed(
+        token: str,
+        if_none_match: Optional[str] = Header(None),
+        share_service: ShareService = Depends(get_share_service)
+) -> Response:
+    """POST /shares/preview'in döndürdüğü imzalı adresten önizlemeyi getirir.
+    Süresi dolmuş veya imzası geçersiz adresler 403 döner."""
+    try:
+        api_share_data, format, expires_at = read_preview_token(token)
+    except ValueError as e:
+        return ApiResponse.error_response(
+            message=str(e),
+            code=status.HTTP_403_FORBIDDEN
+        )
+    # Ara sunucular yanıtı adresin süresi dolduktan sonra sunmasın
+    max_age = min(get_settings().PREVIEW_CACHE_MAX_AGE_SECONDS, max(int(expires_at - time.time()), 0))
+    return await _preview_response(share_service, api_share_data, format, if_none_match, {
+        "Cache-Control": f"public, max-age={max_age}"
+    })
+
+
 @router.put("/toggle-share", response_model=ApiResponse[DatabaseShare])
 async def toggle_share_status(
         request: UpdateShareRequest,
@@ -2,19 +2,81 @@ from pydantic_settings import BaseSettings
 from functools import lru_cache
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class Settings(BaseSettings):
     """Uygulama ayarları."""
     ENVIRONMENT: str = "development"
     MONGO_URI: str
     MONGO_DB_NAME: str
+    # MongoDB bağlantı havuzu ve zaman aşımları (ms)
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_CONNECT_TIMEOUT_MS: int = 10000
+    MONGO_SOCKET_TIMEOUT_MS: int = 20000
+    MONGO_ENSURE_INDEXES: bool = True  # Başlangıçta index'leri oluştur
     API_KEY: str
     TOKEN_PATH: str = os.getenv("TOKEN_PATH", "/opt/render/project/src/token.pickle")
     
     # Google OAuth2 kimlik bilgileri
     GOOGLE_CREDENTIALS_JSON: str
 
+    # Google Photos API istemcisi
+    GOOGLE_PHOTOS_API_URL: str = "https://photoslibrary.googleapis.com/v1"  # Testlerde sahte sunucu adresi verilebilir
+    GOOGLE_PHOTOS_HTTP2: bool = True  # h2 paketi kuruluysa HTTP/2 kullanılır
+    GOOGLE_PHOTOS_MAX_CONNECTIONS: int = 10  # Havuzdaki en fazla bağlantı sayısı
+    GOOGLE_PHOTOS_MAX_CONCURRENCY: int = 8  # Aynı anda gönderilebilecek en fazla istek
+    GOOGLE_PHOTOS_TIMEOUT_SECONDS: float = 60  # Okuma/yazma zaman aşımı (görsel yüklemesi dahil)
+    GOOGLE_PHOTOS_CONNECT_TIMEOUT_SECONDS: float = 10
+    GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS: float = 300  # Token bitmeden bu kadar önce arka planda yenilenir
+
+    # Görsel üretimi
+    RENDER_LAYER_CACHE_MAX_MB: int = 64  # Statik arka plan/çerçeve katman önbelleği sınırı
+    RENDER_WORKERS: int = 2  # Render havuzundaki worker sayısı
+    RENDER_MAX_PENDING: int = 8  # Bu sayıda bekleyen iş varsa yeni istekler 503 alır
+    RENDER_USE_PROCESSES: bool = True  # False ise thread havuzu kullanılır
+
+    # Şablon kayıt defteri (şablonlar bellekte tutulur, değişiklikler arka planda izlenir)
+    TEMPLATE_REGISTRY_CHANGE_STREAM: bool = True  # Replica set yoksa otomatik olarak sürüm sayacı izlenir
+    TEMPLATE_REGISTRY_POLL_SECONDS: float = 5  # Sürüm sayacının kontrol aralığı / change stream yeniden açılma beklemesi
+
+    # Görsel kodlama (yüklenen dosya)
+    IMAGE_FORMAT: str = "JPEG"  # JPEG veya WEBP
+    IMAGE_QUALITY: int = 85
+    IMAGE_JPEG_SUBSAMPLING: str = "4:2:0"  # Metin kenarları için "4:4:4" daha keskin, dosya daha büyük
+    IMAGE_JPEG_PROGRESSIVE: bool = True
+    IMAGE_JPEG_OPTIMIZE: bool = True
+    IMAGE_WEBP_METHOD: int = 4  # 0 (hızlı) - 6 (en küçük dosya)
+    IMAGE_TARGET_BYTES: Optional[int] = None  # Verilirse kalite bu boyutun altına inecek şekilde ayarlanır
+    IMAGE_MIN_QUALITY: int = 40  # Hedef boyut için inilebilecek en düşük kalite
+
+    # Üretilmiş görsellerin disk deposu (tekrar denemeler ve yeniden yüklemeler render'ı atlar)
+    ARTIFACT_STORE_ENABLED: bool = True
+    ARTIFACT_STORE_DIR: str = "output/images"
+    ARTIFACT_STORE_MAX_MB: int = 512  # Aşılınca en eski kullanılan dosyalar silinir
+
+    # /shares/preview
+    PREVIEW_SIGNING_KEY: Optional[str] = None  # İmzalı önizleme URL'leri için anahtar; verilmezse API_KEY kullanılır
+    PREVIEW_CACHE_MAX_AGE_SECONDS: int = 3600  # İmzalı GET önizlemelerinin ara sunucularda önbellekte kalma süresi
+    PREVIEW_TOKEN_TTL_SECONDS: int = 86400  # İmzalı adres en az bu kadar, en fazla iki katı kadar geçerli kalır
+    PREVIEW_TOKEN_MAX_LENGTH: int = 8192  # Daha uzun token'lar imza kontrol edilmeden reddedilir
+
+    # Görsel üretim iş kuyruğu
+    JOB_WORKER_ENABLED: bool = True  # Uygulama süreci içinde worker çalıştır (ayrı süreç için scripts/job_worker.py)
+    JOB_WORKER_CONCURRENCY: int = 2  # Süreç başına aynı anda işlenen iş sayısı
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0  # Kuyruk boşken bekleme süresi
+    JOB_MAX_ATTEMPTS: int = 5  # Geçici hatalarda en fazla deneme sayısı
+    JOB_RETRY_BASE_SECONDS: float = 5  # İlk tekrar denemeden önceki bekleme; her denemede iki katına çıkar
+    JOB_RETRY_MAX_SECONDS: float = 300
+    JOB_LEASE_SECONDS: float = 300  # Worker bu süre içinde bitiremezse iş başka worker'a geçer
+
+    # /shares/batch okuma önbelleği
+    SHARE_CACHE_ENABLED: bool = True
+    SHARE_CACHE_TTL_SECONDS: float = 30  # Başka worker'daki değişiklikler en geç bu süre sonra görünür
+    SHARE_CACHE_MAX_ITEMS: int = 10000  # Süreç içi önbellekte tutulacak comment_id sayısı
+    SHARE_CACHE_REDIS_URL: Optional[str] = None  # Verilirse önbellek worker'lar arasında Redis'te paylaşılır
+
     @property
     def google_credentials(self) -> Dict[str, Any]:
         """Google kimlik bilgilerini JSON'dan parse eder."""
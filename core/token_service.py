@@ -1,15 +1,12 @@
 import base64
 from datetime import datetime, UTC
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from db.models import Token
-from core.config import get_settings
-
-settings = get_settings()
 
 class TokenService:
-    def __init__(self):
-        self.client = AsyncIOMotorClient(settings.MONGO_URI)
-        self.db = self.client[settings.MONGO_DB_NAME]
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
         self.collection = self.db.tokens
 
     async def get_token_from_db(self) -> bytes:
@@ -36,3 +33,20 @@ class TokenService:
             {"$set": update_data},
             upsert=True
         )
+
+    async def get_album_id(self) -> Optional[str]:
+        """Kayıtlı Google Photos albüm id'sini döndürür."""
+        album_doc = await self.collection.find_one({"_id": "google_album"})
+        return album_doc["album_id"] if album_doc else None
+
+    async def save_album_id(self, album_id: str) -> None:
+        """Albüm id'sini token ile aynı koleksiyona kaydeder; süreçler albümü tekrar aramaz."""
+        await self.collection.update_one(
+            {"_id": "google_album"},
+            {"$set": {"album_id": album_id, "updated_at": datetime.now(UTC)}},
+            upsert=True
+        )
+
+    async def clear_album_id(self, album_id: str) -> None:
+        """Albüm artık kullanılamıyorsa kaydı siler. Başka bir süreç yeni albüm kaydettiyse dokunmaz."""
+        await self.collection.delete_one({"_id": "google_album", "album_id": album_id})
@@ -1,19 +1,28 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from core.config import get_settings
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from core.config import Settings, get_settings
 
-# Uygulama ayarlarını al
-settings = get_settings()
 
-# MongoDB bağlantısını oluştur
-# motor.motor_asyncio, MongoDB için asenkron Python sürücüsüdür
-client = AsyncIOMotorClient(settings.MONGO_URI)
+def create_mongo_client(settings: Settings = None) -> AsyncIOMotorClient:
+    """Süreç genelinde kullanılacak MongoDB istemcisini oluşturur.
+    motor.motor_asyncio, MongoDB için asenkron Python sürücüsüdür.
+    Bağlantı havuzu ve zaman aşımı değerleri ayarlardan okunur.
+    Uygulama içinde yalnızca lifespan sırasında bir kez çağrılmalıdır."""
+    settings = settings or get_settings()
+    return AsyncIOMotorClient(
+        settings.MONGO_URI,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS
+    )
 
-# Veritabanı bağlantısını al
-# settings.MONGO_DB_NAME ile belirtilen veritabanına bağlanır
-db = client.get_database(settings.MONGO_DB_NAME)
 
-# Veritabanı koleksiyonlarını tanımla
-# shares: Paylaşımların tutulduğu koleksiyon
-shares_collection = db["shares"]
-# image_templates: Görsel şablonlarının tutulduğu koleksiyon
-templates_collection = db["image_templates"]
+def get_database(client: AsyncIOMotorClient, settings: Settings = None) -> AsyncIOMotorDatabase:
+    """settings.MONGO_DB_NAME ile belirtilen veritabanını döndürür.
+    Koleksiyonlar:
+        shares: Paylaşımların tutulduğu koleksiyon
+        image_templates: Görsel şablonlarının tutulduğu koleksiyon
+        tokens: Google token'ının tutulduğu koleksiyon"""
+    settings = settings or get_settings()
+    return client.get_database(settings.MONGO_DB_NAME)
@@ -0,0 +1,86 @@
+from typing import Dict, List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+
+# Biten görsel üretim işlerinin saklanma süresi
+JOB_RETENTION_SECONDS = 7 * 24 * 60 * 60
+
+# Koleksiyon başına index tanımları.
+# tokens ve template_registry koleksiyonları yalnızca _id ile sorgulandığı için ek index gerektirmez.
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "shares": [
+        # ShareService sorgularının neredeyse tamamı comment_id (+ image_template_type) ile yapılır.
+        # Bileşik index'in ön eki sadece comment_id ile yapılan sorguları da karşılar.
+        IndexModel(
+            [("comment_id", ASCENDING), ("image_template_type", ASCENDING)],
+            name="comment_id_template_unique",
+            unique=True
+        ),
+    ],
+    "image_templates": [
+        IndexModel([("template_type", ASCENDING)], name="template_type_unique", unique=True),
+    ],
+    "image_jobs": [
+        # JobQueue.claim: sıradaki işler ve süresi dolmuş kilitler
+        IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+        IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="status_locked_until"),
+        # JobQueue.list: yoruma göre iş geçmişi
+        IndexModel([("payload.comment_id", ASCENDING), ("created_at", DESCENDING)], name="comment_id_created_at"),
+        # Biten işler saklama süresi sonunda silinir; finished_at olmayan işlere dokunulmaz
+        IndexModel(
+            [("finished_at", ASCENDING)],
+            name="finished_at_ttl",
+            expireAfterSeconds=JOB_RETENTION_SECONDS
+        ),
+    ],
+}
+
+
+def _index_key(key) -> tuple:
+    """index_information (liste) veya IndexModel.document (SON) anahtarını karşılaştırılabilir hale getirir."""
+    items = key.items() if hasattr(key, "items") else key
+    return tuple((field, direction if isinstance(direction, str) else int(direction)) for field, direction in items)
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Tanımlı index'leri oluşturur. create_indexes idempotenttir; var olan index'ler atlanır.
+    Bir index oluşturulamazsa (ör. unique index için mükerrer kayıt varsa) uygulama
+    başlamaya devam eder, hata log'lanır."""
+    for collection_name, indexes in INDEX_SPECS.items():
+        try:
+            names = await db[collection_name].create_indexes(indexes)
+            print(f"✅ Index'ler hazır: {collection_name} -> {', '.join(names)}")
+        except OperationFailure as e:
+            print(f"❌ Index oluşturulamadı: {collection_name} -> {e}")
+
+
+async def get_index_report(db: AsyncIOMotorDatabase) -> Dict[str, dict]:
+    """Koleksiyon başına eksik, tanımsız ve hiç kullanılmamış index'leri döndürür.
+    Kullanım bilgisi $indexStats'tan gelir ve sunucu yeniden başlayınca sıfırlanır."""
+    report = {}
+    for collection_name, indexes in INDEX_SPECS.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        existing_keys = {_index_key(info["key"]): name for name, info in existing.items()}
+        expected_keys = {_index_key(index.document["key"]): index.document["name"] for index in indexes}
+
+        missing = [name for key, name in expected_keys.items() if key not in existing_keys]
+        undeclared = [name for key, name in existing_keys.items()
+                      if key not in expected_keys and name != "_id_"]
+
+        unused = []
+        try:
+            async for stats in collection.aggregate([{"$indexStats": {}}]):
+                if stats["name"] != "_id_" and stats["accesses"]["ops"] == 0:
+                    unused.append(stats["name"])
+        except OperationFailure as e:
+            print(f"⚠️ Index kullanım bilgisi alınamadı: {collection_name} -> {e}")
+
+        report[collection_name] = {
+            "missing": missing,
+            "undeclared": undeclared,
+            "unused": unused
+        }
+    return report
@@ -32,6 +32,7 @@ class DatabaseShare(BaseModel):
     last_shared_date: Optional[datetime] = None
     error_message: Optional[str] = None
     tags: Optional[List[str]] = []
+    image_fingerprint: Optional[str] = None  # Görseli üreten içerik + template + renderer sürümünün özeti
 
 
 # veritabanında tutulacak template modeli
@@ -12,14 +12,14 @@ settings = get_settings()
 credentials_json = settings.GOOGLE_CREDENTIALS_JSON
 credentials_dict = json.loads(credentials_json)
 
-# GooglePhotosService instance'ı oluştur (SCOPES'a erişmek için)
-service = GooglePhotosService()
+# GooglePhotosService'in scope listesi
+SCOPES = GooglePhotosService.SCOPES
 
 async def get_token():
     # OAuth2 flow'u başlat
     flow = InstalledAppFlow.from_client_config(
         credentials_dict,
-        service.SCOPES,  # GooglePhotosService'in kendi scope'larını kullan
+        SCOPES,  # GooglePhotosService'in kendi scope'larını kullan
         # Redirect URI'yi sunucu ortamında genellikle kullanmasanız da,
         # run_local_server için belirtmek gerekir.
         # İlk yetkilendirmeyi manuel yaparken "urn:ietf:wg:oauth:2.0:oob" kullanabilirsiniz.
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError, HTTPException
@@ -7,12 +8,83 @@ from core.exceptions import (
     method_not_allowed_exception_handler
 )
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from api.routes import shares, health, templates
+from api.routes import shares, health, templates, jobs
+from core.config import get_settings
+from core.token_service import TokenService
+from db.client import create_mongo_client, get_database
+from db.indexes import ensure_indexes
+from services.render_executor import get_render_executor
+from services.google_photos_service import GooglePhotosService
+from services.share_service import ShareService
+from services.template_registry import TemplateRegistry
+from services.template_service import TemplateService
+from services.job_queue import JobWorker, create_job_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Uygulama başlangıcında ve kapanışında çalışacak işlemler.
+    MongoDB istemcisi ve servisler süreç başına bir kez oluşturulup app.state'e konur;
+    istekler bu nesneleri dependency'ler üzerinden paylaşır."""
+    settings = get_settings()
+
+    # Tek MongoDB istemcisi (tek bağlantı havuzu)
+    mongo_client = create_mongo_client(settings)
+    db = get_database(mongo_client, settings)
+    if settings.MONGO_ENSURE_INDEXES:
+        await ensure_indexes(db)
+
+    # Şablonları belleğe yükle; değişiklikler arka planda izlenir
+    template_registry = TemplateRegistry(
+        db,
+        poll_interval=settings.TEMPLATE_REGISTRY_POLL_SECONDS,
+        use_change_stream=settings.TEMPLATE_REGISTRY_CHANGE_STREAM
+    )
+    await template_registry.start()
+
+    # Render worker'larını önceden başlat (fontlar ve statik katman ısıtılır)
+    render_executor = get_render_executor()
+    render_executor.start()
+
+    google_photos = GooglePhotosService(TokenService(db))
+    # Token'ı yükle ve süresi dolmadan arka planda yenile
+    await google_photos.start()
+
+    app.state.mongo_client = mongo_client
+    app.state.db = db
+    app.state.template_registry = template_registry
+    app.state.render_executor = render_executor
+    app.state.google_photos = google_photos
+    app.state.share_service = ShareService(db, google_photos, template_registry=template_registry)
+    app.state.template_service = TemplateService(db, template_registry)
+    app.state.job_queue = create_job_queue(db)
+
+    # Kuyruktaki görsel üretim işlerini bu süreçte de işle
+    job_worker = None
+    if settings.JOB_WORKER_ENABLED:
+        job_worker = JobWorker(
+            app.state.job_queue,
+            app.state.share_service,
+            concurrency=settings.JOB_WORKER_CONCURRENCY,
+            poll_interval=settings.JOB_POLL_INTERVAL_SECONDS
+        )
+        job_worker.start()
+
+    yield
+
+    if job_worker is not None:
+        await job_worker.stop()
+    await google_photos.aclose()
+    await template_registry.stop()
+    render_executor.shutdown()
+    mongo_client.close()
+
 
 app = FastAPI(
     title="Graficast API",
     description="Graficast API Documentation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS ayarları
@@ -33,3 +105,5 @@ app.add_exception_handler(StarletteHTTPException, method_not_allowed_exception_h
 app.include_router(health.router)
 app.include_router(templates.router)
 app.include_router(shares.router)
+app.include_router(shares.public_router)
+app.include_router(jobs.router)
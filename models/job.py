@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+from models.share import ShareResponse
+
+class ImageJobResponse(BaseModel):
+    """Görsel üretim işi yanıt modeli.
+    status: queued, running, succeeded veya failed."""
+    job_id: str
+    status: str
+    comment_id: int
+    image_template_type: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    run_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    share: Optional[ShareResponse] = None
+
+    @classmethod
+    def from_document(cls, job: dict) -> "ImageJobResponse":
+        """image_jobs belgesini yanıt modeline çevirir."""
+        return cls(
+            job_id=str(job["_id"]),
+            status=job["status"],
+            comment_id=job["payload"]["comment_id"],
+            image_template_type=job["payload"].get("image_template_type"),
+            attempts=job["attempts"],
+            max_attempts=job["max_attempts"],
+            run_at=job.get("run_at"),
+            created_at=job["created_at"],
+            updated_at=job["updated_at"],
+            finished_at=job.get("finished_at"),
+            error=job.get("error"),
+            share=ShareResponse(**job["result"]) if job.get("result") else None
+        )
+
+class BatchImageJobResponse(BaseModel):
+    """İş listesi yanıt modeli."""
+    jobs: List[ImageJobResponse]
@@ -1,6 +1,15 @@
-from typing import Generic, TypeVar, Optional
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Generic, Iterable, TypeVar, Optional
 from pydantic import BaseModel
 from fastapi import status, HTTPException
+from fastapi.responses import StreamingResponse
+
+try:
+    # orjson isteğe bağlıdır; kuruluysa hızlı serileştirme için kullanılır
+    import orjson
+except ImportError:
+    orjson = None
 
 T = TypeVar('T')
 
@@ -40,4 +49,37 @@ class ApiResponse(BaseModel, Generic[T]):
                 data=data
             ).model_dump()
         )
-    
\ No newline at end of file
+
+
+def _json_default(value: Any) -> str:
+    # Pydantic ile aynı biçimde (ISO 8601) tarih yazılır
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value)}")
+
+
+def dumps_json(value: Any) -> bytes:
+    """Değeri JSON byte'larına çevirir. orjson yoksa standart json modülü kullanılır."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def stream_success_response(
+    key: str,
+    items: Iterable[dict],
+    message: str = "İşlem başarılı",
+    code: int = status.HTTP_200_OK
+) -> StreamingResponse:
+    """success_response ile aynı zarfı, ara model nesneleri oluşturmadan parça parça yazar.
+    Yanıt: {"success": true, "message": ..., "code": ..., "data": {key: [items...]}}
+    items veritabanından gelen, doğrulanmış kabul edilen dict'lerdir."""
+    async def body() -> AsyncIterator[bytes]:
+        yield (b'{"success":true,"message":' + dumps_json(message)
+               + b',"code":' + dumps_json(code)
+               + b',"data":{' + dumps_json(key) + b':[')
+        for index, item in enumerate(items):
+            yield (b"," if index else b"") + dumps_json(item)
+        yield b"]}}"
+
+    return StreamingResponse(body(), status_code=code, media_type="application/json")
@@ -14,6 +14,10 @@ class GenerateImageRequest(BaseModel):
     ins_name: Optional[str] = None
     image_template_type: Optional[str] = None
 
+class BatchGenerateImageRequest(BaseModel):
+    """Toplu görsel oluşturma isteği modeli."""
+    requests: List[GenerateImageRequest]
+
 class UpdateShareRequest(BaseModel):
     """Paylaşım güncelleme isteği modeli."""
     comment_id: int
@@ -63,6 +67,18 @@ class BatchShareResponse(BaseModel):
     """Toplu paylaşım yanıt modeli."""
     shares: List[ShareResponse]
 
+class BatchImageCreateResult(BaseModel):
+    """Toplu görsel oluşturmada tek bir isteğin sonucu."""
+    comment_id: int
+    image_template_type: Optional[str] = None
+    success: bool
+    share: Optional[ShareResponse] = None
+    error: Optional[str] = None
+
+class BatchImageCreateResponse(BaseModel):
+    """Toplu görsel oluşturma yanıt modeli. Sonuçlar istek sırasındadır."""
+    results: List[BatchImageCreateResult]
+
 class UpdateErrorRequest(BaseModel):
     """Hata mesajı güncelleme isteği modeli."""
     comment_id: int
@@ -0,0 +1,66 @@
+"""Twemoji PNG'lerinden emoji sprite atlası üretir.
+
+Kullanım:
+    python scripts/build_emoji_atlas.py <twemoji/assets/72x72 klasörü> [--size 48]
+
+Twemoji (https://github.com/jdecked/twemoji) sürüm arşivindeki `assets/72x72`
+klasörü verilir. Çıktı `assets/emoji/twemoji-atlas.png` ve
+`assets/emoji/twemoji-atlas.json` dosyalarıdır; ikisi birlikte commit edilmelidir.
+Twemoji grafikleri CC-BY 4.0 lisanslıdır.
+"""
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+ROOT_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = ROOT_DIR / "assets" / "emoji"
+
+
+def build_atlas(source_dir: Path, sprite_size: int, output_dir: Path) -> None:
+    """Klasördeki tüm emoji PNG'lerini tek bir ızgara atlasa yerleştirir.
+
+    Args:
+        source_dir: Twemoji PNG klasörü (dosya adları '1f469-200d-1f4bb.png' biçiminde)
+        sprite_size: Atlas içindeki her emojinin kenar uzunluğu (piksel)
+        output_dir: Atlas ve indeksin yazılacağı klasör
+    """
+    files = sorted(source_dir.glob("*.png"))
+    if not files:
+        print(f"PNG bulunamadı: {source_dir}")
+        sys.exit(1)
+
+    columns = math.ceil(math.sqrt(len(files)))
+    rows = math.ceil(len(files) / columns)
+    atlas = Image.new("RGBA", (columns * sprite_size, rows * sprite_size), (0, 0, 0, 0))
+    sprites = {}
+
+    for i, file in enumerate(files):
+        x = (i % columns) * sprite_size
+        y = (i // columns) * sprite_size
+        with Image.open(file) as emoji_img:
+            emoji_img = emoji_img.convert("RGBA")
+            if emoji_img.size != (sprite_size, sprite_size):
+                emoji_img = emoji_img.resize((sprite_size, sprite_size), Image.Resampling.LANCZOS)
+            atlas.paste(emoji_img, (x, y))
+        sprites[file.stem.lower()] = [x, y, sprite_size, sprite_size]
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    atlas.save(output_dir / "twemoji-atlas.png", optimize=True)
+    with open(output_dir / "twemoji-atlas.json", "w", encoding="utf-8") as f:
+        json.dump({"size": sprite_size, "sprites": sprites}, f, separators=(",", ":"))
+
+    print(f"{len(sprites)} emoji {atlas.width}x{atlas.height} atlasa yazıldı: {output_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Twemoji sprite atlası üretir")
+    parser.add_argument("source", type=Path, help="Twemoji assets/72x72 klasörü")
+    parser.add_argument("--size", type=int, default=48, help="Sprite kenar uzunluğu (varsayılan: 48)")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help="Çıktı klasörü")
+    args = parser.parse_args()
+
+    build_atlas(args.source, args.size, args.output)
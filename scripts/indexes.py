@@ -0,0 +1,46 @@
+"""MongoDB index yönetimi.
+
+Kullanım:
+    python scripts/indexes.py report   # eksik / tanımsız / kullanılmayan index'leri listeler
+    python scripts/indexes.py apply    # tanımlı index'leri oluşturur
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import get_settings  # noqa: E402
+from db.client import create_mongo_client, get_database  # noqa: E402
+from db.indexes import ensure_indexes, get_index_report  # noqa: E402
+
+
+async def main(command: str) -> int:
+    settings = get_settings()
+    client = create_mongo_client(settings)
+    db = get_database(client, settings)
+    try:
+        if command == "apply":
+            await ensure_indexes(db)
+            return 0
+
+        report = await get_index_report(db)
+        has_missing = False
+        for collection_name, result in report.items():
+            print(f"📚 {collection_name}")
+            print(f"   Eksik: {', '.join(result['missing']) or '-'}")
+            print(f"   Tanımsız: {', '.join(result['undeclared']) or '-'}")
+            print(f"   Kullanılmayan: {', '.join(result['unused']) or '-'}")
+            has_missing = has_missing or bool(result["missing"])
+        # Eksik index varsa CI/cron tarafından yakalanabilmesi için hata koduyla çık
+        return 1 if has_missing else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MongoDB index yönetimi")
+    parser.add_argument("command", choices=["report", "apply"], help="Yapılacak işlem")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.command)))
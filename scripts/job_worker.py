@@ -0,0 +1,70 @@
+"""Görsel üretim kuyruğunu ayrı bir süreçte işler.
+
+Kullanım:
+    python scripts/job_worker.py                 # ayarlardaki JOB_WORKER_CONCURRENCY kadar görev
+    python scripts/job_worker.py --concurrency 4
+
+Birden fazla süreç aynı anda çalıştırılabilir; işler atomik olarak sahiplenilir.
+API süreçlerinde worker istenmiyorsa JOB_WORKER_ENABLED=false verilir.
+"""
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import get_settings  # noqa: E402
+from core.token_service import TokenService  # noqa: E402
+from db.client import create_mongo_client, get_database  # noqa: E402
+from services.google_photos_service import GooglePhotosService  # noqa: E402
+from services.job_queue import JobWorker, create_job_queue  # noqa: E402
+from services.render_executor import get_render_executor  # noqa: E402
+from services.share_service import ShareService  # noqa: E402
+from services.template_registry import TemplateRegistry  # noqa: E402
+
+
+async def main(concurrency: int) -> None:
+    settings = get_settings()
+    client = create_mongo_client(settings)
+    db = get_database(client, settings)
+    template_registry = TemplateRegistry(
+        db,
+        poll_interval=settings.TEMPLATE_REGISTRY_POLL_SECONDS,
+        use_change_stream=settings.TEMPLATE_REGISTRY_CHANGE_STREAM
+    )
+    await template_registry.start()
+    render_executor = get_render_executor()
+    render_executor.start()
+    google_photos = GooglePhotosService(TokenService(db))
+    await google_photos.start()
+
+    worker = JobWorker(
+        create_job_queue(db),
+        ShareService(db, google_photos, template_registry=template_registry),
+        concurrency=concurrency,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS
+    )
+    worker.start()
+
+    # SIGINT/SIGTERM gelince yeni iş almayı bırak, çalışan işlerin bitmesini bekle
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    print("🛑 Worker durduruluyor...")
+    await worker.stop()
+    await google_photos.aclose()
+    await template_registry.stop()
+    render_executor.shutdown()
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Görsel üretim kuyruğu worker'ı")
+    parser.add_argument("--concurrency", type=int, default=None, help="Aynı anda işlenecek iş sayısı")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency or get_settings().JOB_WORKER_CONCURRENCY))
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from core.config import get_settings
+from services.image_encoder import ImageEncoder
+
+
+def artifact_key(fingerprint: str, encoder: ImageEncoder) -> str:
+    """Render girdilerinin parmak izi ve kodlama ayarlarından artifact anahtarı üretir.
+    Aynı içerik farklı format/kaliteyle farklı byte'lar üreteceği için encoder imzası da anahtara girer."""
+    digest = hashlib.sha256(f"{fingerprint}:{encoder.signature}".encode("utf-8")).hexdigest()
+    return f"{digest}.{encoder.extension}"
+
+
+class ArtifactStore:
+    """Üretilmiş görsel byte'larını diskte içerik anahtarıyla saklar.
+
+    Yazma geçici dosyaya yapılıp os.replace ile atomik olarak yerine taşınır; okuyucular
+    yarım yazılmış dosya görmez. Okuma yolu kilit almaz, yalnızca dosyayı açar ve
+    son kullanım zamanını (mtime) günceller. Toplam boyut max_bytes'ı aşınca en eski
+    kullanılan dosyalar sınırın %90'ına inene kadar silinir.
+
+    Aynı dizin birden fazla süreç tarafından paylaşılabilir; boyut her süreçte tahmini
+    tutulur ve temizlik sırasında dizin yeniden taranarak düzeltilir.
+    """
+
+    TMP_SUFFIX = ".tmp"
+
+    def __init__(self, root_dir: str, max_bytes: int):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._current_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # Tek dizinde çok fazla dosya birikmesin diye anahtarın ilk iki karakteriyle bölünür
+        return os.path.join(self.root_dir, key[:2], key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Anahtara ait byte'ları döndürür, yoksa None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            # LRU sırası için son kullanım zamanı
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Byte'ları atomik olarak yazar ve gerekirse eski dosyaları temizler."""
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=self.TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            if self._current_bytes is None:
+                self._current_bytes = self._scan_bytes()
+            else:
+                self._current_bytes += len(data)
+            if self._current_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list:
+        """(mtime, boyut, yol) listesini döndürür; yarım kalmış geçici dosyalar dahil edilmez."""
+        entries = []
+        for shard in os.scandir(self.root_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(self.TMP_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Sınırın %90'ına inene kadar en eski kullanılan dosyaları siler. Kilit altında çağrılır."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._current_bytes = total
+        if removed:
+            print(f"🧹 Artifact deposundan {removed} dosya silindi ({total // 1024} KB kaldı)")
+
+    @property
+    def current_bytes(self) -> int:
+        """Depodaki dosyaların toplam boyutu (tahmini)."""
+        if self._current_bytes is None:
+            with self._lock:
+                if self._current_bytes is None:
+                    self._current_bytes = self._scan_bytes()
+        return self._current_bytes
+
+    def stats(self) -> dict:
+        """Kapasite planlaması için isabet/kaçırma sayaçları ve depo boyutu."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+@lru_cache()
+def get_artifact_store() -> Optional[ArtifactStore]:
+    """Ayarlara göre süreç genelinde paylaşılan artifact deposunu döndürür. Kapalıysa None döner."""
+    settings = get_settings()
+    if not settings.ARTIFACT_STORE_ENABLED:
+        return None
+    return ArtifactStore(settings.ARTIFACT_STORE_DIR, settings.ARTIFACT_STORE_MAX_MB * 1024 * 1024)
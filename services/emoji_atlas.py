@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from cachetools import LRUCache
+from PIL import Image
+
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "emoji")
+DEFAULT_ATLAS_IMAGE = os.path.join(ASSETS_DIR, "twemoji-atlas.png")
+DEFAULT_ATLAS_INDEX = os.path.join(ASSETS_DIR, "twemoji-atlas.json")
+
+VARIATION_SELECTOR = 0xFE0F
+
+
+def emoji_key(emoji: str) -> str:
+    """Emoji dizisini Twemoji dosya adı biçimine çevirir (ör. '1f469-200d-1f4bb')."""
+    return '-'.join(f"{ord(c):x}" for c in emoji)
+
+
+class EmojiAtlas:
+    """Twemoji görsellerini tek bir PNG atlas + kod noktası→dikdörtgen indeksinden sunar.
+
+    Atlas süreç başına bir kez yüklenir; ağ erişimi yoktur. Boyutlandırılmış
+    sprite'lar küçük bir LRU önbellekte tutulur, böylece bir emoji araması
+    sözlük araması + kırpma maliyetindedir.
+    Atlas `scripts/build_emoji_atlas.py` ile üretilir.
+    """
+
+    def __init__(self, image_path: str = DEFAULT_ATLAS_IMAGE, index_path: str = DEFAULT_ATLAS_INDEX,
+                 sprite_cache_size: int = 512):
+        self.image_path = image_path
+        self.index_path = index_path
+        self._atlas: Optional[Image.Image] = None
+        self._sprites: Dict[str, Tuple[int, int, int, int]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._sprite_cache = LRUCache(maxsize=sprite_cache_size)
+
+    def _load(self) -> None:
+        """Atlası ve indeksi (henüz yüklenmediyse) belleğe alır."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if os.path.exists(self.image_path) and os.path.exists(self.index_path):
+                with open(self.index_path, encoding="utf-8") as f:
+                    index = json.load(f)
+                self._sprites = {key: tuple(rect) for key, rect in index["sprites"].items()}
+                atlas = Image.open(self.image_path)
+                atlas.load()
+                self._atlas = atlas.convert("RGBA") if atlas.mode != "RGBA" else atlas
+                print(f"✅ Emoji atlası yüklendi: {len(self._sprites)} emoji")
+            else:
+                print(f"⚠️ Emoji atlası bulunamadı: {self.image_path}. Emojiler boş çizilecek.")
+            self._loaded = True
+
+    @property
+    def keys(self) -> frozenset:
+        """Atlasta bulunan tüm emoji anahtarları."""
+        self._load()
+        return frozenset(self._sprites)
+
+    def _resolve(self, emoji: str) -> Optional[str]:
+        """Emojinin atlastaki anahtarını bulur.
+        Twemoji çoğu dosya adında FE0F (variation selector) kullanmaz, o yüzden onsuz da denenir."""
+        key = emoji_key(emoji)
+        if key in self._sprites:
+            return key
+        stripped = emoji_key(''.join(c for c in emoji if ord(c) != VARIATION_SELECTOR))
+        if stripped in self._sprites:
+            return stripped
+        return None
+
+    def __contains__(self, emoji: str) -> bool:
+        self._load()
+        return self._resolve(emoji) is not None
+
+    def get(self, emoji: str, size: int) -> Optional[Image.Image]:
+        """Emojinin istenen boyuttaki RGBA sprite'ını döndürür, atlasta yoksa None."""
+        self._load()
+        cache_key = (emoji, size)
+        with self._lock:
+            sprite = self._sprite_cache.get(cache_key)
+        if sprite is not None:
+            return sprite
+
+        key = self._resolve(emoji)
+        if key is None or self._atlas is None:
+            return None
+
+        x, y, w, h = self._sprites[key]
+        sprite = self._atlas.crop((x, y, x + w, y + h))
+        if (w, h) != (size, size):
+            sprite = sprite.resize((size, size), Image.Resampling.LANCZOS)
+
+        with self._lock:
+            self._sprite_cache[cache_key] = sprite
+        return sprite
+
+
+def check_emoji_atlas(image_path: str = DEFAULT_ATLAS_IMAGE, index_path: str = DEFAULT_ATLAS_INDEX) -> int:
+    """Atlas dosyalarının var olduğunu ve indeksin okunabildiğini doğrular; emoji sayısını döndürür.
+    Render havuzu başlarken çağrılır. Dosyalar eksikse emojiler sessizce boş çizilmesin diye
+    RuntimeError fırlatır."""
+    missing = [path for path in (image_path, index_path) if not os.path.exists(path)]
+    if missing:
+        raise RuntimeError(
+            f"Emoji atlası bulunamadı: {', '.join(missing)}. scripts/build_emoji_atlas.py ile üretilmeli."
+        )
+    with open(index_path, encoding="utf-8") as f:
+        sprites = json.load(f).get("sprites")
+    if not sprites:
+        raise RuntimeError(f"Emoji atlası indeksi boş: {index_path}")
+    return len(sprites)
+
+
+@lru_cache()
+def get_emoji_atlas() -> EmojiAtlas:
+    """Süreç genelinde paylaşılan emoji atlasını döndürür."""
+    return EmojiAtlas()
@@ -0,0 +1,140 @@
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from services.emoji_atlas import EmojiAtlas, get_emoji_atlas
+
+
+ZWJ = 0x200D
+VARIATION_SELECTOR = 0xFE0F
+KEYCAP = 0x20E3
+SKIN_TONES = range(0x1F3FB, 0x1F400)
+REGIONAL_INDICATORS = range(0x1F1E6, 0x1F200)
+TAGS = range(0xE0020, 0xE0080)
+
+# Atlasta olmayan (ör. yeni sürüm) emojileri de tek parça tutabilmek için
+# Extended_Pictographic kümesinin sade bir yaklaşımı.
+PICTOGRAPHIC_RANGES = (
+    (0x203C, 0x203C), (0x2049, 0x2049), (0x2122, 0x2122), (0x2139, 0x2139),
+    (0x2194, 0x2199), (0x21A9, 0x21AA), (0x231A, 0x231B), (0x2328, 0x2328),
+    (0x23CF, 0x23CF), (0x23E9, 0x23F3), (0x23F8, 0x23FA), (0x24C2, 0x24C2),
+    (0x25AA, 0x25AB), (0x25B6, 0x25B6), (0x25C0, 0x25C0), (0x25FB, 0x25FE),
+    (0x2600, 0x27BF), (0x2934, 0x2935), (0x2B05, 0x2B07), (0x2B1B, 0x2B1C),
+    (0x2B50, 0x2B50), (0x2B55, 0x2B55), (0x3030, 0x3030), (0x303D, 0x303D),
+    (0x3297, 0x3297), (0x3299, 0x3299), (0x1F000, 0x1FAFF),
+)
+
+_END = -1  # Trie içinde bir dizinin burada bittiğini gösteren anahtar
+
+Segment = Tuple[str, bool]  # (metin, emoji mi)
+
+
+def _is_pictographic(codepoint: int) -> bool:
+    for start, end in PICTOGRAPHIC_RANGES:
+        if codepoint < start:
+            return False
+        if codepoint <= end:
+            return True
+    return False
+
+
+class EmojiSegmenter:
+    """Metni düz metin parçaları ve bütün emoji grapheme cluster'larına ayırır.
+
+    Emoji dizileri (ZWJ dizileri, ten rengi, bayraklar, keycap'ler) atlas
+    anahtarlarından bir kez derlenen bir trie ile en uzun eşleşme olarak bulunur.
+    Trie derinliği en uzun emoji dizisiyle sınırlı olduğundan bölme işlemi
+    metin uzunluğunda O(n)'dir.
+    """
+
+    def __init__(self, atlas: EmojiAtlas):
+        self.atlas = atlas
+        self._trie: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def _get_trie(self) -> Dict:
+        """Atlas anahtarlarından trie'yi (ilk kullanımda bir kez) derler."""
+        if self._trie is None:
+            with self._lock:
+                if self._trie is None:
+                    trie: Dict = {}
+                    for key in self.atlas.keys:
+                        node = trie
+                        for part in key.split('-'):
+                            node = node.setdefault(int(part, 16), {})
+                        node[_END] = True
+                    self._trie = trie
+        return self._trie
+
+    def _match_known(self, text: str, start: int) -> int:
+        """start konumunda atlastaki en uzun emoji dizisinin bitiş konumunu döndürür, yoksa start."""
+        node = self._get_trie()
+        end = start
+        i = start
+        while i < len(text):
+            codepoint = ord(text[i])
+            if codepoint in node:
+                if codepoint == VARIATION_SELECTOR and _END in node:
+                    # FE0F ile başlayan daha uzun diziler de var (ör. ❤️‍🔥); eşleşmezlerse FE0F yine cluster'a dahil
+                    end = i + 1
+                node = node[codepoint]
+                i += 1
+            elif codepoint == VARIATION_SELECTOR and i > start:
+                # Twemoji dosya adlarının çoğunda FE0F yok; metinde varsa cluster'a dahil et
+                i += 1
+            else:
+                break
+            if _END in node:
+                end = i
+        return end
+
+    def _match_generic(self, text: str, start: int) -> int:
+        """Atlasta olmayan emojiler için cluster sınırını Unicode kurallarıyla bulur."""
+        codepoint = ord(text[start])
+        i = start + 1
+
+        if codepoint in REGIONAL_INDICATORS:
+            # Bayraklar iki bölgesel göstergeden oluşur
+            if i < len(text) and ord(text[i]) in REGIONAL_INDICATORS:
+                i += 1
+            return i
+
+        if not _is_pictographic(codepoint):
+            return start
+
+        while i < len(text):
+            codepoint = ord(text[i])
+            if codepoint == VARIATION_SELECTOR or codepoint == KEYCAP or codepoint in SKIN_TONES or codepoint in TAGS:
+                i += 1
+            elif codepoint == ZWJ and i + 1 < len(text) and _is_pictographic(ord(text[i + 1])):
+                i += 2
+            else:
+                break
+        return i
+
+    def segment(self, text: str) -> List[Segment]:
+        """Metni (parça, emoji_mi) listesine böler. Ardışık düz metin tek parça olarak döner."""
+        segments: List[Segment] = []
+        run_start = 0
+        i = 0
+        while i < len(text):
+            end = self._match_known(text, i)
+            if end == i:
+                end = self._match_generic(text, i)
+            if end > i:
+                if run_start < i:
+                    segments.append((text[run_start:i], False))
+                segments.append((text[i:end], True))
+                i = end
+                run_start = i
+            else:
+                i += 1
+        if run_start < len(text):
+            segments.append((text[run_start:], False))
+        return segments
+
+
+@lru_cache()
+def get_emoji_segmenter() -> EmojiSegmenter:
+    """Süreç genelinde paylaşılan, varsayılan atlas için derlenmiş segmenter'ı döndürür."""
+    return EmojiSegmenter(get_emoji_atlas())
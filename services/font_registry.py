@@ -0,0 +1,72 @@
+import os
+import threading
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+from PIL import ImageFont
+
+
+FontKey = Tuple[int, Optional[int], Optional[int]]  # (boyut, kalınlık, genişlik)
+
+
+class FontRegistry:
+    """Değişken font dosyasını bir kez okuyup (boyut, kalınlık, genişlik) başına hazır font nesneleri verir.
+
+    Dönen fontlar önceden ayarlanmıştır ve değiştirilmemelidir (set_variation_* çağrılmamalı).
+    FreeType yüzleri thread'ler arasında güvenli paylaşılamadığından her thread kendi
+    font nesnelerini alır; font baytları ise süreç içinde tek kopyadır.
+    Fork sonrası alt süreçte font nesneleri yeniden oluşturulur.
+    """
+
+    def __init__(self, font_path: str):
+        if not os.path.exists(font_path):
+            raise FileNotFoundError(f"Font dosyası bulunamadı: {font_path}")
+        self.font_path = font_path
+        with open(font_path, "rb") as f:
+            self._font_bytes = f.read()
+        self._local = threading.local()
+        self._axes = ImageFont.truetype(BytesIO(self._font_bytes), 10).get_variation_axes()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        """Bu thread/süreçteki font nesnelerini bırakır."""
+        self._local = threading.local()
+
+    def _fonts(self) -> Dict[FontKey, ImageFont.FreeTypeFont]:
+        fonts = getattr(self._local, "fonts", None)
+        if fonts is None:
+            fonts = self._local.fonts = {}
+        return fonts
+
+    def _axis_values(self, weight: Optional[int], width: Optional[int]) -> list:
+        """Eksen sırası fonttan okunur; verilmeyen eksenler varsayılan değerinde kalır."""
+        values = []
+        for axis in self._axes:
+            name = axis["name"].decode() if isinstance(axis["name"], bytes) else axis["name"]
+            if name == "Weight" and weight is not None:
+                values.append(weight)
+            elif name == "Width" and width is not None:
+                values.append(width)
+            else:
+                values.append(axis["default"])
+        return values
+
+    def get(self, size: int, weight: Optional[int] = None, width: Optional[int] = None) -> ImageFont.FreeTypeFont:
+        """İstenen boyut/kalınlık/genişlikte hazır font nesnesini döndürür."""
+        key = (size, weight, width)
+        fonts = self._fonts()
+        font = fonts.get(key)
+        if font is None:
+            font = ImageFont.truetype(BytesIO(self._font_bytes), size)
+            if weight is not None or width is not None:
+                font.set_variation_by_axes(self._axis_values(weight, width))
+            fonts[key] = font
+        return font
+
+
+@lru_cache()
+def get_font_registry(font_path: str = "assets/fonts/OpenSans-VariableFont_wdth,wght.ttf") -> FontRegistry:
+    """Font dosyası başına süreç genelinde paylaşılan font havuzunu döndürür."""
+    return FontRegistry(font_path)
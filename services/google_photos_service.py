@@ -1,16 +1,24 @@
 import os
-import io
+import asyncio
+from datetime import datetime, UTC
 import pickle
-import requests
 import json
-from typing import Optional
+from typing import Iterator, List, Optional, Union
+import httpx
 from PIL import Image
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from core.config import get_settings
 from core.token_service import TokenService
+from services.image_encoder import EncodedImage, get_image_encoder
+
+try:
+    # HTTP/2 için h2 paketi gerekir; yoksa HTTP/1.1 keep-alive kullanılır
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 """ NOTLAR
 1. Token Yönetimi:
@@ -55,15 +63,131 @@ class GooglePhotosService:
     ]
     ALBUM_NAME = "Uniyorum"
 
-    def __init__(self, token_path='token.pickle'):
+    def __init__(self, token_service: TokenService, token_path='token.pickle',
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.settings = get_settings()
         self.token_path = token_path
-        self.token_service = TokenService()
+        self.token_service = token_service
         self.credentials = None
-        self.service = None
         self.album_id = None
+        self._credentials_lock = asyncio.Lock()
+        self._album_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Tüm Photos API çağrıları tek, uzun ömürlü istemci üzerinden yapılır (keep-alive bağlantı havuzu).
+        # Testlerde sahte bir Photos API sunucusuna bağlı istemci verilebilir.
+        self.http_client = http_client or self._create_http_client()
+        # Aynı anda Google'a giden istek sayısı sınırlanır
+        self._request_semaphore = asyncio.Semaphore(self.settings.GOOGLE_PHOTOS_MAX_CONCURRENCY)
         print("✅ GooglePhotosService başlatıldı")
 
+    def _create_http_client(self) -> httpx.AsyncClient:
+        settings = self.settings
+        return httpx.AsyncClient(
+            base_url=settings.GOOGLE_PHOTOS_API_URL,
+            http2=settings.GOOGLE_PHOTOS_HTTP2 and HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(
+                settings.GOOGLE_PHOTOS_TIMEOUT_SECONDS,
+                connect=settings.GOOGLE_PHOTOS_CONNECT_TIMEOUT_SECONDS
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.GOOGLE_PHOTOS_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GOOGLE_PHOTOS_MAX_CONNECTIONS
+            )
+        )
+
+    async def start(self) -> None:
+        """Kayıtlı token'ı yükler ve süresi dolmadan yenileyen arka plan görevini başlatır.
+        Uygulama başlarken bir kez çağrılır; böylece istekler token yenilemesini beklemez."""
+        try:
+            await self.refresh_credentials()
+        except Exception as e:
+            # Token yoksa veya yenilenemiyorsa ilk istek eski akışla (ensure_credentials) deneyecek
+            print(f"⚠️ Başlangıçta kimlik bilgileri yüklenemedi: {str(e)}")
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def aclose(self) -> None:
+        """Yenileme görevini durdurur ve HTTP istemcisini kapatır. Uygulama kapanırken çağrılır."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+        await self.http_client.aclose()
+
+    def _seconds_until_refresh(self) -> float:
+        """Bir sonraki proaktif yenilemeye kalan süre."""
+        margin = self.settings.GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS
+        if self.credentials is None or self.credentials.expiry is None:
+            return margin
+        # google-auth expiry değerini naive UTC olarak tutar
+        remaining = (self.credentials.expiry - datetime.now(UTC).replace(tzinfo=None)).total_seconds()
+        return max(remaining - margin, 0)
+
+    def _expires_soon(self, credentials: Credentials) -> bool:
+        if credentials.expiry is None:
+            return False
+        remaining = (credentials.expiry - datetime.now(UTC).replace(tzinfo=None)).total_seconds()
+        return remaining <= self.settings.GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._seconds_until_refresh())
+            try:
+                await self.refresh_credentials()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Token arka planda yenilenemedi: {str(e)}")
+                await asyncio.sleep(60)
+
+    async def refresh_credentials(self) -> Credentials:
+        """Token'ı süresi dolmak üzereyse yeniler ve veritabanına kaydeder.
+        Önce veritabanındaki token okunur; başka bir süreç yenilemişse onu kullanır."""
+        async with self._credentials_lock:
+            token_data = await self.token_service.get_token_from_db()
+            credentials = pickle.loads(token_data) if token_data else self.credentials
+            if credentials is None:
+                raise GooglePhotosError("Veritabanında token bulunamadı", 400)
+
+            if credentials.valid and not self._expires_soon(credentials):
+                self.credentials = credentials
+                return credentials
+
+            if not credentials.refresh_token:
+                raise GooglePhotosError("Token yenilenemiyor (refresh token yok), lütfen yeniden giriş yapın", 400)
+
+            print("♻️ Token süresi dolmak üzere, arka planda yenileniyor...")
+            await asyncio.to_thread(credentials.refresh, Request())
+            await self.token_service.save_token_to_db(pickle.dumps(credentials))
+            self.credentials = credentials
+            print("✅ Token yenilendi ve veritabanına kaydedildi")
+            return credentials
+
+    async def _request(self, method: str, path: str, *, content_type: str = "application/json",
+                       headers: Optional[dict] = None, **kwargs) -> httpx.Response:
+        """Photos API'ye yetkili istek gönderir.
+        Bağlantı/zaman aşımı hataları GooglePhotosError'a çevrilir; HTTP durum kodu kontrolü çağırana bırakılır."""
+        credentials = await self.ensure_credentials()
+        request_headers = {
+            "Authorization": f"Bearer {credentials.token}",
+            "Content-type": content_type,
+            **(headers or {})
+        }
+        try:
+            async with self._request_semaphore:
+                return await self.http_client.request(method, path, headers=request_headers, **kwargs)
+        except httpx.TimeoutException as e:
+            raise GooglePhotosError(f"Google Photos API zaman aşımı: {method} {path}", 504) from e
+        except httpx.HTTPError as e:
+            raise GooglePhotosError(f"Google Photos API'ye bağlanılamadı: {e}", 502) from e
+
+    async def _request_json(self, method: str, path: str, error_message: str, **kwargs) -> dict:
+        """İsteği gönderir, 200 dışındaki yanıtlarda GooglePhotosError fırlatır ve JSON gövdesini döndürür."""
+        response = await self._request(method, path, **kwargs)
+        if response.status_code != 200:
+            raise GooglePhotosError(f"{error_message}: {response.text}", response.status_code)
+        return response.json()
+
     async def _get_credentials(self) -> Credentials:
         try:
             print("🔐 Kimlik bilgileri alınıyor...")
@@ -81,7 +205,8 @@ class GooglePhotosService:
             if not credentials or not credentials.valid:
                 if credentials and credentials.expired and credentials.refresh_token:
                     print("♻️ Token süresi dolmuş, yenileniyor...")
-                    credentials.refresh(Request())
+                    # google-auth yenilemesi senkron HTTP yapar, event loop'u bloklamaması için thread'de çalışır
+                    await asyncio.to_thread(credentials.refresh, Request())
                 else:
                     print("🆕 Yeni kimlik bilgileri oluşturuluyor...")
                     # Settings'ten credentials bilgilerini al
@@ -114,261 +239,341 @@ class GooglePhotosService:
         except Exception as e:
             raise GooglePhotosError(f"Kimlik doğrulama hatası: {e}", 400)
 
-    async def _get_service(self):
-        if not self.service:
-            print("🛠️ Google Photos servisi oluşturuluyor...")
+    async def ensure_credentials(self) -> Credentials:
+        """Kimlik bilgileri yoksa veya süresi dolmuşsa yeniden yükler.
+        Servis süreç boyunca paylaşıldığı için her istekte çağrılır; geçerli token varsa I/O yapmaz."""
+        if self.credentials is None or not self.credentials.valid:
+            async with self._credentials_lock:
+                # Kilidi beklerken başka bir istek yenilemiş olabilir
+                if self.credentials is None or not self.credentials.valid:
+                    await self._get_credentials()
+        return self.credentials
+
+    async def _create_album(self, title: str) -> dict:
+        """Verilen başlıkla yeni albüm oluşturur."""
+        return await self._request_json(
+            "POST", "/albums", "Albüm oluşturulamadı", json={"album": {"title": title}}
+        )
+
+    async def _find_album(self) -> Optional[dict]:
+        """ALBUM_NAME başlıklı albümü tüm sayfaları gezerek arar."""
+        page_token = None
+        while True:
+            params = {"pageSize": 50}
+            if page_token:
+                params["pageToken"] = page_token
+            albums_result = await self._request_json("GET", "/albums", "Albümler listelenemedi", params=params)
+            for album in albums_result.get('albums', []):
+                if album.get('title') == self.ALBUM_NAME:
+                    return album
+            page_token = albums_result.get('nextPageToken')
+            if not page_token:
+                return None
+
+    async def _resolve_album(self) -> str:
+        """Yazılabilir Uniyorum albümünü bulur, yoksa oluşturur."""
+        print("🔍 Albümler kontrol ediliyor...")
+        album = await self._find_album()
+
+        if album:
+            print(f"📁 Mevcut albüm bulundu: {self.ALBUM_NAME}")
+            # Albüm izinlerini kontrol et
             try:
-                # Credentials'ı al
-                if not self.credentials:
-                    self.credentials = await self._get_credentials()
-
-                # Token süresi kontrolü
-                if self.credentials.expired:
-                    print("❌ Token süresi dolmuş.")
-                    raise GooglePhotosError("Token süresi dolmuş, lütfen yeniden giriş yapın", 400)
-
-                # Servisi oluştur
-                self.service = build('photoslibrary', 'v1', 
-                    credentials=self.credentials,
-                    static_discovery=False,
-                    cache_discovery=False
+                album_details = await self._request_json(
+                    "GET", f"/albums/{album['id']}", "Albüm bilgisi alınamadı"
                 )
-                print("✅ Google Photos servisi oluşturuldu")
-            except GooglePhotosError:
-                # Token hatası için özel hata fırlat
-                raise
+                if album_details.get('isWriteable', False):
+                    return album['id']
+                print("⚠️ Albüm yazılabilir değil, yeni albüm oluşturuluyor...")
             except Exception as e:
-                print(f"❌ Servis oluşturma hatası: {str(e)}")
-                raise GooglePhotosError(f"Servis oluşturulamadı: {e}", 500)
-        return self.service
+                print(f"⚠️ Albüm izinleri kontrol edilemedi: {str(e)}")
+
+            # Yeni albüm oluştur
+            created_album = await self._create_album(f"{self.ALBUM_NAME}_new")
+            print(f"✅ Yeni albüm oluşturuldu: {self.ALBUM_NAME}_new")
+            return created_album['id']
 
+        # Albüm bulunamadıysa yeni oluştur
+        print(f"🆕 Yeni albüm oluşturuluyor: {self.ALBUM_NAME}")
+        created_album = await self._create_album(self.ALBUM_NAME)
+        print(f"✅ Albüm oluşturuldu: {self.ALBUM_NAME}")
+        return created_album['id']
 
     async def _get_or_create_album(self) -> str:
+        """Albüm id'sini döndürür. Sırasıyla bellekteki, veritabanındaki kayda bakılır;
+        ikisi de yoksa albüm Google'da aranır/oluşturulur ve veritabanına kaydedilir."""
         if self.album_id:
             return self.album_id
 
+        async with self._album_lock:
+            if self.album_id:
+                return self.album_id
+            try:
+                album_id = await self.token_service.get_album_id()
+                if album_id:
+                    print("📦 Albüm id'si veritabanından yüklendi")
+                else:
+                    album_id = await self._resolve_album()
+                    await self.token_service.save_album_id(album_id)
+                self.album_id = album_id
+                return album_id
+            except Exception as e:
+                print(f"❌ Albüm işlemi hatası: {str(e)}")
+                raise GooglePhotosError(f"Albüm işlemi hatası: {e}", 500)
+
+    async def _invalidate_album(self, album_id: str) -> None:
+        """Kullanılamayan albümün kaydını bellekten ve veritabanından siler."""
+        if self.album_id == album_id:
+            self.album_id = None
+        await self.token_service.clear_album_id(album_id)
+
+    async def _add_to_album(self, media_item_ids: List[str]) -> str:
+        """Medya öğelerini albüme ekler. Kayıtlı albüm silinmiş veya yazılamaz hale gelmişse
+        kayıt temizlenip albüm bir kez yeniden çözülür."""
+        album_id = await self._get_or_create_album()
         try:
-            service = await self._get_service()
-            print("🔍 Albümler kontrol ediliyor...")
-            
-            # Önce albümleri listele
-            albums_result = service.albums().list(pageSize=50).execute()
-            albums = albums_result.get('albums', [])
-            print(f"📚 Toplam {len(albums)} albüm bulundu")
-
-            # Mevcut albümü ara
-            for album in albums:
-                if album['title'] == self.ALBUM_NAME:
-                    self.album_id = album['id']
-                    print(f"📁 Mevcut albüm bulundu: {self.ALBUM_NAME}")
-                    
-                    # Albüm izinlerini kontrol et
-                    try:
-                        album_details = service.albums().get(albumId=self.album_id).execute()
-                        if not album_details.get('isWriteable', False):
-                            print("⚠️ Albüm yazılabilir değil, yeni albüm oluşturuluyor...")
-                            # Yeni albüm oluştur
-                            created_album = service.albums().create(
-                                body={
-                                    'album': {
-                                        'title': f"{self.ALBUM_NAME}_new"
-                                    }
-                                }
-                            ).execute()
-                            self.album_id = created_album['id']
-                            print(f"✅ Yeni albüm oluşturuldu: {self.ALBUM_NAME}_new")
-                            return self.album_id
-                        return self.album_id
-                    except Exception as e:
-                        print(f"⚠️ Albüm izinleri kontrol edilemedi: {str(e)}")
-                        # Yeni albüm oluştur
-                        created_album = service.albums().create(
-                            body={
-                                'album': {
-                                    'title': f"{self.ALBUM_NAME}_new"
-                                }
-                            }
-                        ).execute()
-                        self.album_id = created_album['id']
-                        print(f"✅ Yeni albüm oluşturuldu: {self.ALBUM_NAME}_new")
-                        return self.album_id
-
-            # Albüm bulunamadıysa yeni oluştur
-            print(f"🆕 Yeni albüm oluşturuluyor: {self.ALBUM_NAME}")
-            created_album = service.albums().create(
-                body={
-                    'album': {
-                        'title': self.ALBUM_NAME
-                    }
-                }
-            ).execute()
-            
-            self.album_id = created_album['id']
-            print(f"✅ Albüm oluşturuldu: {self.ALBUM_NAME}")
-            return self.album_id
+            await self.add_media_items_to_album(album_id, media_item_ids)
+        except GooglePhotosError as e:
+            if e.error_code not in (400, 403, 404):
+                raise
+            print(f"⚠️ Kayıtlı albüm kullanılamadı, yeniden çözülüyor: {album_id}")
+            await self._invalidate_album(album_id)
+            album_id = await self._get_or_create_album()
+            await self.add_media_items_to_album(album_id, media_item_ids)
+        return album_id
+
+
+    # Google'ın batchCreate ve batchAddMediaItems/batchRemoveMediaItems için kabul ettiği en fazla öğe sayısı
+    BATCH_LIMIT = 50
+
+    @staticmethod
+    def _chunks(items: List, size: int) -> Iterator[List]:
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    @staticmethod
+    def _encode_image(image: Image.Image) -> EncodedImage:
+        """Görseli ayarlardaki formatta Google'a gönderilecek byte'lara çevirir."""
+        return get_image_encoder().encode(image)
+
+    @staticmethod
+    def _file_name(comment_id: int, template_type: str, extension: str = "jpg") -> str:
+        return f"ComId_{comment_id}_{template_type}.{extension}"
+
+    async def _encode(self, image: Union[Image.Image, EncodedImage]) -> EncodedImage:
+        """Render worker'ında zaten kodlanmış görseller olduğu gibi kullanılır."""
+        if isinstance(image, EncodedImage):
+            return image
+        return await asyncio.to_thread(self._encode_image, image)
+
+    @staticmethod
+    def _new_media_description(comment_id: int) -> str:
+        # bir upload mevcutsa paylaşımı otomatik yapılmadı demektir.
+        return f"Paylaşım: ❌ Uniyorum Comment ID: {comment_id}"
+
+    async def upload_bytes(self, content: bytes, file_name: str, mime_type: Optional[str] = None) -> str:
+        """Görsel byte'larını yükler ve upload token'ı döndürür."""
+        headers = {
+            "X-Goog-Upload-File-Name": file_name,
+            "X-Goog-Upload-Protocol": "raw"
+        }
+        if mime_type:
+            headers["X-Goog-Upload-Content-Type"] = mime_type
+        try:
+            upload_response = await self._request(
+                "POST", "/uploads",
+                content_type="application/octet-stream",
+                headers=headers,
+                content=content
+            )
+        except UnicodeEncodeError as e:
+            error_msg = f"Google Photos API Hatası: {str(e)}. Lütfen dosya adında Türkçe karakter kullanmayın. (Hatalı değer: {file_name})"
+            print(f"❌ {error_msg}")
+            raise GooglePhotosError(
+                error_msg,
+                400,
+                problematic_value=file_name
+            )
+
+        if upload_response.status_code != 200:
+            error_msg = f"Google Photos API Hatası: {upload_response.text}. Lütfen tekrar deneyin."
+            print(f"❌ {error_msg}")
+            raise GooglePhotosError(error_msg, 500)  # Internal Server Error
+
+        return upload_response.text
+
+    async def batch_create_media_items(self, new_media_items: List[dict]) -> List[dict]:
+        """newMediaItems listesini BATCH_LIMIT'lik parçalar halinde oluşturur.
+        Sonuçlar girdiyle aynı sıradadır. Başarısız bir parçanın öğeleri mediaItem içermeyen,
+        yalnızca status bilgisi olan sonuçlarla döner."""
+        results: List[dict] = []
+        for chunk in self._chunks(new_media_items, self.BATCH_LIMIT):
+            create_response = await self._request(
+                "POST", "/mediaItems:batchCreate", json={"newMediaItems": chunk}
+            )
+            if create_response.status_code != 200:
+                failure = {"status": {"code": create_response.status_code, "message": create_response.text}}
+                results.extend(failure for _ in chunk)
+                continue
+            chunk_results = create_response.json().get('newMediaItemResults', [])
+            # Google sonuçları istek sırasıyla döndürür; eksik dönen öğeler başarısız sayılır
+            chunk_results += [{"status": {"message": "Media item oluşturulamadı"}}] * (len(chunk) - len(chunk_results))
+            results.extend(chunk_results)
+        return results
+
+    async def add_media_items_to_album(self, album_id: str, media_item_ids: List[str]) -> None:
+        """Medya öğelerini BATCH_LIMIT'lik parçalar halinde albüme ekler."""
+        for chunk in self._chunks(media_item_ids, self.BATCH_LIMIT):
+            add_response = await self._request(
+                "POST", f"/albums/{album_id}:batchAddMediaItems", json={"mediaItemIds": chunk}
+            )
+            if add_response.status_code != 200:
+                raise GooglePhotosError(f"Albüme eklenemedi: {add_response.text}", add_response.status_code)
 
+    async def remove_media_items_from_album(self, album_id: str, media_item_ids: List[str]) -> None:
+        """Medya öğelerini BATCH_LIMIT'lik parçalar halinde albümden kaldırır."""
+        for chunk in self._chunks(media_item_ids, self.BATCH_LIMIT):
+            delete_response = await self._request(
+                "POST", f"/albums/{album_id}:batchRemoveMediaItems", json={"mediaItemIds": chunk}
+            )
+            if delete_response.status_code != 200:
+                raise GooglePhotosError(f"Fotoğraf albümden silinemedi: {delete_response.text}", delete_response.status_code)
+
+    async def _retire_old_media_items(self, old_items: List[tuple]) -> None:
+        """Yerine yenisi yüklenen fotoğrafları albümden kaldırır ve açıklamalarını 'İptal' yapar.
+        old_items: (comment_id, eski google_photos_id) listesi. Hatalar yalnızca log'lanır."""
+        ### google photos api fotoğraf silmeyi desteklemiyor.
+        # biz de silmek yerine ilgili albümden kaldırıp açıklamasını İptal olarak değiştirelim.
+        # ama bizim veritabanımızda silmek yerine yeni bilgiler ile ilgili fotoyu tutacağız
+        # yani güncellenmiş halini tutacağız.
+        try:
+            album_id = await self._get_or_create_album()
+            await self.remove_media_items_from_album(album_id, [media_id for _, media_id in old_items])
+            print(f"✅ {len(old_items)} eski fotoğraf albümden kaldırıldı")
         except Exception as e:
-            print(f"❌ Albüm işlemi hatası: {str(e)}")
-            raise GooglePhotosError(f"Albüm işlemi hatası: {e}", 500)
+            print(f"⚠️ Silinen medya albümden kaldırılırken hata oluştu: {str(e)}")
+            # Eski fotoğraf silinmese bile devam et.
+            # ama bunu birşekilde bilmemiz lazım ?
+            return
+
+        # Açıklama güncellemesinin toplu karşılığı yok; istekler eşzamanlı gönderilir
+        print("✅ Silinen medya öğesi açıklamaları düzenleniyor...")
+        results = await asyncio.gather(*(
+            self.update_media_item_description(
+                media_id,
+                f"İptal: ❌ Uniyorum Comment ID: {comment_id} - Bu resmi silebilirsin."
+            )
+            for comment_id, media_id in old_items
+        ), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"⚠️ Silinen medya açıklaması güncellenirken hata oluştu: {str(result)}")
+                # Açıklama güncellenmese bile devam et
+
+    async def upload_images(self, items: List[tuple]) -> List[Union[dict, GooglePhotosError]]:
+        """Birden fazla görseli toplu olarak yükler.
+
+        items: (image, comment_id, template_type, DB_google_photos_id) listesi; image bir PIL
+        görseli ya da render worker'ında kodlanmış EncodedImage olabilir.
+        Byte'lar eşzamanlı yüklenir, media item'lar ve albüm eklemeleri BATCH_LIMIT'lik
+        toplu çağrılarla yapılır. Her öğe için media item ya da GooglePhotosError döner.
+        """
+        print(f"📤 Toplu yükleme başladı: {len(items)} görsel")
+        results: List[Union[dict, GooglePhotosError]] = [None] * len(items)
+
+        async def upload(image: Union[Image.Image, EncodedImage], comment_id: int, template_type: str) -> str:
+            encoded = await self._encode(image)
+            return await self.upload_bytes(
+                encoded.data, self._file_name(comment_id, template_type, encoded.extension), encoded.mime_type
+            )
 
+        upload_tokens = await asyncio.gather(*(
+            upload(image, comment_id, template_type) for image, comment_id, template_type, _ in items
+        ), return_exceptions=True)
+
+        uploaded = []  # (index, yeni media item tanımı)
+        for index, token in enumerate(upload_tokens):
+            if isinstance(token, Exception):
+                results[index] = token if isinstance(token, GooglePhotosError) else GooglePhotosError(f"Yükleme hatası: {token}", 500)
+                continue
+            uploaded.append((index, {
+                "description": self._new_media_description(items[index][1]),
+                "simpleMediaItem": {"uploadToken": token}
+            }))
+        print(f"📥 {len(uploaded)} upload token alındı")
+
+        created = await self.batch_create_media_items([new_item for _, new_item in uploaded])
+
+        new_media_ids = []
+        old_items = []
+        for (index, _), result in zip(uploaded, created):
+            media_item = result.get('mediaItem')
+            if not media_item:
+                status = result.get('status', {})
+                results[index] = GooglePhotosError(f"Media item oluşturulamadı: {status.get('message')}", 500)
+                continue
+            results[index] = media_item
+            _, comment_id, _, DB_google_photos_id = items[index]
+            new_media_ids.append((index, media_item['id']))
+            if DB_google_photos_id is not None:
+                old_items.append((comment_id, DB_google_photos_id))
+        print(f"✅ {sum(isinstance(result, dict) for result in results)} media item oluşturuldu")
+
+        if new_media_ids:
+            try:
+                await self._add_to_album([media_id for _, media_id in new_media_ids])
+                print(f"✅ {len(new_media_ids)} media albüme eklendi")
+            except GooglePhotosError as e:
+                for index, _ in new_media_ids:
+                    results[index] = e
+                # Albüme eklenemeyen yeni fotoğrafların eskileri albümde kalmalı
+                return results
+
+        if old_items:
+            await self._retire_old_media_items(old_items)
+
+        return results
 
-    async def upload_image(self, image: Image.Image, comment_id: int, template_type: str, DB_google_photos_id: str) -> str:
+    async def upload_image(self, image: Union[Image.Image, EncodedImage], comment_id: int, template_type: str, DB_google_photos_id: str) -> str:
         try:
             print(f"📤 Yükleme başladı: comment_id={comment_id}")
 
-            # aynı bilgiler ile resim üretilirse gelen media_item_id ile veritabanımdaki değer eşleşir.
-            # bu durumda hiçbir şey yapılmayacak.
-            if image.mode == 'RGBA':
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                background.paste(image, mask=image.split()[3])
-                image = background
-
-            
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='JPEG')
-            img_byte_arr.seek(0)
+            encoded = await self._encode(image)
 
             # Upload token alma
             print("🔑 Upload token alınıyor...")
-            file_name = f"ComId_{comment_id}_{template_type}.jpg"
-            try:
-                upload_headers = {
-                    "Authorization": f"Bearer {self.credentials.token}",
-                    "Content-type": "application/octet-stream",
-                    "X-Goog-Upload-File-Name": file_name,
-                    "X-Goog-Upload-Protocol": "raw"
-                }
-                upload_response = requests.post(
-                    "https://photoslibrary.googleapis.com/v1/uploads",
-                    headers=upload_headers,
-                    data=img_byte_arr.getvalue()
-                )
-
-            except UnicodeEncodeError as e:
-                error_msg = f"Google Photos API Hatası: {str(e)}. Lütfen dosya adında Türkçe karakter kullanmayın. (Hatalı değer: {file_name})"
-                print(f"❌ {error_msg}")
-                raise GooglePhotosError(
-                    error_msg,
-                    400,
-                    problematic_value=file_name
-                )
-
-            if upload_response.status_code != 200:
-                error_msg = f"Google Photos API Hatası: {upload_response.text}. Lütfen tekrar deneyin."
-                print(f"❌ {error_msg}")
-                raise GooglePhotosError(error_msg, 500)  # Internal Server Error
-
-            upload_token = upload_response.text
+            upload_token = await self.upload_bytes(
+                encoded.data, self._file_name(comment_id, template_type, encoded.extension), encoded.mime_type
+            )
             print(f"📥 Upload token alındı")
 
             # Media item oluştur
             print("📦 Media item oluşturuluyor...")
-            create_headers = {
-                "Authorization": f"Bearer {self.credentials.token}",
-                "Content-type": "application/json"
-            }
-
-            create_body = {
-                "newMediaItems": [
-                    {
-                        # bir upload mevcutsa paylaşımı otomatik yapılmadı demektir.
-                        "description": f"Paylaşım: ❌ Uniyorum Comment ID: {comment_id}",
-                        "simpleMediaItem": {
-                            "uploadToken": upload_token
-                        }
-                    }
-                ]
-            }
-
-            create_response = requests.post(
-                "https://photoslibrary.googleapis.com/v1/mediaItems:batchCreate",
-                headers=create_headers,
-                json=create_body
-            )
-
-            if create_response.status_code != 200:
-                raise GooglePhotosError(f"Media item oluşturulamadı: {create_response.text}", 500)
-
-            response_json = create_response.json()
+            create_results = await self.batch_create_media_items([{
+                "description": self._new_media_description(comment_id),
+                "simpleMediaItem": {
+                    "uploadToken": upload_token
+                }
+            }])
             print("📦 Media oluşturma yanıtı alındı")
 
-            if 'newMediaItemResults' not in response_json:
-                raise GooglePhotosError("Media item oluşturulamadı", 500)
-
-            media_item = response_json['newMediaItemResults'][0].get('mediaItem')
+            media_item = create_results[0].get('mediaItem')
             if not media_item:
-                raise GooglePhotosError("Media item bilgisi alınamadı", 500)
+                raise GooglePhotosError(f"Media item oluşturulamadı: {create_results[0].get('status')}", 500)
 
             print(f"✅ Media yükleme başarılı: {media_item['id']}")
 
-            # eğer DB_google_photos_id None değilse ve media_item_id ile aynı ise aynı resmi isitiyor demektir.
-            if (DB_google_photos_id is not None) and (DB_google_photos_id == media_item['id']):
-                print(f"🔄 Mevcut fotoğraf bulundu, hiçbir şey yapılmayacak !!!\n{DB_google_photos_id}")
-                return media_item
-
-
-            # eğer kullanıcı yeni bir resim üretmişse o resmi ilgili albüme de yükleyelim.
-            print("🆕 Kullanıcı yeni bir resim üretmiş.")
-
+            # Her yükleme yeni bir media item üretir; aynı görselin tekrar yüklenmesi
+            # ShareService'te parmak izi karşılaştırmasıyla (yüklemeden önce) engellenir.
             # Albüme ekle
-            print("📁 Albüm kontrol ediliyor...")
-            album_id = await self._get_or_create_album()
-            
-            print(f"📁 Media albüme ekleniyor: {album_id}")
-            add_response = requests.post(
-                f"https://photoslibrary.googleapis.com/v1/albums/{album_id}:batchAddMediaItems",
-                headers=create_headers,
-                json={"mediaItemIds": [media_item['id']]}
-            )
-
-            if add_response.status_code != 200:
-                raise GooglePhotosError(f"Albüme eklenemedi: {add_response.text}", add_response.status_code)
+            print("📁 Media albüme ekleniyor...")
+            album_id = await self._add_to_album([media_item['id']])
+            print(f"✅ Media albüme eklendi: {album_id}")
 
-            print(f"✅ Media albüme eklendi")
-
-            # Eğer eski fotoğraf varsa sil
-            ### google photos api fotoğraf silmeyi desteklemiyor.
-            # biz de silmek yerine ilgili albümden kaldırıp açıklamasını İptal olarak değiştirelim.
-            # ama bizim veritabanımızda silmek yerine yeni bilgiler ile ilgili fotoyu tutacağız
-            # yani güncellenmiş halini tutacağız.
+            # Eğer eski fotoğraf varsa albümden kaldır
             if DB_google_photos_id is not None:
                 print(f"🗑️ Eski fotoğraf albümden kaldırılıyor: {DB_google_photos_id}")
-                try:
-                    # Önce albüm ID'sini al
-                    album_id = await self._get_or_create_album()
-                    
-                    delete_response = requests.post(
-                        f"https://photoslibrary.googleapis.com/v1/albums/{album_id}:batchRemoveMediaItems",
-                        headers={
-                            "Authorization": f"Bearer {self.credentials.token}",
-                            "Content-type": "application/json"
-                        },
-                        json={"mediaItemIds": [DB_google_photos_id]}
-                    )
-                    
-                    if delete_response.status_code != 200:
-                        raise GooglePhotosError(f"Fotoğraf albümden silinemedi: {delete_response.text}", delete_response.status_code)
-                        
-                    print("✅ Eski fotoğraf başarıyla albümden kaldırıldı")
-
-                    # Fotoğrafın açıklamasını "İptal" olarak güncelle
-                    try:
-                        # daha sonra bu açıklama değişimini replace ile yapabiliriz
-                        # ama veritabanından veriyi çekmemiz ya da parametre olarak nesneyi almamız gerekecek.
-                        print("✅ Silinen medya öğesi açıklamaları düzenleniyor...")
-                        await self.update_media_item_description(
-                            DB_google_photos_id,
-                            f"İptal: ❌ Uniyorum Comment ID: {comment_id} - Bu resmi silebilirsin."
-                        )
-                        print("✅ Silinen medya açıklaması 'İptal' olarak güncellendi")
-                    except Exception as e:
-                        print(f"⚠️ Silinen medya açıklaması güncellenirken hata oluştu: {str(e)}")
-                        # Açıklama güncellenmese bile devam et
-
-                except Exception as e:
-                    print(f"⚠️ Silinen medya albümden kaldırılırken hata oluştu: {str(e)}")
-                    # Eski fotoğraf silinmese bile devam et.
-                    # ama bunu birşekilde bilmemiz lazım ?
+                await self._retire_old_media_items([(comment_id, DB_google_photos_id)])
 
             return media_item
 
@@ -383,9 +588,9 @@ class GooglePhotosService:
         """Google Photos'tan belirli bir medya öğesinin bilgilerini getirir."""
         try:
             print(f"🔍 Medya öğesi getiriliyor: {media_item_id}")
-            service = await self._get_service()
-
-            response = service.mediaItems().get(mediaItemId=media_item_id).execute()
+            response = await self._request_json(
+                "GET", f"/mediaItems/{media_item_id}", "Medya öğesi getirilemedi"
+            )
             print(f"✅ Medya öğesi başarıyla getirildi.")
 
             return response
@@ -399,14 +604,13 @@ class GooglePhotosService:
         """Google Photos'taki bir medya öğesinin açıklamasını günceller."""
         try:
             print(f"📝 Medya öğesi açıklaması güncelleniyor...")
-            service = await self._get_service()
             
             # Güncellemeyi kaydet
-            response = service.mediaItems().patch(
-                id=media_item_id,
-                updateMask="description",  # Bu satırı ekleyin
-                body={"description": description}
-            ).execute()
+            response = await self._request_json(
+                "PATCH", f"/mediaItems/{media_item_id}", "Medya öğesi açıklaması güncellenemedi",
+                params={"updateMask": "description"},
+                json={"description": description}
+            )
 
             print("✅ Medya öğesi açıklaması başarıyla güncellendi")
             return response
@@ -0,0 +1,60 @@
+from typing import Optional, Sequence, Tuple
+import math
+
+import numpy as np
+from PIL import Image
+
+
+Color = Tuple[int, int, int]
+
+
+def create_linear_gradient(width: int, height: int, colors: Sequence[Color],
+                           angle: float = 45.0,
+                           stops: Optional[Sequence[float]] = None) -> Image.Image:
+    """Çok duraklı doğrusal gradyanı tek bir NumPy işlemiyle oluşturur.
+
+    Args:
+        width: Tuval genişliği
+        height: Tuval yüksekliği
+        colors: Durak renkleri (en az 2 adet, RGB)
+        angle: Gradyan yönü (derece). 0 soldan sağa, 90 yukarıdan aşağıya,
+            45 sol üstten sağ alta (mevcut şablonlardaki çapraz gradyan).
+        stops: 0-1 aralığında artan durak konumları. Verilmezse eşit aralıklı.
+
+    Returns:
+        Image.Image: RGBA gradyan görseli (alfa tamamen opak)
+    """
+    if len(colors) < 2:
+        raise ValueError("Gradyan için en az 2 renk gerekli")
+
+    if stops is None:
+        stops = np.linspace(0.0, 1.0, len(colors))
+    else:
+        stops = np.asarray(stops, dtype=np.float64)
+        if len(stops) != len(colors):
+            raise ValueError("Durak sayısı renk sayısı ile aynı olmalı")
+        if np.any(np.diff(stops) < 0):
+            raise ValueError("Durak konumları artan sırada olmalı")
+
+    # Yön vektörü; her pikselin bu vektör üzerindeki izdüşümü gradyan konumunu verir.
+    radians = math.radians(angle)
+    dir_x = round(math.cos(radians), 12)
+    dir_y = round(math.sin(radians), 12)
+
+    # İzdüşüm aralığı tuvalin köşelerinden hesaplanır.
+    # 45 derecede bu, eski (x + y) / (width + height) formülüne denk gelir.
+    offset = min(0.0, width * dir_x) + min(0.0, height * dir_y)
+    span = abs(width * dir_x) + abs(height * dir_y)
+
+    xs = np.arange(width, dtype=np.float64) * dir_x
+    ys = np.arange(height, dtype=np.float64) * dir_y
+    position = (ys[:, None] + xs[None, :] - offset) / span
+
+    palette = np.asarray(colors, dtype=np.float64)[:, :3]
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    for channel in range(3):
+        # int() ile aynı davranış için aşağı yuvarla (değerler her zaman pozitif)
+        pixels[..., channel] = np.interp(position, stops, palette[:, channel]).astype(np.uint8)
+    pixels[..., 3] = 255
+
+    return Image.fromarray(pixels, "RGBA")
@@ -0,0 +1,124 @@
+import io
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+from core.config import get_settings
+
+
+class EncodedImage(NamedTuple):
+    """Yüklemeye hazır görsel byte'ları.
+    Render worker süreçlerinden ana sürece tam kare görsel yerine yalnızca bu taşınır."""
+    data: bytes
+    mime_type: str
+    extension: str
+
+
+class ImageEncoder:
+    """Renderer çıktısını JPEG, WebP veya PNG byte'larına çevirir.
+
+    target_bytes verilirse kalite, çıktı bu boyutun altında kalan en yüksek değere
+    ikili arama ile ayarlanır (min_quality altına inilmez). PNG kayıpsız olduğu için
+    kalite ve hedef boyut ayarları PNG'de kullanılmaz.
+    """
+
+    FORMATS = {
+        "JPEG": ("image/jpeg", "jpg"),
+        "WEBP": ("image/webp", "webp"),
+        "PNG": ("image/png", "png"),
+    }
+
+    def __init__(self, format: str = "JPEG", quality: int = 85, subsampling: str = "4:2:0",
+                 progressive: bool = True, optimize: bool = True, webp_method: int = 4,
+                 target_bytes: Optional[int] = None, min_quality: int = 40,
+                 background: Tuple[int, int, int] = (255, 255, 255)):
+        format = format.upper()
+        if format == "JPG":
+            format = "JPEG"
+        if format not in self.FORMATS:
+            raise ValueError(f"Desteklenmeyen görsel formatı: {format}. Geçerli formatlar: {', '.join(self.FORMATS)}")
+        self.format = format
+        self.mime_type, self.extension = self.FORMATS[format]
+        self.quality = quality
+        self.subsampling = subsampling
+        self.progressive = progressive
+        self.optimize = optimize
+        self.webp_method = webp_method
+        self.target_bytes = target_bytes
+        self.min_quality = min(min_quality, quality)
+        self.background = background
+
+    @property
+    def signature(self) -> str:
+        """Çıktı byte'larını etkileyen ayarların özeti; artifact anahtarlarında kullanılır."""
+        return ":".join(str(value) for value in (
+            self.format, self.quality, self.subsampling, self.progressive, self.optimize,
+            self.webp_method, self.target_bytes, self.min_quality, self.background
+        ))
+
+    def _flatten(self, image: Image.Image) -> Image.Image:
+        """Saydam görseli arka plan rengine düzleştirir. Renderer opak çizdiyse görsel olduğu gibi döner."""
+        if image.mode == "RGB":
+            return image
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, self.background)
+            background.paste(image, mask=image.getchannel("A"))
+            return background
+        return image.convert("RGB")
+
+    def _save_options(self, quality: int) -> dict:
+        if self.format == "PNG":
+            return {}
+        if self.format == "WEBP":
+            return {"quality": quality, "method": self.webp_method}
+        return {
+            "quality": quality,
+            "subsampling": self.subsampling,
+            "progressive": self.progressive,
+            "optimize": self.optimize,
+        }
+
+    def _encode_with_quality(self, image: Image.Image, quality: int) -> bytes:
+        buffer = io.BytesIO()
+        image.save(buffer, format=self.format, **self._save_options(quality))
+        return buffer.getvalue()
+
+    def encode(self, image: Image.Image) -> EncodedImage:
+        """Görseli ayarlardaki format ve kaliteyle kodlar."""
+        image = self._flatten(image)
+        data = self._encode_with_quality(image, self.quality)
+
+        if self.format != "PNG" and self.target_bytes and len(data) > self.target_bytes:
+            # Hedef boyutu aşmayan en yüksek kaliteyi bul; hiçbiri sığmazsa en düşük kalite kullanılır
+            low, high = self.min_quality, self.quality - 1
+            best = None
+            while low <= high:
+                quality = (low + high) // 2
+                candidate = self._encode_with_quality(image, quality)
+                if len(candidate) <= self.target_bytes:
+                    best = candidate
+                    low = quality + 1
+                else:
+                    high = quality - 1
+            data = best if best is not None else self._encode_with_quality(image, self.min_quality)
+
+        return EncodedImage(data, self.mime_type, self.extension)
+
+
+@lru_cache()
+def get_image_encoder(format: Optional[str] = None) -> ImageEncoder:
+    """Ayarlardaki değerlerle süreç genelinde paylaşılan encoder'ı döndürür.
+    format verilmezse yükleme formatı (IMAGE_FORMAT) kullanılır."""
+    settings = get_settings()
+    return ImageEncoder(
+        format=format or settings.IMAGE_FORMAT,
+        quality=settings.IMAGE_QUALITY,
+        subsampling=settings.IMAGE_JPEG_SUBSAMPLING,
+        progressive=settings.IMAGE_JPEG_PROGRESSIVE,
+        optimize=settings.IMAGE_JPEG_OPTIMIZE,
+        webp_method=settings.IMAGE_WEBP_METHOD,
+        target_bytes=settings.IMAGE_TARGET_BYTES,
+        min_quality=settings.IMAGE_MIN_QUALITY
+    )
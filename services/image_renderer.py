@@ -1,54 +1,57 @@
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import textwrap
 import os
-import requests
-from io import BytesIO
+import math
+from typing import Optional
+from services.gradient import create_linear_gradient
+from services.layer_cache import LayerCache, get_layer_cache
+from services.shadow import paste_shadow
+from services.emoji_atlas import EmojiAtlas, emoji_key, get_emoji_atlas
+from services.emoji_segmenter import EmojiSegmenter, get_emoji_segmenter
+from services.text_layout import TextLayout, get_text_layout
+from services.font_registry import get_font_registry
+from services.template_plan import RenderPlan, available_template_types, get_render_plan
 
 
 class ImageRenderer:
-    def __init__(self, text_font_path: str = "assets/fonts/OpenSans-VariableFont_wdth,wght.ttf"):
+    # Çıktıyı değiştiren her değişiklikte (yerleşim, renk, font, emoji seti) artırılmalı;
+    # paylaşım parmak izine girer, artırılınca eski görseller yeniden üretilir.
+    VERSION = "1"
+
+    # Yardımcı metotların varsayılan gölge katmanları: (offset, blur yarıçapı, renk).
+    # Şablonlar kendi değerlerini templates/*.json dosyalarından alır.
+    SHADOW_LAYERS = (
+        (15, 25, (0, 0, 0, 40)),  # Ana gölge
+        (20, 30, (0, 0, 0, 20)),  # İkinci katman gölge
+    )
+
+    def __init__(self, text_font_path: str = "assets/fonts/OpenSans-VariableFont_wdth,wght.ttf",
+                 layer_cache: Optional[LayerCache] = None,
+                 emoji_atlas: Optional[EmojiAtlas] = None):
         if not os.path.exists(text_font_path):
             raise FileNotFoundError(f"Metin font dosyası bulunamadı: {text_font_path}")
         
         self.text_font_path = text_font_path
-        self.emoji_cache = {}  # Emoji önbelleği
-
-    def _is_emoji(self, char: str) -> bool:
-        """Karakterin emoji olup olmadığını kontrol eder"""
-        return len(char.encode('utf-8')) > 2
+        # Font dosyası süreç başına bir kez okunur, hazır font nesneleri havuzdan alınır
+        self.fonts = get_font_registry(text_font_path)
+        # Emoji sprite atlası süreç genelinde bir kez yüklenir
+        if emoji_atlas is not None:
+            self.emoji_atlas = emoji_atlas
+            self.emoji_segmenter = EmojiSegmenter(emoji_atlas)
+            self.text_layout = TextLayout(self.emoji_segmenter)
+        else:
+            self.emoji_atlas = get_emoji_atlas()
+            self.emoji_segmenter = get_emoji_segmenter()
+            self.text_layout = get_text_layout()
+        # Arka plan + çerçeve + gölge katmanı süreç genelinde önbelleklenir
+        self.layer_cache = layer_cache if layer_cache is not None else get_layer_cache()
 
     def _get_emoji_image(self, emoji: str, size: int = 38) -> Image.Image:
-        """Emoji görselini CDN'den alır veya önbellekten döndürür"""
-        # Emoji için benzersiz bir anahtar oluştur
-        cache_key = f"{emoji}_{size}"
-        
-        # Önbellekte varsa döndür
-        if cache_key in self.emoji_cache:
-            return self.emoji_cache[cache_key]
-        
-        try:
-            # Emoji kodunu hex'e çevir ve formatla
-            emoji_hex = '-'.join([f"{ord(c):x}" for c in emoji])
-            # Twemoji CDN URL'i
-            url = f"https://cdn.jsdelivr.net/gh/twitter/twemoji@latest/assets/72x72/{emoji_hex}.png"
-            
-            response = requests.get(url)
-            if response.status_code == 200:
-                # Görseli yükle ve boyutlandır
-                emoji_img = Image.open(BytesIO(response.content))
-                # RGBA moduna çevir
-                emoji_img = emoji_img.convert('RGBA')
-                emoji_img = emoji_img.resize((size, size), Image.Resampling.LANCZOS)
-                
-                # Önbelleğe kaydet
-                self.emoji_cache[cache_key] = emoji_img
-                return emoji_img
-            else:
-                print(f"Emoji indirilemedi: {emoji} (URL: {url}, Status: {response.status_code})")
-                return Image.new("RGBA", (size, size), (0, 0, 0, 0))
-        except Exception as e:
-            print(f"Emoji işleme hatası: {e} (Emoji: {emoji})")
+        """Emoji görselini yerel sprite atlasından döndürür (ağ erişimi yok)"""
+        emoji_img = self.emoji_atlas.get(emoji, size)
+        if emoji_img is None:
+            print(f"Emoji atlasta bulunamadı: {emoji} ({emoji_key(emoji)})")
             return Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        return emoji_img
 
     def _draw_text_with_emojis(self, draw: ImageDraw.Draw, text: str, position: tuple, 
                              text_font: ImageFont.FreeTypeFont, fill: tuple, 
@@ -63,48 +66,32 @@ class ImageRenderer:
         # Emoji için dikey offset hesapla (metin yüksekliğinin ortasına hizala + ekstra offset)
         emoji_offset = ((text_height - emoji_size) // 2) + 8  # 8 piksel daha aşağı
         
-        for char in text:
-            if self._is_emoji(char):
-                # Emoji görselini al
-                emoji_img = self._get_emoji_image(char, emoji_size)
+        for segment, is_emoji in self.emoji_segmenter.segment(text):
+            if is_emoji:
+                # Emoji görselini al (ZWJ dizileri, bayraklar vb. tek sprite)
+                emoji_img = self._get_emoji_image(segment, emoji_size)
                 # Emojiyi yerleştir (dikey offset ile)
-                draw._image.paste(emoji_img, (int(current_x), int(y + emoji_offset)), emoji_img.split()[3])
+                draw._image.paste(emoji_img, (int(current_x), int(y + emoji_offset)), emoji_img)
                 current_x += emoji_size
-            else:
-                # Normal metin
-                bbox = text_font.getbbox(char)
-                draw.text((current_x, y), char, font=text_font, fill=fill)
-                current_x += bbox[2]
+                continue
+
+            # Ardışık düz metin tek çağrıda çizilir (kerning korunur)
+            draw.text((current_x, y), segment, font=text_font, fill=fill)
+            current_x += text_font.getlength(segment)
         
         return (current_x, y + line_height)
 
-    def _create_gradient_background(self, width: int, height: int, colors: list) -> Image.Image:    
+    def _create_gradient_background(self, width: int, height: int, colors: list,
+                                    angle: float = 45.0) -> Image.Image:
         """Gradyan arka plan oluşturur
         https://colorkit.co/gradient-maker/c8ff9e-ffc2ef-aefaf6/
+
+        Piksel piksel çizmek yerine gradyan NumPy ile tek seferde hesaplanır.
         """
-        image = Image.new("RGBA", (width, height), colors[-1])
-        draw = ImageDraw.Draw(image)
-        max_distance = width + height
-
-        for y in range(height):
-            for x in range(width):
-                distance = (x + y)
-                section_size = max_distance / (len(colors) - 1)
-                section = int(distance / section_size)
-                section_ratio = (distance % section_size) / section_size
-                
-                color1_index = min(section, len(colors) - 2)
-                color2_index = color1_index + 1
-                
-                r = int(colors[color1_index][0] * (1 - section_ratio) + colors[color2_index][0] * section_ratio)
-                g = int(colors[color1_index][1] * (1 - section_ratio) + colors[color2_index][1] * section_ratio)
-                b = int(colors[color1_index][2] * (1 - section_ratio) + colors[color2_index][2] * section_ratio)
-                
-                draw.point((x, y), fill=(r, g, b))
-        
-        return image
+        return create_linear_gradient(width, height, colors, angle=angle)
 
-    def _create_frame_with_shadows(self, image: Image.Image, frame_rect: list, frame_radius: int) -> Image.Image:
+    def _create_frame_with_shadows(self, image: Image.Image, frame_rect: list, frame_radius: int,
+                                   shadow_layers: tuple = SHADOW_LAYERS) -> Image.Image:
         """Çerçeve ve gölgeleri oluşturur"""
         width, height = image.size
         
@@ -120,31 +107,18 @@ class ImageRenderer:
         shadow_layer = Image.new("RGBA", (width, height), (0, 0, 0, 0))
         shadow_draw = ImageDraw.Draw(shadow_layer)
         
-        # Ana gölge
-        shadow_offset = 15
-        shadow_blur = 25
-        shadow_color = (0, 0, 0, 40)
-        shadow_rect = [
-            frame_rect[0] + shadow_offset,
-            frame_rect[1] + shadow_offset,
-            frame_rect[2] + shadow_offset,
-            frame_rect[3] + shadow_offset
-        ]
-        shadow_draw.rounded_rectangle(shadow_rect, radius=frame_radius, fill=shadow_color)
-        shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(shadow_blur))
-        
-        # İkinci katman gölge
-        shadow2_offset = 20
-        shadow2_blur = 30
-        shadow2_color = (0, 0, 0, 20)
-        shadow2_rect = [
-            frame_rect[0] + shadow2_offset,
-            frame_rect[1] + shadow2_offset,
-            frame_rect[2] + shadow2_offset,
-            frame_rect[3] + shadow2_offset
-        ]
-        shadow_draw.rounded_rectangle(shadow2_rect, radius=frame_radius, fill=shadow2_color)
-        shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(shadow2_blur))
+        # Not: shadow_draw ilk katmana bağlı kalır; filter() yeni bir görsel döndürdüğü için
+        # sonraki gölgeler görünür sonuca girmez, yalnızca blur'lar art arda uygulanır.
+        # Mevcut görünümü korumak için bu davranış bilerek değiştirilmedi.
+        for shadow_offset, shadow_blur, shadow_color in shadow_layers:
+            shadow_rect = [
+                frame_rect[0] + shadow_offset,
+                frame_rect[1] + shadow_offset,
+                frame_rect[2] + shadow_offset,
+                frame_rect[3] + shadow_offset
+            ]
+            shadow_draw.rounded_rectangle(shadow_rect, radius=frame_radius, fill=shadow_color)
+            shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(shadow_blur))
         
         # Katmanları birleştir: önce gölgeler, sonra çerçeve
         image = Image.alpha_composite(image, shadow_layer)
@@ -158,13 +132,92 @@ class ImageRenderer:
         
         return image
 
-    def _draw_headers(self, draw: ImageDraw.Draw, api_share_data, 
-                     text_color: tuple, content_padding_x: int, current_y: int, content_width: int) -> int:
-        header_font = ImageFont.truetype(self.text_font_path, 40)
-        
+    def _create_frame_with_fast_shadows(self, image: Image.Image, frame_rect: list, frame_radius: int,
+                                        shadow_layers: tuple = SHADOW_LAYERS) -> Image.Image:
+        """Çerçeve ve gölgeleri önbelleksiz durumlar için hızlı yoldan oluşturur.
+
+        _create_frame_with_shadows ile görsel olarak aynı sonucu verir: orada ilk gölge
+        tüm blur'lardan art arda geçtiği için tek bir eşdeğer Gaussian kullanılır
+        (sigma = sqrt(r1² + r2² + ...)). Blur yalnızca gölge bölgesinde ve düşük
+        çözünürlükte yapılır.
+        """
+        shadow_offset, _, shadow_color = shadow_layers[0]
+        shadow_blur = math.sqrt(sum(blur ** 2 for _, blur, _ in shadow_layers))
+        shadow_rect = [
+            frame_rect[0] + shadow_offset,
+            frame_rect[1] + shadow_offset,
+            frame_rect[2] + shadow_offset,
+            frame_rect[3] + shadow_offset
+        ]
+        # Çerçevenin köşe yarıçapı kadar içeride kalan kısmı zaten opak çerçeveyle örtülecek
+        covered_rect = [
+            frame_rect[0] + frame_radius,
+            frame_rect[1] + frame_radius,
+            frame_rect[2] - frame_radius,
+            frame_rect[3] - frame_radius
+        ]
+        paste_shadow(image, shadow_rect, frame_radius, shadow_color, shadow_blur, covered=covered_rect)
+
+        # Çerçeve tam opak olduğu için doğrudan çizilebilir
+        draw = ImageDraw.Draw(image)
+        draw.rounded_rectangle(frame_rect, radius=frame_radius, fill=(255, 255, 255, 255))
+
+        # İnce beyaz anahat
+        outline_width = 1
+        outline_color = (255, 255, 255, 180)
+        draw.rounded_rectangle(frame_rect, radius=frame_radius, outline=outline_color, width=outline_width)
+
+        return image
+
+    def _get_base_plate(self, plan: RenderPlan, mode: str = "RGBA") -> Image.Image:
+        """Metin dışındaki statik katmanı (gradyan, çerçeve, gölgeler) önbellekten döndürür.
+
+        mode="RGB" ise katman bir kez RGB'ye çevrilip o haliyle önbelleklenir.
+        Dönen görsel paylaşımlıdır, üzerine çizmeden önce copy() alınmalıdır.
+        """
+        def build() -> Image.Image:
+            image = self._create_gradient_background(*plan.size, plan.colors, plan.gradient_angle)
+            image = self._create_frame_with_shadows(image, list(plan.frame_rect), plan.frame_radius, plan.shadow_layers)
+            return image.convert(mode) if image.mode != mode else image
+
+        return self.layer_cache.get_or_build((plan.base_plate_key, mode), build)
+
+    def _build_uncached_base_plate(self, plan: RenderPlan, colors: list, mode: str = "RGBA") -> Image.Image:
+        """İsteğe özel paletler gibi önbelleğe alınmayan durumlar için statik katmanı üretir."""
+        image = self._create_gradient_background(*plan.size, colors, plan.gradient_angle)
+        image = self._create_frame_with_fast_shadows(image, list(plan.frame_rect), plan.frame_radius, plan.shadow_layers)
+        return image.convert(mode) if image.mode != mode else image
+
+    def _draw_wrapped_block(self, draw: ImageDraw.Draw, text: str, font: ImageFont.FreeTypeFont,
+                            weight: int, position: tuple, max_width: int, fill: tuple,
+                            last_line_gap: int, line_gap: int = 5) -> int:
+        """Metni genişliğe göre satırlara bölüp çizer ve son y pozisyonunu döndürür.
+        Satırlar arasında line_gap, son satırdan sonra last_line_gap kadar boşluk bırakır."""
+        x, y = position
+        wrapped_lines = self.text_layout.wrap(text, font, max_width, weight=weight)
+        for i, line in enumerate(wrapped_lines):
+            draw.text((x, y), line, font=font, fill=fill)
+            line_height = font.getbbox(line)[3]
+            if i < len(wrapped_lines) - 1:
+                y += line_height + line_gap
+            else:
+                y += line_height + last_line_gap
+        return y
+
+    def _draw_headers(self, draw: ImageDraw.Draw, api_share_data, plan: RenderPlan) -> int:
         """Başlıkları çizer ve son y pozisyonunu döndürür
-            en son hangi alan varsa onu 700 kalınlığında çizer
-            öncesini 500 kalınlığında çizer."""
+            en son hangi alan varsa onu vurgulu (header_emphasis) fontla çizer
+            öncesini normal başlık fontuyla çizer."""
+        current_y = plan.content_y
+
+        def draw_block(text: str, emphasis: bool) -> int:
+            size, weight = plan.header_emphasis_font if emphasis else plan.header_font
+            header_font = self.fonts.get(size, weight=weight)
+            last_line_gap = plan.header_last_gap if emphasis else plan.header_block_gap
+            return self._draw_wrapped_block(draw, text, header_font, weight, (plan.content_x, current_y),
+                                            plan.content_width, plan.text_color, last_line_gap,
+                                            plan.header_line_gap)
+
         if api_share_data.ins_name:
             # ins_name varsa, dep_name ve uni_name'i birleştir
             combined = ""
@@ -177,169 +230,128 @@ class ImageRenderer:
 
             if combined:
                 # uni_name ve dep_name kendi içinde wrapping ile çiz
-                header_font.set_variation_by_axes([500])
-                wrapped_lines = textwrap.wrap(combined, width=int(content_width / 20))
-                for i, line in enumerate(wrapped_lines):
-                    draw.text((content_padding_x, current_y), line, font=header_font, fill=text_color)
-                    line_height = header_font.getbbox(line)[3]
-                    if i < len(wrapped_lines) - 1:
-                        current_y += line_height + 5
-                    else:
-                        current_y += line_height + 15
+                current_y = draw_block(combined, False)
 
             # ins_name'i çiz
-            header_font.set_variation_by_axes([700])
-            wrapped_lines = textwrap.wrap(api_share_data.ins_name, width=int(content_width / 20))
-            for i, line in enumerate(wrapped_lines):
-                draw.text((content_padding_x, current_y), line, font=header_font, fill=text_color)
-                line_height = header_font.getbbox(line)[3]
-                if i < len(wrapped_lines) - 1:
-                    current_y += line_height + 5
-                else:
-                    current_y += line_height + 40
+            current_y = draw_block(api_share_data.ins_name, True)
 
         elif api_share_data.dep_name:
             # dep_name varsa, uni_name'i kendi içinde wrapping ile çiz, dep_name alt satırda
             if api_share_data.uni_name:
-                header_font.set_variation_by_axes([500])
-                wrapped_lines = textwrap.wrap(api_share_data.uni_name, width=int(content_width / 20))
-                for i, line in enumerate(wrapped_lines):
-                    draw.text((content_padding_x, current_y), line, font=header_font, fill=text_color)
-                    line_height = header_font.getbbox(line)[3]
-                    if i < len(wrapped_lines) - 1:
-                        current_y += line_height + 5
-                    else:
-                        current_y += line_height + 15
+                current_y = draw_block(api_share_data.uni_name, False)
 
             # dep_name'i çiz
-            header_font.set_variation_by_axes([700])
-            wrapped_lines = textwrap.wrap(api_share_data.dep_name, width=int(content_width / 20))
-            for i, line in enumerate(wrapped_lines):
-                draw.text((content_padding_x, current_y), line, font=header_font, fill=text_color)
-                line_height = header_font.getbbox(line)[3]
-                if i < len(wrapped_lines) - 1:
-                    current_y += line_height + 5
-                else:
-                    current_y += line_height + 40
+            current_y = draw_block(api_share_data.dep_name, True)
 
-        else:
+        elif api_share_data.uni_name:
             # sadece uni_name varsa, kendi içinde wrapping
-            header_font.set_variation_by_axes([700])
-            if api_share_data.uni_name:
-                wrapped_lines = textwrap.wrap(api_share_data.uni_name, width=int(content_width / 20))
-                for i, line in enumerate(wrapped_lines):
-                    draw.text((content_padding_x, current_y), line, font=header_font, fill=text_color)
-                    line_height = header_font.getbbox(line)[3]
-                    if i < len(wrapped_lines) - 1:
-                        current_y += line_height + 5
-                    else:
-                        current_y += line_height + 40
+            current_y = draw_block(api_share_data.uni_name, True)
 
         return current_y
 
     def _draw_comment(self, draw: ImageDraw.Draw, comment: str, text_font: ImageFont.FreeTypeFont,
-                     text_color: tuple, content_width: int, current_y: int, frame_rect: list,
-                     content_padding_x: int) -> int:
+                     current_y: int, plan: RenderPlan) -> int:
         """Yorum metnini çizer ve son y pozisyonunu döndürür"""
-        line_height = text_font.getbbox("A")[3] + 20
-        wrapped_lines = textwrap.wrap(comment, width=int(content_width / 20))
+        emoji_size = plan.comment_emoji_size
+        # Satır yüksekliği tahmini; satır aralığı büyük şablonlarda gerçek aralık kullanılır
+        line_height = text_font.getbbox("A")[3] + max(20, plan.comment_line_spacing + 2)
         
         # Maksimum yüksekliği hesapla
         footer_padding = 10  # footer'dan padding
         footer_text_height = text_font.getbbox("A")[3]  # footer metin yüksekliği
-        max_comment_height = frame_rect[3] - current_y - (footer_padding + footer_text_height + 10)  # 10px ekstra boşluk
+        max_comment_height = plan.frame_rect[3] - current_y - (footer_padding + footer_text_height + 10)  # 10px ekstra boşluk
         
         available_lines = int(max_comment_height / line_height)
-        
-        if len(wrapped_lines) > available_lines:
-            wrapped_lines = wrapped_lines[:available_lines]
-            last_line = wrapped_lines[-1]
-            while len(last_line) > 3 and text_font.getbbox(last_line + "...")[2] > content_width:
-                last_line = last_line[:-1]
-            wrapped_lines[-1] = last_line + "..."
+        if plan.comment_max_lines is not None:
+            available_lines = min(available_lines, plan.comment_max_lines)
+
+        # Piksel genişliğine göre satırlara böl, sığmayan son satırı "..." ile kısalt
+        wrapped_lines = self.text_layout.layout(comment, text_font, plan.content_width,
+                                                max_lines=available_lines, weight=plan.comment_font[1],
+                                                emoji_size=emoji_size)
 
         text_y = current_y + 5
-        text_x = content_padding_x
+        text_x = plan.content_x
 
         for line in wrapped_lines:
             text_y = self._draw_text_with_emojis(
                 draw, line, (text_x, text_y),
-                text_font, text_color, 40
-            )[1] + 18  # satır aralığı
+                text_font, plan.text_color, emoji_size
+            )[1] + plan.comment_line_spacing  # satır aralığı
 
         return text_y
 
     def _draw_footer(self, draw: ImageDraw.Draw, api_share_data, footer_font: ImageFont.FreeTypeFont,
-                    frame_rect: list, content_padding_x: int, width: int) -> None:
+                    plan: RenderPlan) -> None:
         """Alt bilgiyi çizer"""
-        bottom_padding = 50
-        date_str = api_share_data.comment_date.strftime("%d.%m.%Y %H:%M:%S")
-        writer = api_share_data.writer_name or "Anonim"
+        date_str = api_share_data.comment_date.strftime(plan.date_format)
+        writer = api_share_data.writer_name or plan.anonymous_name
         footer = f"{date_str} - {writer}"
         footer_bbox = footer_font.getbbox(footer)
-        footer_x = width - content_padding_x - footer_bbox[2]  # Sağdan padding kadar içeride
-        footer_y = frame_rect[3] - bottom_padding - footer_bbox[3]  # Alttan padding kadar yukarıda
-        draw.text((footer_x, footer_y), footer, font=footer_font, fill=(120, 120, 120))
-
-    def render(self, api_share_data) -> Image.Image:
-        width, height = 1080, 1350
-        # daha sonra belli paletler ile arkaplan randomize edilebilir.
-        colors = [
-            (200, 255, 158),  # #c8ff9e (açık yeşil)
-            (255, 194, 239),  # #ffc2ef (açık pembe)
-            (174, 250, 246)   # #aefaf6 (açık turkuaz)
-        ]
-        text_color = (30, 30, 30)
+        footer_x = plan.frame_rect[2] - (plan.content_x - plan.frame_rect[0]) - footer_bbox[2]  # Sağdan padding kadar içeride
+        footer_y = plan.frame_rect[3] - plan.footer_bottom_padding - footer_bbox[3]  # Alttan padding kadar yukarıda
+        draw.text((footer_x, footer_y), footer, font=footer_font, fill=plan.footer_color)
 
-        # Arka plan oluştur
-        image = self._create_gradient_background(width, height, colors)
+    # Yardımcı metotların varsayılan paleti; şablonlar kendi paletlerini tanımlar
+    DEFAULT_COLORS = [
+        (200, 255, 158),  # #c8ff9e (açık yeşil)
+        (255, 194, 239),  # #ffc2ef (açık pembe)
+        (174, 250, 246)   # #aefaf6 (açık turkuaz)
+    ]
 
-        # Çerçeve boyutlarını hesapla
-        frame_padding = 100
-        frame_radius = 20
-        body_width = width - (2 * frame_padding)
-        body_height = body_width
-        body_y_offset = (height - body_height) // 2
-        
-        frame_rect = [
-            frame_padding,
-            body_y_offset,
-            width - frame_padding,
-            body_y_offset + body_height
-        ]
+    def warm_up(self) -> None:
+        """Tüm şablonların planlarını, fontlarını ve statik katmanlarını önceden hazırlar
+        (worker başlangıcında çağrılır)."""
+        for template_type in available_template_types():
+            try:
+                plan = get_render_plan(template_type)
+            except ValueError as e:
+                print(f"⚠️ Şablon yüklenemedi: {str(e)}")
+                continue
+            for size, weight in plan.fonts:
+                self.fonts.get(size, weight=weight)
+            # Yükleme yolu doğrudan RGB çizer
+            self._get_base_plate(plan, mode="RGB")
 
-        # Çerçeve ve gölgeleri oluştur
-        image = self._create_frame_with_shadows(image, frame_rect, frame_radius)
-        draw = ImageDraw.Draw(image)
+    def render(self, api_share_data, colors: Optional[list] = None, mode: str = "RGBA",
+               plan: Optional[RenderPlan] = None) -> Image.Image:
+        """Görseli üretir.
 
-        # Fontları yükle
-        text_font = ImageFont.truetype(self.text_font_path, 40)
-        footer_font = ImageFont.truetype(self.text_font_path, 38)
+        Yerleşim, api_share_data.image_template_type şablonunun derlenmiş planından alınır
+        (plan verilirse o kullanılır). colors verilirse isteğe özel palet kullanılır; bu
+        durumda statik katman önbelleğe alınmaz ve gölgeler hızlı yoldan üretilir.
+        Gradyan her zaman opak olduğu için mode="RGB" ile görsel, JPEG/WebP'ye
+        dönüştürmek üzere düzleştirme gerektirmeden doğrudan RGB çizilir.
+        """
+        if plan is None:
+            plan = get_render_plan(getattr(api_share_data, "image_template_type", None))
+
+        # Arka plan, çerçeve ve gölgeleri önbellekten al; metin kopyanın üzerine çizilir
+        if colors is None:
+            image = self._get_base_plate(plan, mode).copy()
+        else:
+            image = self._build_uncached_base_plate(plan, colors, mode)
+        draw = ImageDraw.Draw(image)
 
-        # İçerik için padding değerlerini hesapla
-        content_padding_x = frame_rect[0] + 50
-        content_padding_y = frame_rect[1] + 40
-        current_y = content_padding_y
-        content_width = frame_rect[2] - frame_rect[0] - 100
+        # Fontları havuzdan al
+        text_font = self.fonts.get(plan.comment_font[0], weight=plan.comment_font[1])
+        footer_font = self.fonts.get(plan.footer_font[0], weight=plan.footer_font[1])
 
         # Başlıkları çiz
-        current_y = self._draw_headers(draw, api_share_data, text_color, content_padding_x, current_y, content_width)
+        current_y = self._draw_headers(draw, api_share_data, plan)
 
         # Ayırıcı çizgi
-        divider_height = 2
-        divider_y = current_y
-        divider_color = (200, 200, 200)
+        frame_rect = plan.frame_rect
         draw.line(
-            [(frame_rect[0], divider_y), (frame_rect[2], divider_y)],
-            fill=divider_color,
-            width=divider_height
+            [(frame_rect[0], current_y), (frame_rect[2], current_y)],
+            fill=plan.divider_color,
+            width=plan.divider_width
         )
-        current_y += divider_height + 30
+        current_y += plan.divider_width + plan.divider_gap
 
         # Yorum metnini çiz
-        current_y = self._draw_comment(draw, api_share_data.comment, text_font, text_color, 
-                                     content_width, current_y, frame_rect, content_padding_x)
+        current_y = self._draw_comment(draw, api_share_data.comment, text_font, current_y, plan)
 
         # Alt bilgiyi çiz
-        self._draw_footer(draw, api_share_data, footer_font, frame_rect, content_padding_x, width)
+        self._draw_footer(draw, api_share_data, footer_font, plan)
         return image
@@ -0,0 +1,303 @@
+import asyncio
+import os
+import random
+import socket
+from datetime import datetime, UTC, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, WTimeoutError
+
+from core.config import get_settings
+from db.models import ApiShare
+from services.google_photos_service import GooglePhotosError
+from services.render_executor import RenderQueueFullError
+
+
+# İş durumları
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JOB_TYPE_IMAGE_CREATE = "image-create"
+
+# Geçici kabul edilen, tekrar denenecek hatalar
+# (ConnectionFailure; AutoReconnect, NetworkTimeout ve ServerSelectionTimeoutError'u da kapsar)
+RETRYABLE_ERRORS = (GooglePhotosError, RenderQueueFullError, ConnectionFailure, ExecutionTimeout, WTimeoutError)
+
+
+class JobQueue:
+    """Görsel üretim işleri için MongoDB tabanlı kalıcı kuyruk.
+
+    İşler image_jobs koleksiyonunda tutulur. Worker'lar işi find_one_and_update ile
+    atomik olarak sahiplenir ve belirli bir süre (lease) kilitler; worker çökerse süre
+    dolunca iş başka bir worker tarafından tekrar alınır. Böylece kuyruk yeniden
+    başlatmalara dayanır ve birden fazla süreçle yatay ölçeklenir.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, max_attempts: int = 5, lease_seconds: float = 300,
+                 retry_base_seconds: float = 5, retry_max_seconds: float = 300):
+        self.db = db
+        self.collection = self.db.get_collection("image_jobs")
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(UTC)
+
+    @staticmethod
+    def _object_id(job_id: str) -> Optional[ObjectId]:
+        try:
+            return ObjectId(job_id)
+        except (InvalidId, TypeError):
+            return None
+
+    def _retry_delay(self, attempts: int) -> float:
+        """Üstel geri çekilme; aynı anda düşen işler birlikte tekrar denenmesin diye rastgele sapma eklenir."""
+        delay = min(self.retry_base_seconds * (2 ** max(attempts - 1, 0)), self.retry_max_seconds)
+        return delay * random.uniform(0.8, 1.2)
+
+    async def enqueue(self, api_share_data: ApiShare) -> dict:
+        """Görsel üretim işini kuyruğa ekler ve iş belgesini döndürür."""
+        now = self._now()
+        job = {
+            "type": JOB_TYPE_IMAGE_CREATE,
+            "payload": api_share_data.model_dump(),
+            "status": JOB_QUEUED,
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "run_at": now,
+            "locked_by": None,
+            "locked_until": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+        result = await self.collection.insert_one(job)
+        job["_id"] = result.inserted_id
+        return job
+
+    async def claim(self, worker_id: str) -> Optional[dict]:
+        """Çalışmaya hazır en eski işi atomik olarak sahiplenir.
+        Süresi dolmuş kilitli işler de (çöken worker'ların işleri) deneme hakkı kaldıysa tekrar alınabilir."""
+        now = self._now()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": JOB_QUEUED, "run_at": {"$lte": now}},
+                {
+                    "status": JOB_RUNNING,
+                    "locked_until": {"$lt": now},
+                    "$expr": {"$lt": ["$attempts", "$max_attempts"]}
+                }
+            ]},
+            {
+                "$set": {
+                    "status": JOB_RUNNING,
+                    "locked_by": worker_id,
+                    "locked_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def renew(self, job: dict, worker_id: str) -> bool:
+        """İşin kilidini lease süresi kadar uzatır. İş bu arada başka bir worker'a geçtiyse False döner."""
+        now = self._now()
+        updated = await self.collection.update_one(
+            {"_id": job["_id"], "status": JOB_RUNNING, "locked_by": worker_id},
+            {"$set": {"locked_until": now + timedelta(seconds=self.lease_seconds), "updated_at": now}}
+        )
+        return updated.modified_count == 1
+
+    async def complete(self, job: dict, worker_id: str, result: dict) -> bool:
+        """İşi başarılı olarak işaretler. İş bu arada başka bir worker'a geçtiyse False döner."""
+        now = self._now()
+        updated = await self.collection.update_one(
+            {"_id": job["_id"], "status": JOB_RUNNING, "locked_by": worker_id},
+            {"$set": {
+                "status": JOB_SUCCEEDED,
+                "result": result,
+                "error": None,
+                "locked_by": None,
+                "locked_until": None,
+                "updated_at": now,
+                "finished_at": now
+            }}
+        )
+        return updated.modified_count == 1
+
+    async def fail(self, job: dict, worker_id: str, error: Exception) -> str:
+        """Hatayı işe yazar. Geçici hatalarda deneme hakkı varsa iş geri çekilme süresi
+        sonrasına yeniden kuyruğa alınır, aksi halde kalıcı olarak başarısız olur.
+        İşin yeni durumunu döndürür."""
+        now = self._now()
+        retry = isinstance(error, RETRYABLE_ERRORS) and job["attempts"] < job["max_attempts"]
+        update = {
+            "error": str(error),
+            "locked_by": None,
+            "locked_until": None,
+            "updated_at": now
+        }
+        if retry:
+            update.update(status=JOB_QUEUED, run_at=now + timedelta(seconds=self._retry_delay(job["attempts"])))
+        else:
+            update.update(status=JOB_FAILED, finished_at=now)
+
+        await self.collection.update_one(
+            {"_id": job["_id"], "status": JOB_RUNNING, "locked_by": worker_id},
+            {"$set": update}
+        )
+        return update["status"]
+
+    async def fail_expired(self) -> int:
+        """Lease süresi dolmuş ve deneme hakkı bitmiş işleri kalıcı olarak başarısız işaretler.
+        Worker'ı öldüren (bellek yetersizliği, render havuzunun çökmesi) bir iş böylece
+        sonsuza kadar tekrar alınmaz. İşaretlenen iş sayısını döndürür."""
+        now = self._now()
+        result = await self.collection.update_many(
+            {
+                "status": JOB_RUNNING,
+                "locked_until": {"$lt": now},
+                "$expr": {"$gte": ["$attempts", "$max_attempts"]}
+            },
+            {"$set": {
+                "status": JOB_FAILED,
+                "error": "İş lease süresi içinde tamamlanamadı ve deneme hakkı doldu (worker çökmüş olabilir)",
+                "locked_by": None,
+                "locked_until": None,
+                "updated_at": now,
+                "finished_at": now
+            }}
+        )
+        return result.modified_count
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """İşi id ile getirir; geçersiz veya bulunamayan id için None döner."""
+        object_id = self._object_id(job_id)
+        if object_id is None:
+            return None
+        return await self.collection.find_one({"_id": object_id})
+
+    async def list(self, status: Optional[str] = None, comment_id: Optional[int] = None,
+                   limit: int = 50) -> List[dict]:
+        """İşleri en yeniden eskiye listeler."""
+        query = {}
+        if status:
+            query["status"] = status
+        if comment_id is not None:
+            query["payload.comment_id"] = comment_id
+        cursor = self.collection.find(query).sort("created_at", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+
+class JobWorker:
+    """Kuyruktaki görsel üretim işlerini işleyen asyncio görevleri.
+
+    Uygulama sürecinin içinde (lifespan) veya scripts/job_worker.py ile ayrı bir
+    süreçte çalıştırılabilir; aynı anda birden fazla worker güvenle çalışır.
+    """
+
+    def __init__(self, queue: JobQueue, share_service, concurrency: int = 2, poll_interval: float = 1.0):
+        self.queue = queue
+        self.share_service = share_service
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        """Worker görevlerini başlatır."""
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run(f"{self.worker_id}:{slot}"))
+            for slot in range(self.concurrency)
+        ]
+        print(f"✅ İş kuyruğu worker'ı başlatıldı ({self.worker_id}, {self.concurrency} görev)")
+
+    async def stop(self) -> None:
+        """Yeni iş almayı bırakır ve çalışan işlerin bitmesini bekler."""
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, worker_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.claim(worker_id)
+            except Exception as e:
+                print(f"❌ İş alınamadı: {str(e)}")
+                job = None
+
+            if job is None:
+                # Kuyruk boşken deneme hakkı bitmiş sahipsiz işleri kapat
+                try:
+                    failed = await self.queue.fail_expired()
+                    if failed:
+                        print(f"❌ Deneme hakkı dolmuş {failed} iş başarısız olarak işaretlendi")
+                except Exception as e:
+                    print(f"❌ Süresi dolmuş işler kapatılamadı: {str(e)}")
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.process(job, worker_id)
+            except Exception as e:
+                # Sonuç yazılamadıysa (ör. Mongo bağlantısı koptu) iş lease dolunca tekrar alınır;
+                # görev ölmemeli, kuyruk işlenmeye devam etmeli
+                print(f"❌ İş sonucu kaydedilemedi: {job['_id']}: {str(e)}")
+
+    async def _heartbeat(self, job: dict, worker_id: str) -> None:
+        """İş sürdükçe kilidi yeniler; uzun süren yüklemeler başka worker'a geçip iki kez yapılmaz."""
+        interval = self.queue.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.queue.renew(job, worker_id):
+                    print(f"⚠️ İşin kilidi kaybedildi: {job['_id']}")
+                    return
+            except Exception as e:
+                # Sonraki denemede tekrar yenilenir; lease'in üçte biri kadar pay var
+                print(f"⚠️ İş kilidi yenilenemedi: {job['_id']}: {str(e)}")
+
+    async def process(self, job: dict, worker_id: str) -> None:
+        """Tek bir işi çalıştırır ve sonucunu kuyruğa yazar."""
+        print(f"⚙️ İş işleniyor: {job['_id']} (deneme {job['attempts']}/{job['max_attempts']})")
+        heartbeat = asyncio.create_task(self._heartbeat(job, worker_id))
+        try:
+            share = await self.share_service.create_image(ApiShare(**job["payload"]))
+        except Exception as e:
+            status = await self.queue.fail(job, worker_id, e)
+            print(f"❌ İş hatası: {job['_id']} -> {status}: {str(e)}")
+            return
+        finally:
+            heartbeat.cancel()
+        await self.queue.complete(job, worker_id, share.model_dump())
+        print(f"✅ İş tamamlandı: {job['_id']}")
+
+
+def create_job_queue(db: AsyncIOMotorDatabase) -> JobQueue:
+    """Ayarlardaki deneme ve süre değerleriyle iş kuyruğunu oluşturur."""
+    settings = get_settings()
+    return JobQueue(
+        db,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.JOB_RETRY_MAX_SECONDS
+    )
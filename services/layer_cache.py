@@ -0,0 +1,77 @@
+import threading
+from functools import lru_cache
+from typing import Callable, Hashable
+
+from cachetools import LRUCache
+from PIL import Image
+from pydantic import ValidationError
+
+from core.config import get_settings
+
+DEFAULT_MAX_MB = 64
+
+
+def _image_nbytes(image: Image.Image) -> int:
+    """Görselin bellekte kapladığı yaklaşık bayt miktarını döndürür."""
+    return image.width * image.height * len(image.getbands())
+
+
+class LayerCache:
+    """Şablon geometrisine göre hazırlanmış statik katmanları (arka plan, çerçeve, gölge) tutar.
+
+    Bellek sınırı bayt cinsindendir; sınır aşılınca en az kullanılan katman atılır.
+    Aynı süreçteki tüm ImageRenderer örnekleri tarafından paylaşılır, bu yüzden thread-safe'dir.
+    Dönen görseller paylaşımlıdır; üzerine çizim yapmadan önce mutlaka copy() alınmalıdır.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._cache = LRUCache(maxsize=max_bytes, getsizeof=_image_nbytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Image.Image]) -> Image.Image:
+        """Anahtara ait katmanı döndürür, yoksa builder ile oluşturup önbelleğe ekler."""
+        with self._lock:
+            layer = self._cache.get(key)
+            if layer is not None:
+                self.hits += 1
+                return layer
+            self.misses += 1
+
+        # Oluşturma kilit dışında yapılır; aynı anahtar iki kez üretilirse sonuç yine aynıdır.
+        layer = builder()
+
+        with self._lock:
+            try:
+                self._cache[key] = layer
+            except ValueError:
+                # Tek başına bellek sınırını aşan katman önbelleğe alınmaz.
+                pass
+        return layer
+
+    def clear(self) -> None:
+        """Önbelleği temizler."""
+        with self._lock:
+            self._cache.clear()
+
+    @property
+    def current_bytes(self) -> int:
+        """Önbellekteki katmanların toplam boyutu."""
+        return self._cache.currsize
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+@lru_cache()
+def get_layer_cache() -> LayerCache:
+    """Süreç genelinde paylaşılan katman önbelleğini döndürür (sınır: RENDER_LAYER_CACHE_MAX_MB).
+    Ayarlar oluşturulamıyorsa (Mongo/Google ortam değişkenleri olmadan çalışan render betikleri)
+    varsayılan sınır kullanılır."""
+    try:
+        max_mb = get_settings().RENDER_LAYER_CACHE_MAX_MB
+    except ValidationError:
+        max_mb = DEFAULT_MAX_MB
+    return LayerCache(max_bytes=max_mb * 1024 * 1024)
@@ -0,0 +1,65 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import zlib
+from typing import Tuple
+
+from core.config import get_settings
+from db.models import ApiShare
+
+
+def _signing_key() -> bytes:
+    settings = get_settings()
+    return (settings.PREVIEW_SIGNING_KEY or settings.API_KEY).encode("utf-8")
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sign(body: str) -> str:
+    return _b64encode(hmac.new(_signing_key(), body.encode("ascii"), hashlib.sha256).digest())
+
+
+def _expires_at(now: float) -> int:
+    """Token'ın bitiş zamanı. PREVIEW_TOKEN_TTL_SECONDS'lık dilimlere yuvarlanır; böylece aynı
+    dilimde üretilen token'lar aynı kalır ve her token en az TTL kadar geçerli olur."""
+    ttl = get_settings().PREVIEW_TOKEN_TTL_SECONDS
+    return (int(now) // ttl + 2) * ttl
+
+
+def create_preview_token(api_share_data: ApiShare, format: str) -> str:
+    """Önizleme girdilerini imzalı, URL'de taşınabilir ve süreli bir token'a çevirir.
+    Token API key olmadan GET ile önizleme almayı sağlar; aynı girdiler aynı zaman diliminde
+    aynı token'ı ürettiği için ara sunucular yanıtı URL'ye göre önbelleğe alabilir."""
+    payload = {**api_share_data.model_dump(mode="json"), "format": format, "exp": _expires_at(time.time())}
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    body = _b64encode(zlib.compress(raw, 9))
+    return f"{body}.{_sign(body)}"
+
+
+def read_preview_token(token: str) -> Tuple[ApiShare, str, int]:
+    """Token'ın imzasını ve süresini doğrular; önizleme girdilerini, formatı ve bitiş zamanını
+    (unix saniye) döndürür. Token çok uzunsa, imza geçersizse, süresi dolmuşsa veya içerik
+    çözülemezse ValueError fırlatır."""
+    if len(token) > get_settings().PREVIEW_TOKEN_MAX_LENGTH:
+        raise ValueError("Önizleme token'ı çok uzun")
+    body, _, signature = token.partition(".")
+    # compare_digest ASCII olmayan str'lerde TypeError fırlatır; geçerli token yalnızca base64url içerir
+    if not body or not body.isascii() or not signature.isascii() or not hmac.compare_digest(signature, _sign(body)):
+        raise ValueError("Geçersiz önizleme imzası")
+    try:
+        payload = json.loads(zlib.decompress(_b64decode(body)))
+        expires_at = payload.pop("exp", None)
+        format = payload.pop("format")
+    except (ValueError, TypeError, AttributeError, KeyError, zlib.error) as e:
+        raise ValueError(f"Önizleme token'ı çözülemedi: {str(e)}")
+    if not isinstance(expires_at, int) or expires_at <= time.time():
+        raise ValueError("Önizleme adresinin süresi dolmuş")
+    return ApiShare(**payload), format, expires_at
@@ -0,0 +1,142 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+from PIL import Image
+
+from core.config import get_settings
+from db.models import ApiShare
+from services.emoji_atlas import check_emoji_atlas
+from services.image_encoder import EncodedImage, get_image_encoder
+from services.image_renderer import ImageRenderer
+from services.layer_cache import get_layer_cache
+from services.template_plan import RenderPlan
+
+
+class RenderQueueFullError(Exception):
+    """Render kuyruğu dolduğunda fırlatılır; istemciye hızlıca 503 döndürülmelidir."""
+    def __init__(self, pending: int, max_pending: int):
+        self.pending = pending
+        self.max_pending = max_pending
+        super().__init__(f"Görsel üretim kuyruğu dolu ({pending}/{max_pending}). Lütfen daha sonra tekrar deneyin.")
+
+
+# Worker süreçlerinde bir kez oluşturulan renderer
+_worker_renderer: Optional[ImageRenderer] = None
+
+
+def _init_worker() -> None:
+    """Worker başlarken renderer'ı oluşturur, fontları ve statik katmanı ısıtır.
+    Thread havuzunda tüm thread'ler aynı (thread-safe) renderer'ı paylaşır."""
+    global _worker_renderer
+    if _worker_renderer is not None:
+        return
+    _worker_renderer = ImageRenderer(layer_cache=get_layer_cache())
+    _worker_renderer.warm_up()
+
+
+def _render_in_worker(api_share_data: ApiShare, plan: Optional[RenderPlan] = None) -> Image.Image:
+    """Worker içinde görseli üretir."""
+    if _worker_renderer is None:
+        _init_worker()
+    return _worker_renderer.render(api_share_data, plan=plan)
+
+
+def _render_encoded_in_worker(api_share_data: ApiShare, format: Optional[str] = None,
+                              plan: Optional[RenderPlan] = None) -> EncodedImage:
+    """Worker içinde görseli doğrudan RGB üretir ve kodlar.
+    Süreç havuzunda ana sürece tam kare görsel yerine yalnızca sıkıştırılmış byte'lar taşınır."""
+    if _worker_renderer is None:
+        _init_worker()
+    return get_image_encoder(format).encode(_worker_renderer.render(api_share_data, mode="RGB", plan=plan))
+
+
+class RenderExecutor:
+    """CPU yoğun görsel üretimini event loop dışına, sınırlı bir havuza taşır.
+
+    Bekleyen (kuyruktaki + çalışan) iş sayısı max_pending'e ulaşınca yeni işler
+    beklemeye alınmadan RenderQueueFullError ile reddedilir; böylece gecikme birikmez.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, use_processes: bool = True):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                # Ana süreçte Mongo/HTTP thread'leri çalıştığı için fork yerine spawn kullanılır
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="render",
+                    initializer=_init_worker
+                )
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        """Kuyrukta bekleyen ve çalışan iş sayısı."""
+        return self._pending
+
+    def start(self) -> None:
+        """Worker'ları önceden başlatıp ısıtır, ilk isteğin soğuk başlangıç maliyetini ortadan kaldırır.
+        Emoji atlası eksikse RuntimeError fırlatır; sunucu ve worker başlamaz."""
+        check_emoji_atlas()
+        executor = self._get_executor()
+        for _ in range(self.max_workers):
+            executor.submit(int)
+        print(f"✅ Render havuzu başlatıldı ({'süreç' if self.use_processes else 'thread'}: {self.max_workers})")
+
+    async def render(self, api_share_data: ApiShare, plan: Optional[RenderPlan] = None) -> Image.Image:
+        """Görseli havuzda üretir ve sonucu bekler.
+        plan verilirse worker şablonu kendisi yüklemez; ana süreçteki registry'nin planı kullanılır."""
+        return await self._submit(_render_in_worker, api_share_data, plan)
+
+    async def render_encoded(self, api_share_data: ApiShare, format: Optional[str] = None,
+                             plan: Optional[RenderPlan] = None) -> EncodedImage:
+        """Görseli havuzda üretip yüklemeye hazır byte'lara kodlar.
+        format verilmezse yükleme formatı kullanılır."""
+        return await self._submit(_render_encoded_in_worker, api_share_data, format, plan)
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise RenderQueueFullError(self._pending, self.max_pending)
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Havuzu kapatır."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache()
+def get_render_executor() -> RenderExecutor:
+    """Süreç genelinde paylaşılan render havuzunu döndürür."""
+    settings = get_settings()
+    return RenderExecutor(
+        max_workers=settings.RENDER_WORKERS,
+        max_pending=settings.RENDER_MAX_PENDING,
+        use_processes=settings.RENDER_USE_PROCESSES
+    )
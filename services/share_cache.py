@@ -0,0 +1,204 @@
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import bson
+from cachetools import TTLCache
+
+from core.config import get_settings
+
+try:
+    # redis isteğe bağlıdır; yalnızca SHARE_CACHE_REDIS_URL verilirse gerekir
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+
+class ShareCacheBackend(ABC):
+    """comment_id başına paylaşım belgelerini (template başına bir belge) tutan önbellek arayüzü.
+
+    Belgeler SHARE_PROJECTION ile okunmuş ham dict'lerdir. Bir comment_id'nin tüm
+    belgeleri tek girdi olarak saklanır; mutasyonlar girdiyi bütünüyle siler.
+    Eksik metodu olan bir backend oluşturulurken TypeError fırlatır.
+    """
+
+    @abstractmethod
+    async def get_many(self, comment_ids: Iterable[int]) -> Dict[int, List[dict]]:
+        """Önbellekte bulunan comment_id'lerin belgelerini döndürür; bulunmayanlar sonuçta yer almaz."""
+
+    async def versions(self, comment_ids: Iterable[int]) -> Optional[Any]:
+        """Mongo'dan okumadan önce alınan girdi sürümleri; set_many'ye aynen verilir.
+        Paylaşılan backend'ler, okuma sırasında başka süreçte geçersiz kılınan girdileri
+        yazmamak için kullanır. Süreç içi backend'lerde gerekmez (ShareService kendi sayacını tutar)."""
+        return None
+
+    @abstractmethod
+    async def set_many(self, shares_by_comment: Dict[int, List[dict]], versions: Optional[Any] = None) -> None:
+        """Belgeleri önbelleğe yazar. versions verilirse, o andan sonra geçersiz kılınan girdiler yazılmaz."""
+
+    @abstractmethod
+    async def delete(self, comment_id: int) -> None:
+        """comment_id'nin girdisini siler."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Tüm girdileri siler."""
+
+
+class InMemoryShareCache(ShareCacheBackend):
+    """Süreç içi TTL + LRU önbellek.
+
+    Her süreç kendi kopyasını tutar. Mutasyonlardan sonraki geçersiz kılma
+    (ShareService._invalidate_cache) yalnızca bu sürece ulaşır; diğer API süreçleri ve
+    scripts/job_worker.py eski belgeleri TTL (SHARE_CACHE_TTL_SECONDS) dolana kadar
+    döndürebilir. Birden fazla süreç varsa SHARE_CACHE_REDIS_URL ile RedisShareCache kullanılmalı.
+    """
+
+    def __init__(self, max_items: int = 10000, ttl_seconds: float = 30):
+        self._cache = TTLCache(maxsize=max_items, ttl=ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_many(self, comment_ids: Iterable[int]) -> Dict[int, List[dict]]:
+        found = {}
+        with self._lock:
+            for comment_id in comment_ids:
+                shares = self._cache.get(comment_id)
+                if shares is None:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                # Çağıran tarafın değişiklikleri önbelleğe yansımasın
+                found[comment_id] = [dict(share) for share in shares]
+        return found
+
+    async def set_many(self, shares_by_comment: Dict[int, List[dict]], versions: Optional[Any] = None) -> None:
+        with self._lock:
+            for comment_id, shares in shares_by_comment.items():
+                self._cache[comment_id] = [dict(share) for share in shares]
+
+    async def delete(self, comment_id: int) -> None:
+        with self._lock:
+            self._cache.pop(comment_id, None)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# Girdiyi, sürüm sayacı okunduğu andaki değerini koruyorsa yazar.
+# KEYS: [girdi_1, sürüm_1, girdi_2, sürüm_2, ...], ARGV: [px, beklenen_sürüm_1, belge_1, ...]
+_SET_IF_VERSION_SCRIPT = """
+local written = 0
+for i = 1, #KEYS, 2 do
+    local current = redis.call('GET', KEYS[i + 1]) or ''
+    if current == ARGV[i + 1] then
+        redis.call('SET', KEYS[i], ARGV[i + 2], 'PX', ARGV[1])
+        written = written + 1
+    end
+end
+return written
+"""
+
+
+class RedisShareCache(ShareCacheBackend):
+    """Worker'lar arasında paylaşılan Redis önbelleği.
+    Belgeler BSON olarak saklanır; böylece tarih alanları Mongo'dan okunduğu haliyle geri gelir.
+
+    Her comment_id için Redis'te bir sürüm sayacı tutulur. delete sayacı INCR ile artırır;
+    set_many girdiyi yalnızca sayaç Mongo okumasından önceki değerindeyse (Lua ile atomik) yazar.
+    Böylece başka bir worker'ın geçersiz kılmasından önce okunmuş eski belge önbelleğe geri yazılmaz.
+    """
+
+    # Sayaçlar girdilerden çok daha uzun yaşar; okuma sürerken sayacın silinip sıfırdan başlaması
+    # (eski sürümle yanlış eşleşme) pratikte mümkün olmaz
+    VERSION_TTL_SECONDS = 86400
+
+    def __init__(self, url: str, ttl_seconds: float = 30, prefix: str = "graficast:share:",
+                 version_prefix: str = "graficast:share-version:"):
+        if redis is None:
+            raise RuntimeError("RedisShareCache için 'redis' paketi kurulu olmalı.")
+        self._client = redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.version_prefix = version_prefix
+        self._set_if_version = self._client.register_script(_SET_IF_VERSION_SCRIPT)
+
+    def _key(self, comment_id: int) -> str:
+        return f"{self.prefix}{comment_id}"
+
+    def _version_key(self, comment_id: int) -> str:
+        return f"{self.version_prefix}{comment_id}"
+
+    async def get_many(self, comment_ids: Iterable[int]) -> Dict[int, List[dict]]:
+        comment_ids = list(comment_ids)
+        if not comment_ids:
+            return {}
+        values = await self._client.mget([self._key(comment_id) for comment_id in comment_ids])
+        return {
+            comment_id: bson.decode(value)["shares"]
+            for comment_id, value in zip(comment_ids, values)
+            if value is not None
+        }
+
+    async def versions(self, comment_ids: Iterable[int]) -> Dict[int, bytes]:
+        comment_ids = list(comment_ids)
+        if not comment_ids:
+            return {}
+        values = await self._client.mget([self._version_key(comment_id) for comment_id in comment_ids])
+        return {comment_id: value or b"" for comment_id, value in zip(comment_ids, values)}
+
+    async def set_many(self, shares_by_comment: Dict[int, List[dict]],
+                       versions: Optional[Dict[int, bytes]] = None) -> None:
+        if not shares_by_comment:
+            return
+        px = int(self.ttl_seconds * 1000)
+        if versions is None:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for comment_id, shares in shares_by_comment.items():
+                    pipe.set(self._key(comment_id), bson.encode({"shares": shares}), px=px)
+                await pipe.execute()
+            return
+
+        keys, args = [], [px]
+        for comment_id, shares in shares_by_comment.items():
+            if comment_id not in versions:
+                # Sürümü okunmamış girdi güvenle yazılamaz
+                continue
+            keys += [self._key(comment_id), self._version_key(comment_id)]
+            args += [versions[comment_id], bson.encode({"shares": shares})]
+        if keys:
+            await self._set_if_version(keys=keys, args=args)
+
+    async def delete(self, comment_id: int) -> None:
+        # Önce sayaç artırılır; bu andan önce sürümü okunmuş dolumlar girdiyi artık yazamaz
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(self._version_key(comment_id))
+            pipe.expire(self._version_key(comment_id), self.VERSION_TTL_SECONDS)
+            pipe.delete(self._key(comment_id))
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        # Sürüm sayaçları silinmez; silinirse devam eden dolumlar eski belgeyi yazabilir
+        async for key in self._client.scan_iter(match=f"{self.prefix}*"):
+            await self._client.delete(key)
+
+
+@lru_cache()
+def get_share_cache() -> Optional[ShareCacheBackend]:
+    """Ayarlara göre süreç genelinde paylaşılan paylaşım önbelleğini döndürür.
+    Önbellek kapalıysa None döner."""
+    settings = get_settings()
+    if not settings.SHARE_CACHE_ENABLED:
+        return None
+    if settings.SHARE_CACHE_REDIS_URL:
+        return RedisShareCache(settings.SHARE_CACHE_REDIS_URL, ttl_seconds=settings.SHARE_CACHE_TTL_SECONDS)
+    return InMemoryShareCache(
+        max_items=settings.SHARE_CACHE_MAX_ITEMS,
+        ttl_seconds=settings.SHARE_CACHE_TTL_SECONDS
+    )
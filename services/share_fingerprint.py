@@ -0,0 +1,45 @@
+import hashlib
+import json
+from typing import Optional
+
+from db.models import ApiShare
+from services.image_renderer import ImageRenderer
+from services.template_plan import RenderPlan, get_render_plan
+
+
+def _normalize_text(value: Optional[str]) -> Optional[str]:
+    """Ardışık boşlukları tek boşluğa indirir.
+    Renderer metni her zaman kelimelere bölerek çizdiği için boşluk farkları çıktıyı değiştirmez.
+    None ile boş metin çizimde aynı davrandığı için ikisi de None sayılır; yalnızca boşluktan
+    oluşan metin ise boş bir blok çizdiği için '' olarak ayrı tutulur."""
+    if not value:
+        return None
+    return " ".join(value.split())
+
+
+def compute_share_fingerprint(api_share_data: ApiShare, template_type: str,
+                              renderer_version: str = ImageRenderer.VERSION,
+                              plan: Optional[RenderPlan] = None) -> str:
+    """Görselin içeriğini belirleyen alanlardan deterministik bir SHA-256 parmak izi üretir.
+    Aynı parmak izi, aynı template (ve template sürümü) ve renderer sürümüyle aynı görselin
+    üretileceği anlamına gelir. plan verilmezse şablon dosyasından okunur."""
+    if plan is None:
+        plan = get_render_plan(template_type)
+    payload = {
+        "comment": _normalize_text(api_share_data.comment),
+        # Tarih ve anonim yazar adı görselde yazıldıkları haliyle (şablonun biçimiyle) girer;
+        # şablonda bunlar değişince sürüm artırılmasa da görsel yeniden üretilir
+        "comment_date": api_share_data.comment_date.strftime(plan.date_format),
+        "writer_name": _normalize_text(api_share_data.writer_name or plan.anonymous_name),
+        "uni_name": _normalize_text(api_share_data.uni_name),
+        "dep_name": _normalize_text(api_share_data.dep_name),
+        "ins_name": _normalize_text(api_share_data.ins_name),
+        "template_type": template_type,
+        "renderer_version": renderer_version
+    }
+    # Şablon dosyası düzenlenip sürümü artırılınca görseller yeniden üretilir. İlk sürüm için
+    # alan eklenmez; böylece şablon dosyalarından önce kaydedilmiş parmak izleri geçerli kalır.
+    if plan.version != 1:
+        payload["template_version"] = plan.version
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
@@ -1,81 +1,306 @@
+import asyncio
 from datetime import datetime, UTC, timedelta
 from typing import Dict, List, Optional
-from motor.motor_asyncio import AsyncIOMotorClient
-from core.config import get_settings
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from models.share import DatabaseShare, ShareResponse
 from db.models import ApiShare
-from services.image_renderer import ImageRenderer
+from services.artifact_store import ArtifactStore, artifact_key, get_artifact_store
+from services.image_encoder import EncodedImage, get_image_encoder
+from services.render_executor import get_render_executor, RenderQueueFullError
+from services.share_cache import ShareCacheBackend, get_share_cache
+from services.share_fingerprint import compute_share_fingerprint
+from services.template_plan import RenderPlan, get_render_plan
+from services.template_registry import TemplateRegistry
 from services.google_photos_service import GooglePhotosService
 from services.google_photos_service import GooglePhotosError
 
 
+# Yanıtta kullanılan alanlar; _id ve modelde olmayan alanlar veritabanından hiç çekilmez.
+SHARE_PROJECTION = {"_id": 0, **{field: 1 for field in DatabaseShare.model_fields}}
+
+
+def _new_share_document(comment_id: int) -> dict:
+    """Batch sırasında ilk kez görülen comment_id için kaydedilecek varsayılan paylaşım belgesi."""
+    return {
+        "comment_id": comment_id,
+        "image_template_type": None,
+        "image_created_date": None,
+        "image_updated_date": None,
+        "is_uploaded_google": False,
+        "uploaded_date_google": None,
+        "last_uploaded_date_google": None,
+        "google_photos_id": None,
+        "google_product_id": None,
+        "google_description": f"Paylaşım: ❌ Uniyorum Comment ID: {comment_id}",
+        "is_shared": False,
+        "shared_date": None,
+        "last_shared_date": None,
+        "error_message": None,
+        "tags": [],
+        "image_fingerprint": None
+    }
+
+
 class ShareService:
-    def __init__(self):
-        settings = get_settings()
-        self.client = AsyncIOMotorClient(settings.MONGO_URI)
-        self.db = self.client.get_database(settings.MONGO_DB_NAME)
+    def __init__(self, db: AsyncIOMotorDatabase, google_photos: GooglePhotosService,
+                 share_cache: Optional[ShareCacheBackend] = None,
+                 artifact_store: Optional[ArtifactStore] = None,
+                 template_registry: Optional[TemplateRegistry] = None):
+        self.db = db
         self.collection = self.db.get_collection("shares")
-        self.image_renderer = ImageRenderer()
-        self.image_output_dir = "output/images"
-        self.google_photos = None
+        # Render işlemleri event loop'u bloklamamak için havuzda yapılır
+        self.render_executor = get_render_executor()
+        # Üretilmiş görseller diskte (varsayılan output/images) saklanır; kapalıysa None
+        self.artifact_store = artifact_store if artifact_store is not None else get_artifact_store()
+        # Şablon planları bellekten okunur; registry verilmezse şablon dosyalarından (süreç başına bir kez)
+        self.template_registry = template_registry
+        self.google_photos = google_photos
+        # Batch okumaları için önbellek; kapalıysa None
+        self.share_cache = share_cache if share_cache is not None else get_share_cache()
+        # Her geçersiz kılmada artar; okunurken değişen veriler önbelleğe yazılmaz
+        self._cache_generation = 0
 
     async def _get_google_photos(self) -> GooglePhotosService:
-        """Google Photos servisini lazy loading ile başlatır."""
-        if self.google_photos is None:
-            self.google_photos = GooglePhotosService()
-            # Credentials'ı async olarak al
-            await self.google_photos._get_credentials()
+        """Paylaşılan Google Photos servisini geçerli kimlik bilgileriyle döndürür."""
+        await self.google_photos.ensure_credentials()
         return self.google_photos
 
+    async def _invalidate_cache(self, comment_id: int) -> None:
+        """comment_id'nin önbellek girdisini siler. Her başarılı mutasyondan sonra çağrılır."""
+        self._cache_generation += 1
+        if self.share_cache is not None:
+            await self.share_cache.delete(comment_id)
+
+    def _artifact_key(self, fingerprint: str, format: Optional[str] = None) -> str:
+        return artifact_key(fingerprint, get_image_encoder(format))
+
+    async def render_encoded(self, api_share_data: ApiShare, fingerprint: str,
+                             format: Optional[str] = None) -> EncodedImage:
+        """Görseli artifact deposundan getirir, yoksa üretip depoya yazar.
+        Yükleme tekrar denemeleri, önizlemeler ve yeniden yüklemeler böylece render'ı atlar.
+        format verilmezse yükleme formatı kullanılır."""
+        encoder = get_image_encoder(format)
+        plan = self._get_plan(api_share_data.image_template_type)
+        if self.artifact_store is None:
+            return await self.render_executor.render_encoded(api_share_data, format, plan)
+
+        key = self._artifact_key(fingerprint, format)
+        data = await asyncio.to_thread(self.artifact_store.get, key)
+        if data is not None:
+            print("♻️ Görsel artifact deposundan alındı")
+            return EncodedImage(data, encoder.mime_type, encoder.extension)
+
+        image = await self.render_executor.render_encoded(api_share_data, format, plan)
+        try:
+            await asyncio.to_thread(self.artifact_store.put, key, image.data)
+        except OSError as e:
+            # Depoya yazılamaması görsel üretimini bozmamalı
+            print(f"⚠️ Görsel artifact deposuna yazılamadı: {str(e)}")
+        return image
+
+    def preview_etag(self, api_share_data: ApiShare, format: str) -> str:
+        """Önizlemenin render girdilerinden türetilen güçlü ETag'i.
+        Girdiler, template, renderer sürümü veya kodlama ayarları değişince değişir."""
+        template_type = self._validate_template_type(api_share_data.image_template_type)
+        fingerprint = self._fingerprint(api_share_data, template_type)
+        return f'"{self._artifact_key(fingerprint, format).split(".")[0]}"'
+
+    async def render_preview(self, api_share_data: ApiShare, format: str) -> EncodedImage:
+        """Görseli yalnızca üretir; Google Photos'a yüklemez ve veritabanına yazmaz."""
+        template_type = self._validate_template_type(api_share_data.image_template_type)
+        fingerprint = self._fingerprint(api_share_data, template_type)
+        return await self.render_encoded(api_share_data, fingerprint, format)
+
     def _get_turkey_time(self) -> datetime:
         """Türkiye saatini döndürür (GMT+3)"""
         return datetime.now(UTC) + timedelta(hours=3)
 
-    async def get_shares_batch(self, comment_ids: List[int]) -> List[ShareResponse]:
-        """Toplu paylaşım bilgilerini getirir. Olmayan comment_id'ler için yeni kayıt oluşturur.
+    async def get_shares_batch_documents(self, comment_ids: List[int]) -> List[dict]:
+        """Toplu paylaşım belgelerini ham dict olarak getirir. Olmayan comment_id'ler için yeni kayıt oluşturur.
             bu zaten benim uniyorumda her sayfam yüklendiği zaman çalışacağı için google api servisimin
             token süresinin dolma sı ihtimali çok olmayacak.
             bu yüzden diğer metotlarda tekrar tekrar token.pickle yenilemiyorum."""
-        # Mevcut paylaşımları getir
-        cursor = self.collection.find({"comment_id": {"$in": comment_ids}})
+        # Aynı ID birden fazla gelirse tek sefer işlenir, istek sırası korunur
+        comment_ids = list(dict.fromkeys(comment_ids))
+
+        # Önce önbelleğe bak, Mongo'ya yalnızca bulunamayanlar için git
+        shares_by_comment: Dict[int, List[dict]] = {}
+        if self.share_cache is not None:
+            shares_by_comment = await self.share_cache.get_many(comment_ids)
+        uncached_ids = [comment_id for comment_id in comment_ids if comment_id not in shares_by_comment]
+        if not uncached_ids:
+            return [share for comment_id in comment_ids for share in shares_by_comment[comment_id]]
+
+        generation = self._cache_generation
+        # Paylaşılan önbellekte başka süreçlerin geçersiz kılmalarını yakalamak için sürümler okumadan önce alınır
+        versions = await self.share_cache.versions(uncached_ids) if self.share_cache is not None else None
+        fetched: Dict[int, List[dict]] = {}
+
+        # Mevcut paylaşımları yalnızca yanıtta kullanılan alanlarla getir
+        cursor = self.collection.find({"comment_id": {"$in": uncached_ids}}, SHARE_PROJECTION)
         existing_shares = await cursor.to_list(length=None)
-        
-        # Mevcut paylaşımları ShareResponse listesine dönüştür
-        shares = [ShareResponse(**share) for share in existing_shares]
-        
-        # Olmayan comment_id'ler için yeni kayıtlar oluştur
-        existing_comment_ids = {share["comment_id"] for share in existing_shares}
-        for comment_id in comment_ids:
-            if comment_id not in existing_comment_ids:
-                new_share = DatabaseShare(
-                    comment_id=comment_id,
-                    image_template_type=None,
-                    image_created_date=None,
-                    image_updated_date=None,
-                    is_uploaded_google=False,
-                    uploaded_date_google=None,
-                    last_uploaded_date_google=None,
-                    google_photos_id=None,
-                    google_product_id=None,
-                    google_description=f"Paylaşım: ❌ Uniyorum Comment ID: {comment_id}",
-                    is_shared=False,
-                    shared_date=None,
-                    last_shared_date=None,
-                    error_message=None,
-                    tags=[]
-                )
-                result = await self.collection.insert_one(new_share.model_dump())
-                shares.append(ShareResponse(**new_share.model_dump()))
 
-        return shares
+        for share in existing_shares:
+            fetched.setdefault(share["comment_id"], []).append(share)
+
+        # Olmayan comment_id'ler için yeni kayıtları tek bir toplu işlemle oluştur.
+        # Filtre unique index'in anahtarlarıyla (comment_id, image_template_type) aynıdır; aynı anda
+        # gelen sayfa yüklemelerinde ikinci upsert ya mevcut kaydı bulur ya da duplicate key alır.
+        missing_ids = [comment_id for comment_id in uncached_ids if comment_id not in fetched]
+        if missing_ids:
+            operations = []
+            for comment_id in missing_ids:
+                new_share = _new_share_document(comment_id)
+                # Filtredeki alanlar $setOnInsert içinde tekrar yazılmaz
+                insert_fields = {
+                    key: value for key, value in new_share.items()
+                    if key not in ("comment_id", "image_template_type")
+                }
+                operations.append(UpdateOne(
+                    {"comment_id": comment_id, "image_template_type": None},
+                    {"$setOnInsert": insert_fields},
+                    upsert=True
+                ))
+                fetched[comment_id] = [new_share]
+
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                # Duplicate key: kaydı aynı anda başka bir istek oluşturdu, sonuç aynı
+                errors = e.details.get("writeErrors", [])
+                if e.details.get("writeConcernErrors") or any(error.get("code") != 11000 for error in errors):
+                    raise
+
+        # Okuma sırasında bu süreçte bir mutasyon olduysa eski veri önbelleğe yazılmaz
+        if self.share_cache is not None and generation == self._cache_generation:
+            await self.share_cache.set_many(fetched, versions)
+        shares_by_comment.update(fetched)
+
+        # Yanıtı istek sırasına göre oluştur
+        return [
+            share
+            for comment_id in comment_ids
+            for share in shares_by_comment[comment_id]
+        ]
+
+    async def get_shares_batch(self, comment_ids: List[int]) -> List[ShareResponse]:
+        """Toplu paylaşım bilgilerini getirir.
+        Veriler kendi veritabanımızdan geldiği için tekrar doğrulanmaz, model_construct ile sarılır."""
+        shares = await self.get_shares_batch_documents(comment_ids)
+        return [ShareResponse.model_construct(**share) for share in shares]
     
 
+    def _get_plan(self, template_type: Optional[str]) -> RenderPlan:
+        """Şablonun derlenmiş planını I/O yapmadan döndürür. Şablon yoksa ValueError fırlatır."""
+        if self.template_registry is not None:
+            return self.template_registry.get_plan(template_type)
+        return get_render_plan(template_type)
+
+    def _validate_template_type(self, template_type: Optional[str]) -> str:
+        """Template type'ı doğrular.
+        Planı derlenmiş (templates/<template_type>.json tanımı olan) tüm şablonlar desteklenir."""
+        if not template_type:
+            print(f"❌ Geçersiz template type: '{template_type}'.")
+            raise ValueError(f"Geçersiz template type: '{template_type}'.")
+        try:
+            self._get_plan(template_type)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            raise
+        return template_type
+
+    def _fingerprint(self, api_share_data: ApiShare, template_type: str) -> str:
+        return compute_share_fingerprint(api_share_data, template_type, plan=self._get_plan(template_type))
+
+    @staticmethod
+    def _find_template_share(comment_shares: List[dict], template_type: str) -> Optional[dict]:
+        """Yorumun kayıtları arasından verilen template'e ait olanı döndürür."""
+        return next((share for share in comment_shares if share.get("image_template_type") == template_type), None)
+
+    @staticmethod
+    def _is_same_image(share: Optional[dict], fingerprint: str) -> bool:
+        """Kayıttaki görsel aynı içerikle üretilmiş ve Google'a yüklenmişse True döner."""
+        return bool(share and share.get("google_photos_id") and share.get("image_fingerprint") == fingerprint)
+
+    async def _save_uploaded_share(self, comment_id: int, comment_shares: List[dict],
+                                   template_type: str, media_item: dict, fingerprint: str) -> dict:
+        """Google'a yüklenen görselin bilgilerini paylaşım kaydına yazar ve güncel belgeyi döndürür.
+        comment_shares: yorumun yükleme öncesinde okunmuş tüm kayıtları."""
+        current_time = self._get_turkey_time()
+        existing_share = self._find_template_share(comment_shares, template_type)
+        print(f"🔍 Aynı template kaydı kontrolü: {'Var' if existing_share else 'Yok'}")
+
+        # Her durumda güncellenen alanlar
+        upload_fields = {
+            "image_updated_date": current_time,
+            "is_shared": False,  # yeni foto ürettiğimiz için paylaşılmamış olacak
+            "last_shared_date": None,  # son paylaşım tarihi yok olacak
+            "last_uploaded_date_google": current_time,
+            "google_photos_id": media_item['id'],
+            "google_product_id": media_item['productUrl'],
+            # google_description /// bu alanı güncellemeye gerek yok burada.
+            "error_message": None,
+            "image_fingerprint": fingerprint
+        }
+        # Template ilk kez üretiliyorsa doldurulan alanlar
+        first_upload_fields = {
+            "image_created_date": current_time,  # veri yeni eklendiği için burası null kalmasın.
+            "is_uploaded_google": True,
+            "uploaded_date_google": current_time
+        }
+
+        updated_share = None
+        if not existing_share:
+            # Aynı template_type yoksa, null template kaydını template'e dönüştür
+            null_template_share = next(
+                (share for share in comment_shares if share.get("image_template_type") is None), None
+            )
+            print(f"🔍 Null template kaydı kontrolü: {'Var' if null_template_share else 'Yok'}")
+
+            if null_template_share:
+                print("📝 Null template kaydı güncelleniyor...")
+                # Filtredeki image_template_type=None, kaydı aynı anda başka bir isteğin almasını engeller
+                updated_share = await self.collection.find_one_and_update(
+                    {"_id": null_template_share["_id"], "image_template_type": None},
+                    {"$set": {"image_template_type": template_type, **upload_fields, **first_upload_fields}},
+                    projection=SHARE_PROJECTION,
+                    return_document=ReturnDocument.AFTER
+                )
+                print(f"✅ Null template kaydı güncellendi: {updated_share is not None}")
+
+        if updated_share is None:
+            # Aynı template kaydı varsa güncelle, yoksa tek işlemde oluştur
+            print("📝 Template kaydı güncelleniyor/oluşturuluyor...")
+            updated_share = await self.collection.find_one_and_update(
+                {"comment_id": comment_id, "image_template_type": template_type},
+                {
+                    "$set": upload_fields,
+                    "$setOnInsert": {
+                        **first_upload_fields,
+                        "google_description": None,  # burası upload edilirken dolduruluyor.
+                        "shared_date": None,
+                        "tags": []
+                    }
+                },
+                upsert=True,
+                projection=SHARE_PROJECTION,
+                return_document=ReturnDocument.AFTER
+            )
+        if not updated_share:
+            raise ValueError(f"Comment ID {comment_id} için güncellenmiş kayıt bulunamadı")
+
+        await self._invalidate_cache(comment_id)
+        return updated_share
+
     async def create_image(self, api_share_data: ApiShare) -> DatabaseShare:
         """Görsel oluşturur ve google'a update eder vepaylaşım bilgilerini günceller."""
         try:
-            # Önce comment_id'nin varlığını kontrol et
-            comment_exists = await self.collection.find_one({"comment_id": api_share_data.comment_id})
-            if not comment_exists:
+            # Yorumun tüm kayıtlarını tek sorguda al; varlık, aynı template ve null template
+            # kontrolleri bu liste üzerinden yapılır.
+            comment_shares = await self.collection.find({"comment_id": api_share_data.comment_id}).to_list(length=None)
+            if not comment_shares:
                 print("DEBUG: ValueError fırlatılıyor - comment_exists")
                 raise ValueError(
                     f"Comment ID {api_share_data.comment_id} için paylaşım bulunamadı. "
@@ -83,32 +308,23 @@ class ShareService:
                 )
 
             # Template type'ı belirle
-            # şimdilik sadece instagram-post-square destekleniyor.
-            template_type = api_share_data.image_template_type
-            if template_type not in ["instagram-post-square"]:
-                print(f"❌ Geçersiz template type: '{template_type}'.")
-                raise ValueError(f"Geçersiz template type: '{template_type}'. Mevcut sürümde yalnızca 'instagram-post-square' destekleniyor.")
-            
-            current_time = self._get_turkey_time()
+            template_type = self._validate_template_type(api_share_data.image_template_type)
+
+            # Önce aynı template_type ile kayıt var mı kontrol et
+            existing_share = self._find_template_share(comment_shares, template_type)
+
+            # Görseli belirleyen alanların parmak izi kayıttakiyle aynıysa aynı resim zaten
+            # üretilip yüklenmiştir; render ve Google çağrıları yapılmadan mevcut kayıt döner.
+            fingerprint = self._fingerprint(api_share_data, template_type)
+            if self._is_same_image(existing_share, fingerprint):
+                print("🔄 Aynı içerikle üretilmiş görsel mevcut, render ve yükleme atlanıyor !!!")
+                return DatabaseShare(**existing_share)
 
             # Görsel oluştur
             print("🎨 Görsel oluşturuluyor...")
-            image = self.image_renderer.render(api_share_data)
-            print("✅ Görsel oluşturuldu")
-
+            image = await self.render_encoded(api_share_data, fingerprint)
+            print(f"✅ Görsel oluşturuldu ({len(image.data) // 1024} KB)")
 
-            # Önce aynı template_type ile kayıt var mı kontrol et
-            existing_share = await self.collection.find_one({
-                "comment_id": api_share_data.comment_id,
-                "image_template_type": template_type
-            })
-            # aynı resmin üretilme durumunun kontrolü sadece bu veriler ile yapılabilir.
-            # eğer tam bir kontrol yapmak isteseydim
-            # comment, uni, dep, ins, writer bilgilerini kaydetmiş olmam gerekirdi.
-            # bu bilgileri kaydetmeyi tercih etmediğim için, gelen veriler ile foto oluşturup
-            # google'a göndereceğim, gelen media_item_id ile kontrol sağlayacağım.
-            # aynı media_item_id varsa -aynı- resim önceden yüklenmiş demektir. hiçbir şey yapmayacağım.
-            
             # Google Photos'a yükle
             print("📤 Google Photos'a yükleniyor...")
             google_photos = await self._get_google_photos()
@@ -117,105 +333,13 @@ class ShareService:
                                                              template_type,
                                                              existing_share.get("google_photos_id") if existing_share else None)
 
-            # aynı resim yüklenmişse hiçbir şey yapmayacağız.
-            if media_item['id'] == existing_share.get("google_photos_id") if existing_share else None:
-                print("🔄 Aynı resim yüklendiği için veritabanında da hiçbir şey yapılmayacak !!!")
-                return DatabaseShare(**existing_share)
-
             # eğer farklı resim istediyse normal devam ediyoruz.
 
             # Veritabanı kaydını güncelle
             print("💾 Veritabanı güncelleniyor...")
-
-            print(f"🔍 Aynı template kaydı kontrolü: {'Var' if existing_share else 'Yok'}")
-
-            if existing_share:
-                # Aynı template_type ile kayıt varsa güncelle
-                print("📝 Mevcut template kaydı güncelleniyor...")
-                share_data = DatabaseShare(**existing_share)
-                
-                # Sadece güncellenecek alanları değiştir
-                share_data.image_updated_date = current_time
-                share_data.is_shared = False  # yeni foto ürettiğimiz için paylaşılmamış olacak
-                share_data.last_shared_date = None  # son paylaşım tarihi yok olacak
-                share_data.last_uploaded_date_google = current_time
-                share_data.google_photos_id = media_item['id']
-                share_data.google_product_id = media_item['productUrl']
-                # share_data.google_description = /// bu alanı güncellemeye gerek yok burada.
-                share_data.error_message = None
-
-                # Mevcut kaydı güncelle
-                result = await self.collection.update_one(
-                    {"_id": existing_share["_id"]},
-                    {"$set": share_data.model_dump()}
-                )
-                print(f"✅ Mevcut template kaydı güncellendi: {result.modified_count > 0}")
-            else:
-                # Aynı template_type yoksa, null template kontrolü yap
-                null_template_share = await self.collection.find_one({
-                    "comment_id": api_share_data.comment_id,
-                    "image_template_type": None
-                })
-                print(f"🔍 Null template kaydı kontrolü: {'Var' if null_template_share else 'Yok'}")
-
-                if null_template_share:
-                    # Null template kaydı varsa güncelle
-                    print("📝 Null template kaydı güncelleniyor...")
-                    share_data = DatabaseShare(**null_template_share)
-                    
-                    # Template type ve diğer alanları güncelle
-                    share_data.image_template_type = template_type
-                    share_data.image_created_date = current_time # veri yeni eklendiği için burası null kalmasın.
-                    share_data.image_updated_date = current_time
-                    share_data.is_uploaded_google=True
-                    share_data.is_shared = False
-                    share_data.last_shared_date = None
-                    share_data.uploaded_date_google = current_time
-                    share_data.last_uploaded_date_google = current_time
-                    share_data.google_photos_id = media_item['id']
-                    share_data.google_product_id = media_item['productUrl']
-                    # share_data.google_description = /// bu alanı güncellemeye gerek yok burada.
-                    share_data.error_message = None
-
-                    # Null template kaydını güncelle
-                    result = await self.collection.update_one(
-                        {"_id": null_template_share["_id"]},
-                        {"$set": share_data.model_dump()}
-                    )
-                    print(f"✅ Null template kaydı güncellendi: {result.modified_count > 0}")
-                else:
-                    # Hiç kayıt yoksa yeni kayıt oluştur
-                    print("🆕 Yeni kayıt oluşturuluyor...")
-                    share_data = DatabaseShare(
-                        comment_id=api_share_data.comment_id,
-                        image_template_type=template_type,
-                        image_created_date=current_time,
-                        image_updated_date=current_time,
-                        is_uploaded_google=True,
-                        uploaded_date_google=current_time,
-                        last_uploaded_date_google=current_time,
-                        google_photos_id=media_item['id'],
-                        google_product_id=media_item['productUrl'],
-                        google_description=None, # burası upload edilirken dolduruluyor.
-                        is_shared=False,
-                        shared_date=None,
-                        last_shared_date=None,
-                        error_message=None,
-                        tags=[]
-                    )
-
-                    # Yeni kayıt ekle
-                    result = await self.collection.insert_one(share_data.model_dump())
-                    print(f"✅ Yeni kayıt oluşturuldu: {result.inserted_id}")
-
-            # Güncellenmiş kaydı getir
-            updated_share = await self.collection.find_one({
-                "comment_id": api_share_data.comment_id,
-                "image_template_type": template_type
-            })
-            if not updated_share:
-                raise ValueError(f"Comment ID {api_share_data.comment_id} için güncellenmiş kayıt bulunamadı")
-
+            updated_share = await self._save_uploaded_share(
+                api_share_data.comment_id, comment_shares, template_type, media_item, fingerprint
+            )
             print("✅ Veritabanı işlemi tamamlandı")
             return DatabaseShare(**updated_share)
 
@@ -226,16 +350,152 @@ class ShareService:
         except GooglePhotosError as e:
             print(f"❌ Google Photos hatası: {str(e)}")
             raise
+        except RenderQueueFullError as e:
+            print(f"⏳ Render kuyruğu dolu: {str(e)}")
+            raise
+        except PyMongoError as e:
+            # Geçici bağlantı hataları iş kuyruğunda tekrar denenebilsin diye sarılmaz
+            print(f"❌ Veritabanı hatası: {str(e)}")
+            raise
         except Exception as e:
             print(f"❌ Beklenmeyen hata: {str(e)}")
             raise ValueError(f"Görsel oluşturulurken hata oluştu: {str(e)}")
         
 
+    async def create_images_batch(self, share_requests: List[ApiShare]) -> List[dict]:
+        """Birden fazla yorum için görsel oluşturur, Google'a toplu yükler ve paylaşım kayıtlarını günceller.
+
+        İstekler GooglePhotosService.BATCH_LIMIT'lik parçalar halinde işlenir; her parçada görseller
+        render havuzunda paralel üretilir, byte'lar eşzamanlı yüklenir, media item ve albüm eklemeleri
+        toplu çağrılarla yapılır. Böylece bellekte aynı anda en fazla bir parça görsel tutulur.
+        Her istek için istek sırasıyla {comment_id, image_template_type, success, share, error} döner.
+        """
+        results: List[Optional[dict]] = [None] * len(share_requests)
+
+        def fail(index: int, error: Exception) -> None:
+            results[index] = {
+                "comment_id": share_requests[index].comment_id,
+                "image_template_type": share_requests[index].image_template_type,
+                "success": False,
+                "share": None,
+                "error": str(error)
+            }
+
+        # Tüm yorumların kayıtlarını tek sorguda al
+        comment_ids = list(dict.fromkeys(share.comment_id for share in share_requests))
+        cursor = self.collection.find({"comment_id": {"$in": comment_ids}})
+        shares_by_comment: Dict[int, List[dict]] = {}
+        for share in await cursor.to_list(length=None):
+            shares_by_comment.setdefault(share["comment_id"], []).append(share)
+
+        pending = []  # üretilmesi gereken isteklerin index'leri
+        fingerprints: Dict[int, str] = {}
+        seen = set()
+        for index, api_share_data in enumerate(share_requests):
+            try:
+                if api_share_data.comment_id not in shares_by_comment:
+                    raise ValueError(
+                        f"Comment ID {api_share_data.comment_id} için paylaşım bulunamadı. "
+                        "Lütfen önce bu yorumu veritabanına kaydedin."
+                    )
+                template_type = self._validate_template_type(api_share_data.image_template_type)
+                key = (api_share_data.comment_id, template_type)
+                if key in seen:
+                    raise ValueError(f"Comment ID {api_share_data.comment_id} aynı istekte birden fazla kez gönderildi.")
+                seen.add(key)
+            except ValueError as e:
+                fail(index, e)
+                continue
+
+            # Aynı içerikle üretilmiş görsel varsa render ve yükleme atlanır
+            existing_share = self._find_template_share(shares_by_comment[api_share_data.comment_id], template_type)
+            fingerprints[index] = self._fingerprint(api_share_data, template_type)
+            if self._is_same_image(existing_share, fingerprints[index]):
+                results[index] = {
+                    "comment_id": api_share_data.comment_id,
+                    "image_template_type": template_type,
+                    "success": True,
+                    "share": {field: existing_share.get(field) for field in DatabaseShare.model_fields},
+                    "error": None
+                }
+                continue
+            pending.append(index)
+
+        if not pending:
+            return results
+
+        google_photos = await self._get_google_photos()
+        # Render havuzunu doldurmadan çalıştır; tek istekler 503 almasın
+        render_slots = asyncio.Semaphore(self.render_executor.max_workers)
+
+        async def render(index: int) -> EncodedImage:
+            async with render_slots:
+                return await self.render_encoded(share_requests[index], fingerprints[index])
+
+        for chunk_start in range(0, len(pending), GooglePhotosService.BATCH_LIMIT):
+            chunk = pending[chunk_start:chunk_start + GooglePhotosService.BATCH_LIMIT]
+            print(f"🎨 {len(chunk)} görsel oluşturuluyor...")
+            images = await asyncio.gather(*(render(index) for index in chunk), return_exceptions=True)
+
+            upload_indexes = []
+            upload_items = []
+            for index, image in zip(chunk, images):
+                if isinstance(image, Exception):
+                    fail(index, image)
+                    continue
+                api_share_data = share_requests[index]
+                existing_share = self._find_template_share(
+                    shares_by_comment[api_share_data.comment_id], api_share_data.image_template_type
+                )
+                upload_indexes.append(index)
+                upload_items.append((
+                    image,
+                    api_share_data.comment_id,
+                    api_share_data.image_template_type,
+                    existing_share.get("google_photos_id") if existing_share else None
+                ))
+            del images
+
+            media_items = await google_photos.upload_images(upload_items) if upload_items else []
+            del upload_items
+
+            async def save(index: int, media_item: dict) -> None:
+                api_share_data = share_requests[index]
+                comment_shares = shares_by_comment[api_share_data.comment_id]
+                try:
+                    share = await self._save_uploaded_share(
+                        api_share_data.comment_id, comment_shares, api_share_data.image_template_type,
+                        media_item, fingerprints[index]
+                    )
+                except Exception as e:
+                    fail(index, e)
+                    return
+                results[index] = {
+                    "comment_id": api_share_data.comment_id,
+                    "image_template_type": api_share_data.image_template_type,
+                    "success": True,
+                    "share": share,
+                    "error": None
+                }
+
+            saves = []
+            for index, media_item in zip(upload_indexes, media_items):
+                if isinstance(media_item, Exception):
+                    fail(index, media_item)
+                else:
+                    saves.append(save(index, media_item))
+            await asyncio.gather(*saves)
+
+        print(f"✅ Toplu görsel oluşturma tamamlandı: "
+              f"{sum(result['success'] for result in results)}/{len(results)} başarılı")
+        return results
+
     async def toggle_share_status(self, comment_id: int, template_type: str) -> DatabaseShare:
         """Paylaşım durumunu değiştirir ve Google Photos açıklamasını günceller."""
         print(f"🔄 Paylaşım durumu değiştiriliyor - Comment ID: {comment_id}, Template: {template_type}")
         
         # Önce comment_id ve template_type eşleşmesini kontrol et
+        # (Google açıklaması yeni duruma göre yazılacağı için mevcut durumu okumak gerekiyor)
         share = await self.collection.find_one({
             "comment_id": comment_id,
             "image_template_type": template_type
@@ -248,20 +508,20 @@ class ShareService:
                 "Lütfen önce bu yorum için görsel oluşturun."
             )
 
-        new_status = not share.get("is_shared", False)
+        current_status = share.get("is_shared", False)
+        new_status = not current_status
         
         print(f"📊 Yeni paylaşım durumu: {'Paylaşıldı' if new_status else 'Paylaşım kaldırıldı.'}")
 
+        # Tik veya çarpı işareti ekle
+        status_symbol = "✅" if new_status else "❌"
+        # Yeni açıklama oluştur
+        new_description = f"Paylaşım: {status_symbol} Uniyorum Comment ID: {comment_id}"
+
         # Google Photos açıklamasını güncelle
         if share.get("google_photos_id"):
             print(f"🖼️ Google Photos açıklaması güncelleniyor...")
             try:
-                # Tik veya çarpı işareti ekle
-                status_symbol = "✅" if new_status else "❌"
-                
-                # Yeni açıklama oluştur
-                new_description = f"Paylaşım: {status_symbol} Uniyorum Comment ID: {comment_id}"
-                     
                 print(f"📝 Yeni açıklama: {new_description}")
                 
                 # Google Photos açıklamasını güncelle
@@ -292,20 +552,21 @@ class ShareService:
         if new_status and not share.get("shared_date"):
             update_data["shared_date"] = current_time
 
-        result = await self.collection.update_one(
-            {"_id": share["_id"]},
-            {"$set": update_data}
+        # Filtredeki is_shared, okuma ile yazma arasında durumu başka bir isteğin
+        # değiştirmesine karşı koruma sağlar (iyimser kilit).
+        updated_share = await self.collection.find_one_and_update(
+            {"_id": share["_id"], "is_shared": current_status},
+            {"$set": update_data},
+            projection=SHARE_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
 
-        if result.modified_count == 0:
+        if updated_share is None:
             print("❌ Veritabanı güncellemesi başarısız")
             raise ValueError("Paylaşım durumu güncellenemedi")
 
         print("✅ Veritabanı başarıyla güncellendi")
-        updated_share = await self.collection.find_one({
-            "comment_id": comment_id,
-            "image_template_type": template_type
-        })
+        await self._invalidate_cache(comment_id)
         return DatabaseShare(**updated_share)
 
 
@@ -323,32 +584,34 @@ class ShareService:
         Raises:
             ValueError: Paylaşım bulunamazsa
         """
-        # Paylaşımı bul
-        share = await self.collection.find_one({
+        share_filter = {
             "comment_id": comment_id,
             "image_template_type": template_type
-        })
-        
-        if not share:
-            raise ValueError(f"Paylaşım bulunamadı. (comment_id: {comment_id}, template_type: {template_type})")
-        
-        # Mevcut etiketleri al
-        current_tags = share.get("tags", [])
-        
-        # Yeni etiketleri ekle (var olanları atla)
-        updated_tags = list(set(current_tags + new_tags))
-        
-        # Etiketleri güncelle
-        result = await self.collection.update_one(
-            {"_id": share["_id"]},
-            {"$set": {"tags": updated_tags}}
+        }
+
+        # Boş listede {"$not": {"$all": []}} her kaydı eşleştirir ve hiçbir şey değiştirmeden başarı dönerdi;
+        # eklenecek etiket olmadığı için önceki davranıştaki gibi "zaten mevcut" hatası verilir
+        if not new_tags:
+            if not await self.collection.find_one(share_filter, {"_id": 1}):
+                raise ValueError(f"Paylaşım bulunamadı. (comment_id: {comment_id}, template_type: {template_type})")
+            raise ValueError(f"Etiketler zaten mevcut. (comment_id: {comment_id}, template_type: {template_type})")
+
+        # Yeni etiketleri sunucu tarafında ekle (var olanları atla).
+        # Filtre yalnızca en az bir etiketi eksik olan kaydı eşleştirir.
+        updated_share = await self.collection.find_one_and_update(
+            {**share_filter, "tags": {"$not": {"$all": new_tags}}},
+            {"$addToSet": {"tags": {"$each": new_tags}}},
+            projection=SHARE_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        
-        if result.modified_count == 0:
+
+        if updated_share is None:
+            # Eşleşme yoksa kayıt ya hiç yok ya da tüm etiketler zaten mevcut
+            if not await self.collection.find_one(share_filter, {"_id": 1}):
+                raise ValueError(f"Paylaşım bulunamadı. (comment_id: {comment_id}, template_type: {template_type})")
             raise ValueError(f"Etiketler zaten mevcut. (comment_id: {comment_id}, template_type: {template_type})")
         
-        # Güncellenmiş paylaşımı döndür
-        updated_share = await self.collection.find_one({"_id": share["_id"]})
+        await self._invalidate_cache(comment_id)
         return DatabaseShare(**updated_share)
     
 
@@ -366,24 +629,23 @@ class ShareService:
         Raises:
             ValueError: Paylaşım bulunamazsa
         """
-        # Paylaşımı bul
-        share = await self.collection.find_one({
+        share_filter = {
             "comment_id": comment_id,
             "image_template_type": template_type
-        })
-        
-        if not share:
-            raise ValueError(f"Paylaşım bulunamadı. (comment_id: {comment_id}, template_type: {template_type})")
-        
-        # Hata mesajını güncelle
-        result = await self.collection.update_one(
-            {"_id": share["_id"]},
-            {"$set": {"error_message": error_message}}
+        }
+
+        # Hata mesajını güncelle; mesaj zaten aynıysa kayıt eşleşmez
+        updated_share = await self.collection.find_one_and_update(
+            {**share_filter, "error_message": {"$ne": error_message}},
+            {"$set": {"error_message": error_message}},
+            projection=SHARE_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        
-        if result.modified_count == 0:
+
+        if updated_share is None:
+            if not await self.collection.find_one(share_filter, {"_id": 1}):
+                raise ValueError(f"Paylaşım bulunamadı. (comment_id: {comment_id}, template_type: {template_type})")
             raise ValueError(f"Yorum zaten güncellenmiş. (comment_id: {comment_id}, template_type: {template_type}) ")
         
-        # Güncellenmiş paylaşımı döndür
-        updated_share = await self.collection.find_one({"_id": share["_id"]})
+        await self._invalidate_cache(comment_id)
         return DatabaseShare(**updated_share)
@@ -0,0 +1,292 @@
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Annotated, Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, ValidationError
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+DEFAULT_TEMPLATE_TYPE = "instagram-post-square"
+
+# Dosya adı olarak kullanıldığı için template_type yalnızca bu karakterleri içerebilir
+_TEMPLATE_TYPE_PATTERN = re.compile(r"^[a-z0-9][a-z0-9-]*$")
+
+
+def _parse_color(value):
+    """"#rrggbb" / "#rrggbbaa" biçimindeki renkleri tuple'a çevirir; liste olarak verilenler olduğu gibi geçer."""
+    if isinstance(value, str):
+        hex_value = value.lstrip("#")
+        if len(hex_value) not in (6, 8):
+            raise ValueError(f"Geçersiz renk: {value}")
+        return tuple(int(hex_value[i:i + 2], 16) for i in range(0, len(hex_value), 2))
+    return value
+
+
+RGBColor = Annotated[Tuple[int, int, int], BeforeValidator(_parse_color)]
+RGBAColor = Annotated[Tuple[int, int, int, int], BeforeValidator(_parse_color)]
+
+
+class _Definition(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class CanvasDefinition(_Definition):
+    width: int = Field(gt=0)
+    height: int = Field(gt=0)
+
+
+class PaletteDefinition(_Definition):
+    colors: Tuple[RGBColor, ...] = Field(min_length=1)
+    angle: float = 45.0
+
+
+class ShadowDefinition(_Definition):
+    offset: int
+    blur: float = Field(ge=0)
+    color: RGBAColor
+
+
+class FrameDefinition(_Definition):
+    padding_x: int = Field(100, ge=0)
+    padding_y: Optional[int] = Field(None, ge=0)  # None ise gövde kare olur ve dikeyde ortalanır
+    radius: int = Field(20, ge=0)
+    shadows: Tuple[ShadowDefinition, ...] = ()
+
+
+class FontDefinition(_Definition):
+    size: int = Field(gt=0)
+    weight: Optional[int] = None  # None ise fontun varsayılan kalınlığı
+
+
+class FontsDefinition(_Definition):
+    header: FontDefinition
+    header_emphasis: FontDefinition  # Başlıklardaki son (en belirgin) satır
+    comment: FontDefinition
+    footer: FontDefinition
+
+
+class ContentDefinition(_Definition):
+    padding_x: int = Field(50, ge=0)
+    padding_top: int = Field(40, ge=0)
+    text_color: RGBColor = (30, 30, 30)
+
+
+class HeadersDefinition(_Definition):
+    line_gap: int = 5  # Aynı başlığın satırları arası
+    block_gap: int = 15  # Başlık blokları arası
+    last_gap: int = 40  # Son başlık ile ayırıcı çizgi arası
+
+
+class DividerDefinition(_Definition):
+    width: int = 2
+    color: RGBColor = (200, 200, 200)
+    gap: int = 30  # Çizgi ile yorum arası
+
+
+class CommentDefinition(_Definition):
+    emoji_size: int = Field(40, gt=0)
+    line_spacing: int = 18
+
+
+class FooterDefinition(_Definition):
+    bottom_padding: int = 50
+    color: RGBColor = (120, 120, 120)
+    date_format: str = "%d.%m.%Y %H:%M:%S"
+    anonymous_name: str = "Anonim"
+
+
+class LimitsDefinition(_Definition):
+    max_comment_lines: Optional[int] = Field(None, gt=0)  # Verilmezse çerçeveye sığan satır sayısı
+
+
+class TemplateDefinition(_Definition):
+    """templates/<template_type>.json dosyasının şeması.
+    Çıktıyı değiştiren her düzenlemede version artırılmalıdır; sürüm plan önbelleğinin
+    ve paylaşım parmak izinin anahtarına girer."""
+    template_type: str = Field(pattern=_TEMPLATE_TYPE_PATTERN.pattern)
+    version: int = Field(ge=1)
+    name: str
+    description: Optional[str] = None
+    canvas: CanvasDefinition
+    palette: PaletteDefinition
+    frame: FrameDefinition = FrameDefinition()
+    fonts: FontsDefinition
+    content: ContentDefinition = ContentDefinition()
+    headers: HeadersDefinition = HeadersDefinition()
+    divider: DividerDefinition = DividerDefinition()
+    comment: CommentDefinition = CommentDefinition()
+    footer: FooterDefinition = FooterDefinition()
+    limits: LimitsDefinition = LimitsDefinition()
+
+
+class RenderPlan(NamedTuple):
+    """Şablondan bir kez derlenen, değiştirilemez çizim planı.
+    Tüm koordinatlar ve katman anahtarı önceden hesaplanır; render sırasında yalnızca okunur."""
+    template_type: str
+    version: int
+    size: Tuple[int, int]
+    colors: Tuple[Tuple[int, int, int], ...]
+    gradient_angle: float
+    frame_rect: Tuple[int, int, int, int]
+    frame_radius: int
+    shadow_layers: Tuple[Tuple[int, float, Tuple[int, int, int, int]], ...]
+    base_plate_key: tuple  # Gradyan + çerçeve + gölge katmanının önbellek anahtarı
+    content_x: int
+    content_y: int
+    content_width: int
+    text_color: Tuple[int, int, int]
+    header_font: Tuple[int, Optional[int]]  # (boyut, kalınlık)
+    header_emphasis_font: Tuple[int, Optional[int]]
+    header_line_gap: int
+    header_block_gap: int
+    header_last_gap: int
+    divider_width: int
+    divider_color: Tuple[int, int, int]
+    divider_gap: int
+    comment_font: Tuple[int, Optional[int]]
+    comment_emoji_size: int
+    comment_line_spacing: int
+    comment_max_lines: Optional[int]
+    footer_font: Tuple[int, Optional[int]]
+    footer_color: Tuple[int, int, int]
+    footer_bottom_padding: int
+    date_format: str
+    anonymous_name: str
+
+    @property
+    def fonts(self) -> Tuple[Tuple[int, Optional[int]], ...]:
+        """Planın kullandığı (boyut, kalınlık) çiftleri; worker ısıtılırken kullanılır."""
+        return tuple(dict.fromkeys((self.header_font, self.header_emphasis_font, self.comment_font, self.footer_font)))
+
+
+def compile_render_plan(definition: TemplateDefinition) -> RenderPlan:
+    """Şablon tanımını çizim planına derler. Geometri tuvale sığmıyorsa ValueError fırlatır."""
+    width, height = definition.canvas.width, definition.canvas.height
+    frame = definition.frame
+
+    body_width = width - 2 * frame.padding_x
+    if frame.padding_y is None:
+        # Kare gövde, dikeyde ortalanmış
+        body_height = body_width
+        body_y = (height - body_height) // 2
+    else:
+        body_height = height - 2 * frame.padding_y
+        body_y = frame.padding_y
+    frame_rect = (frame.padding_x, body_y, width - frame.padding_x, body_y + body_height)
+    if body_width <= 0 or body_height <= 0 or body_y < 0:
+        raise ValueError(f"'{definition.template_type}' şablonunun çerçevesi tuvale sığmıyor: {frame_rect}")
+
+    content_width = body_width - 2 * definition.content.padding_x
+    if content_width <= 0:
+        raise ValueError(f"'{definition.template_type}' şablonunda içerik genişliği sıfırdan büyük olmalı")
+
+    colors = tuple(definition.palette.colors)
+    shadow_layers = tuple((shadow.offset, shadow.blur, shadow.color) for shadow in frame.shadows)
+
+    def font(spec: FontDefinition) -> Tuple[int, Optional[int]]:
+        return (spec.size, spec.weight)
+
+    return RenderPlan(
+        template_type=definition.template_type,
+        version=definition.version,
+        size=(width, height),
+        colors=colors,
+        gradient_angle=definition.palette.angle,
+        frame_rect=frame_rect,
+        frame_radius=frame.radius,
+        shadow_layers=shadow_layers,
+        base_plate_key=((width, height), colors, definition.palette.angle, frame_rect, frame.radius, shadow_layers),
+        content_x=frame_rect[0] + definition.content.padding_x,
+        content_y=frame_rect[1] + definition.content.padding_top,
+        content_width=content_width,
+        text_color=definition.content.text_color,
+        header_font=font(definition.fonts.header),
+        header_emphasis_font=font(definition.fonts.header_emphasis),
+        header_line_gap=definition.headers.line_gap,
+        header_block_gap=definition.headers.block_gap,
+        header_last_gap=definition.headers.last_gap,
+        divider_width=definition.divider.width,
+        divider_color=definition.divider.color,
+        divider_gap=definition.divider.gap,
+        comment_font=font(definition.fonts.comment),
+        comment_emoji_size=definition.comment.emoji_size,
+        comment_line_spacing=definition.comment.line_spacing,
+        comment_max_lines=definition.limits.max_comment_lines,
+        footer_font=font(definition.fonts.footer),
+        footer_color=definition.footer.color,
+        footer_bottom_padding=definition.footer.bottom_padding,
+        date_format=definition.footer.date_format,
+        anonymous_name=definition.footer.anonymous_name
+    )
+
+
+# (template_type, version) -> plan; aynı sürüm süreç ömrü boyunca bir kez derlenir
+_plans: Dict[Tuple[str, int], RenderPlan] = {}
+_plans_lock = threading.Lock()
+
+
+def get_compiled_plan(definition: TemplateDefinition) -> RenderPlan:
+    """Tanımın planını önbellekten döndürür, yoksa derleyip önbelleğe ekler."""
+    key = (definition.template_type, definition.version)
+    plan = _plans.get(key)
+    if plan is None:
+        with _plans_lock:
+            plan = _plans.get(key)
+            if plan is None:
+                plan = compile_render_plan(definition)
+                _plans[key] = plan
+    return plan
+
+
+def template_path(template_type: str) -> str:
+    return os.path.join(TEMPLATES_DIR, f"{template_type}.json")
+
+
+def read_template_definition(path: str) -> TemplateDefinition:
+    """Şablon dosyasını okuyup doğrular. Dosya geçersizse ValueError fırlatır."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return TemplateDefinition.model_validate(json.load(f))
+    except (ValidationError, json.JSONDecodeError) as e:
+        raise ValueError(f"Şablon dosyası geçersiz ({path}): {str(e)}")
+
+
+def find_template_definition(template_type: str) -> Optional[TemplateDefinition]:
+    """templates/<template_type>.json dosyasını diskten okur. Dosya yoksa None döner."""
+    if not _TEMPLATE_TYPE_PATTERN.match(template_type or ""):
+        return None
+    path = template_path(template_type)
+    if not os.path.exists(path):
+        return None
+    definition = read_template_definition(path)
+    if definition.template_type != template_type:
+        raise ValueError(f"Şablon dosyasındaki template_type ({definition.template_type}) dosya adıyla ({template_type}) uyuşmuyor")
+    return definition
+
+
+@lru_cache(maxsize=None)
+def load_template_definition(template_type: str) -> Optional[TemplateDefinition]:
+    """Şablon dosyasını süreç başına bir kez okur. Dosya yoksa None döner.
+    Sunucu süreçlerinde şablonlar TemplateRegistry üzerinden okunur; bu önbellek
+    registry'nin olmadığı yerler (render worker ısıtması, betikler) içindir."""
+    return find_template_definition(template_type)
+
+
+def available_template_types() -> List[str]:
+    """templates dizinindeki şablon tiplerini döndürür."""
+    if not os.path.isdir(TEMPLATES_DIR):
+        return []
+    return sorted(name[:-len(".json")] for name in os.listdir(TEMPLATES_DIR) if name.endswith(".json"))
+
+
+def get_render_plan(template_type: Optional[str] = None) -> RenderPlan:
+    """Şablon tipinin derlenmiş planını döndürür. Şablon bulunamazsa ValueError fırlatır."""
+    template_type = template_type or DEFAULT_TEMPLATE_TYPE
+    definition = load_template_definition(template_type)
+    if definition is None:
+        raise ValueError(
+            f"Geçersiz template type: '{template_type}'. Mevcut şablonlar: {', '.join(available_template_types())}"
+        )
+    return get_compiled_plan(definition)
@@ -0,0 +1,174 @@
+import asyncio
+from typing import Dict, List, NamedTuple, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from db.models import DatabaseTemplate
+from services.template_plan import (
+    DEFAULT_TEMPLATE_TYPE,
+    RenderPlan,
+    available_template_types,
+    find_template_definition,
+    get_compiled_plan
+)
+
+TEMPLATES_COLLECTION = "image_templates"
+# Şablon değişikliklerinin sürüm sayacı; polling yapan süreçler yalnızca bu belgeyi okur
+REGISTRY_COLLECTION = "template_registry"
+REGISTRY_VERSION_ID = "version"
+
+
+class _RegistryState(NamedTuple):
+    """Bir yüklemenin sonucu. Tek referansla değiştirilir; okuyucular kilit almaz."""
+    version: int
+    templates: Dict[str, DatabaseTemplate]
+    plans: Dict[str, RenderPlan]
+
+
+class TemplateRegistry:
+    """Şablonları süreç başında bir kez yükleyip bellekten sunar.
+
+    image_templates kayıtları ve templates/*.json tanımlarından derlenen planlar birlikte
+    tutulur; görsel üretimindeki şablon doğrulaması ve plan okuması I/O yapmaz.
+    Değişiklikler MongoDB change stream ile izlenir. Change stream desteklenmiyorsa
+    (replica set olmayan sunucular) sürüm sayacı poll_interval aralıklarla kontrol edilir.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, poll_interval: float = 5.0, use_change_stream: bool = True):
+        self.db = db
+        self.collection = self.db.get_collection(TEMPLATES_COLLECTION)
+        self.registry_collection = self.db.get_collection(REGISTRY_COLLECTION)
+        self.poll_interval = poll_interval
+        self.use_change_stream = use_change_stream
+        self._state = _RegistryState(0, {}, {})
+        self._reload_lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Şablonları yükler ve değişiklikleri izlemeye başlar."""
+        await self.reload()
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self) -> None:
+        """İzleme görevini durdurur."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
+    async def _read_version(self) -> int:
+        document = await self.registry_collection.find_one({"_id": REGISTRY_VERSION_ID})
+        return document["version"] if document else 0
+
+    @staticmethod
+    def _compile_plans(template_types: List[str]) -> Dict[str, RenderPlan]:
+        """Şablon dosyalarını okuyup planları derler. Aynı sürümün planı önbellekten gelir."""
+        plans = {}
+        for template_type in template_types:
+            try:
+                definition = find_template_definition(template_type)
+            except ValueError as e:
+                print(f"⚠️ Şablon yüklenemedi: {str(e)}")
+                continue
+            if definition is None:
+                print(f"⚠️ Şablon dosyası bulunamadı: templates/{template_type}.json")
+                continue
+            try:
+                plans[template_type] = get_compiled_plan(definition)
+            except ValueError as e:
+                print(f"⚠️ Şablon derlenemedi: {str(e)}")
+        return plans
+
+    async def reload(self) -> None:
+        """Kayıtları ve şablon dosyalarını yeniden okuyup yeni durumu tek seferde yayınlar."""
+        async with self._reload_lock:
+            # Sayaç kayıtlardan önce okunur; arada gelen değişiklik bir sonraki kontrolde yakalanır
+            version = await self._read_version()
+            documents = await self.collection.find({}, {"_id": 0}).to_list(length=None)
+            templates = {document["template_type"]: DatabaseTemplate(**document) for document in documents}
+
+            # Kayıtlı şablonlar ve dosyası olan tüm şablonlar çizilebilir
+            template_types = list(dict.fromkeys([*templates, *available_template_types(), DEFAULT_TEMPLATE_TYPE]))
+            plans = await asyncio.to_thread(self._compile_plans, template_types)
+
+            self._state = _RegistryState(version, templates, plans)
+            print(f"✅ Şablonlar yüklendi: {len(templates)} kayıt, {len(plans)} plan (sürüm {version})")
+
+    async def publish(self) -> int:
+        """Şablon değişikliğini tüm süreçlere duyurur ve bu süreçte hemen uygular.
+        Yeni sürüm numarasını döndürür."""
+        document = await self.registry_collection.find_one_and_update(
+            {"_id": REGISTRY_VERSION_ID},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        await self.reload()
+        return document["version"]
+
+    async def _reload_safely(self) -> None:
+        # Arka plan görevinde hata olursa mevcut durum korunur, sonraki değişiklikte tekrar denenir
+        try:
+            await self.reload()
+        except Exception as e:
+            print(f"⚠️ Şablonlar yeniden yüklenemedi: {str(e)}")
+
+    async def _watch_loop(self) -> None:
+        if self.use_change_stream:
+            try:
+                await self._watch_change_stream()
+                return
+            except Exception as e:
+                # Replica set olmayan sunucular ve change stream desteklemeyen istemciler
+                print(f"⚠️ Change stream kullanılamıyor, sürüm sayacı izlenecek: {str(e)}")
+        await self._poll_loop()
+
+    async def _watch_change_stream(self) -> None:
+        """Şablon kayıtları ve sürüm sayacındaki değişiklikleri izler.
+        Akış ilk açılışta açılamazsa hata yükseltilir (polling'e geçilir); sonradan koparsa
+        yeniden açılır. Her açılışta, akış kapalıyken kaçan değişiklikler için yeniden yüklenir."""
+        pipeline = [{"$match": {"ns.coll": {"$in": [TEMPLATES_COLLECTION, REGISTRY_COLLECTION]}}}]
+        opened = False
+        while True:
+            try:
+                async with self.db.watch(pipeline) as stream:
+                    opened = True
+                    await self._reload_safely()
+                    async for _ in stream:
+                        await self._reload_safely()
+            except PyMongoError as e:
+                if not opened:
+                    raise
+                print(f"⚠️ Şablon change stream'i koptu, yeniden açılıyor: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _poll_loop(self) -> None:
+        """Sürüm sayacı değiştiyse şablonları yeniden yükler."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                changed = await self._read_version() != self._state.version
+            except Exception as e:
+                print(f"⚠️ Şablon sürümü okunamadı: {str(e)}")
+                continue
+            if changed:
+                await self._reload_safely()
+
+    @property
+    def version(self) -> int:
+        return self._state.version
+
+    def get_all(self) -> List[DatabaseTemplate]:
+        """Kayıtlı şablonları döndürür."""
+        return list(self._state.templates.values())
+
+    def get_plan(self, template_type: Optional[str]) -> RenderPlan:
+        """Şablonun derlenmiş planını bellekten döndürür. Şablon yoksa ValueError fırlatır."""
+        plans = self._state.plans
+        plan = plans.get(template_type or DEFAULT_TEMPLATE_TYPE)
+        if plan is None:
+            raise ValueError(f"Geçersiz template type: '{template_type}'. Mevcut şablonlar: {', '.join(plans)}")
+        return plan
@@ -1,23 +1,29 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from core.config import get_settings
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from models.template import TemplateResponse, BatchTemplateResponse
 from db.models import DatabaseTemplate
 from models.template import CreateTemplateTypeRequest
+from services.template_plan import find_template_definition
+from services.template_registry import TEMPLATES_COLLECTION, TemplateRegistry
 
 class TemplateService:
-    def __init__(self):
-        settings = get_settings()
-        self.client = AsyncIOMotorClient(settings.MONGO_URI)
-        self.db = self.client.get_database(settings.MONGO_DB_NAME)
-        self.collection = self.db.get_collection("image_templates")
+    def __init__(self, db: AsyncIOMotorDatabase, registry: Optional[TemplateRegistry] = None):
+        self.db = db
+        self.collection = self.db.get_collection(TEMPLATES_COLLECTION)
+        # Verilirse şablonlar bellekten okunur ve değişiklikler diğer süreçlere duyurulur
+        self.registry = registry
 
     async def get_all_templates(self) -> BatchTemplateResponse:
-        """Tüm şablonları veritabanından çeker ve döndürür."""
-        cursor = self.collection.find({})
-        templates = await cursor.to_list(length=None)
+        """Tüm şablonları döndürür. Registry varsa veritabanına gidilmez."""
+        if self.registry is not None:
+            templates = self.registry.get_all()
+        else:
+            cursor = self.collection.find({})
+            templates = [DatabaseTemplate(**template) for template in await cursor.to_list(length=None)]
         
         template_responses = [
-            TemplateResponse(data=DatabaseTemplate(**template))
+            TemplateResponse(data=template)
             for template in templates
         ]
         
@@ -33,17 +39,25 @@ class TemplateService:
             print(f"⚠️ Template zaten mevcut. ({request.template_type})")
             raise ValueError(f"Template zaten mevcut. '{request.template_type}'")
         
+        # Şablon tanımı templates/<template_type>.json dosyasından okunur; dosya yoksa veya geçersizse kaydedilmez
+        definition = find_template_definition(request.template_type)
+        if definition is None:
+            raise ValueError(f"Şablon dosyası bulunamadı: templates/{request.template_type}.json")
+
         # Yeni template oluştur
         template_data = DatabaseTemplate(
             template_type=request.template_type,
             name=request.name,
             size=request.size,
             description=request.description,
-            template_path=f"templates/{request.template_type}.json" # şimdilik böyle
+            template_path=f"templates/{request.template_type}.json"
         )
         
         # Veritabanına ekle
         result = await self.collection.insert_one(template_data.model_dump())
         print(f"✅ Yeni template eklendi. ID: {result.inserted_id}")
+
+        if self.registry is not None:
+            await self.registry.publish()
         
         return TemplateResponse(data=template_data) 
\ No newline at end of file
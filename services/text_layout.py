@@ -0,0 +1,140 @@
+import threading
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from cachetools import LRUCache
+from PIL import ImageFont
+
+from services.emoji_segmenter import EmojiSegmenter, get_emoji_segmenter
+
+
+class TextLayout:
+    """Metni gerçek piksel genişliğine göre satırlara bölen, tekrar kullanılabilir yerleşim aşaması.
+
+    Kelime genişlikleri FreeTypeFont.getlength ile ölçülür ve (font, kalınlık, boyut)
+    başına bir LRU önbellekte tutulur. Emoji cluster'ları çizimde olduğu gibi
+    emoji_size genişliğinde sayılır. Taşan son satır ikili arama ile kısaltılır.
+    """
+
+    def __init__(self, segmenter: Optional[EmojiSegmenter] = None, cache_size: int = 8192):
+        self.segmenter = segmenter if segmenter is not None else get_emoji_segmenter()
+        self._widths = LRUCache(maxsize=cache_size)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _font_key(font: ImageFont.FreeTypeFont, weight: Optional[int]) -> tuple:
+        # Değişken fontta kalınlık font nesnesinden okunamadığı için çağıran tarafından verilir.
+        # Font bellekten yüklenmiş olabileceği için dosya yolu yerine font adı kullanılır.
+        return (font.getname(), font.size, weight)
+
+    def _measure_uncached(self, text: str, font: ImageFont.FreeTypeFont, emoji_size: Optional[int]) -> float:
+        if emoji_size is None:
+            return font.getlength(text)
+        width = 0.0
+        for segment, is_emoji in self.segmenter.segment(text):
+            width += emoji_size if is_emoji else font.getlength(segment)
+        return width
+
+    def measure(self, text: str, font: ImageFont.FreeTypeFont, weight: Optional[int] = None,
+                emoji_size: Optional[int] = None) -> float:
+        """Metnin piksel genişliğini (önbellekten) döndürür."""
+        key = (self._font_key(font, weight), emoji_size, text)
+        with self._lock:
+            width = self._widths.get(key)
+        if width is None:
+            width = self._measure_uncached(text, font, emoji_size)
+            with self._lock:
+                self._widths[key] = width
+        return width
+
+    def _cut_points(self, text: str, emoji_size: Optional[int]) -> List[int]:
+        """Metnin emoji cluster'larını bölmeden kesilebileceği konumlar."""
+        if emoji_size is None:
+            return list(range(len(text) + 1))
+        points = [0]
+        position = 0
+        for segment, is_emoji in self.segmenter.segment(text):
+            if is_emoji:
+                position += len(segment)
+                points.append(position)
+            else:
+                points.extend(range(position + 1, position + len(segment) + 1))
+                position += len(segment)
+        return points
+
+    def _longest_fitting_prefix(self, text: str, fits: Callable[[str], bool],
+                                emoji_size: Optional[int]) -> int:
+        """fits(text[:k]) koşulunu sağlayan en büyük k değerini ikili arama ile bulur."""
+        points = self._cut_points(text, emoji_size)
+        low, high = 0, len(points) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if fits(text[:points[middle]]):
+                low = middle
+            else:
+                high = middle - 1
+        return points[low]
+
+    def wrap(self, text: str, font: ImageFont.FreeTypeFont, max_width: float,
+             weight: Optional[int] = None, emoji_size: Optional[int] = None) -> List[str]:
+        """Metni max_width piksele sığacak satırlara böler.
+        Tek başına sığmayan kelimeler karakter sınırından bölünür."""
+        space_width = self.measure(" ", font, weight, emoji_size)
+        lines: List[str] = []
+        current: List[str] = []
+        current_width = 0.0
+
+        for word in text.split():
+            word_width = self.measure(word, font, weight, emoji_size)
+            extra = word_width if not current else space_width + word_width
+            if current_width + extra <= max_width:
+                current.append(word)
+                current_width += extra
+                continue
+
+            if current:
+                lines.append(" ".join(current))
+                current, current_width = [], 0.0
+
+            # Satıra tek başına sığmayan kelimeyi parçala
+            while word_width > max_width:
+                cut = self._longest_fitting_prefix(
+                    word, lambda part: self.measure(part, font, weight, emoji_size) <= max_width, emoji_size
+                )
+                cut = max(cut, 1)
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = self.measure(word, font, weight, emoji_size)
+
+            if word:
+                current, current_width = [word], word_width
+
+        if current:
+            lines.append(" ".join(current))
+        return lines
+
+    def truncate(self, line: str, font: ImageFont.FreeTypeFont, max_width: float,
+                 weight: Optional[int] = None, emoji_size: Optional[int] = None,
+                 suffix: str = "...") -> str:
+        """Satırı sonuna suffix eklenmiş halde max_width'e sığacak şekilde kısaltır."""
+        cut = self._longest_fitting_prefix(
+            line, lambda part: self._measure_uncached(part + suffix, font, emoji_size) <= max_width, emoji_size
+        )
+        return line[:cut].rstrip() + suffix
+
+    def layout(self, text: str, font: ImageFont.FreeTypeFont, max_width: float,
+               max_lines: Optional[int] = None, weight: Optional[int] = None,
+               emoji_size: Optional[int] = None) -> List[str]:
+        """Metni satırlara böler; max_lines aşılırsa son satırı '...' ile kısaltır."""
+        lines = self.wrap(text, font, max_width, weight, emoji_size)
+        if max_lines is not None and len(lines) > max_lines:
+            lines = lines[:max(max_lines, 0)]
+            if lines:
+                lines[-1] = self.truncate(lines[-1], font, max_width, weight, emoji_size)
+        return lines
+
+
+@lru_cache()
+def get_text_layout() -> TextLayout:
+    """Süreç genelinde paylaşılan metin yerleşim aşamasını döndürür."""
+    return TextLayout()
@@ -0,0 +1,157 @@
+"""Google Photos API'nin kullandığımız uç noktalarını taklit eden sahte sunucu.
+
+GooglePhotosService'i gerçek hesaba dokunmadan denemek için kullanılır:
+    python tests/google_photos/fake_photos_api.py
+
+Varsayılan olarak sunucu ASGI üzerinden süreç içinde çalıştırılır. Ayrı bir süreçte
+çalıştırmak için `uvicorn tests.google_photos.fake_photos_api:app --port 8765` komutu
+kullanılıp GOOGLE_PHOTOS_API_URL=http://127.0.0.1:8765/v1 verilebilir.
+"""
+import asyncio
+import os
+import sys
+import uuid
+from itertools import count
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+app = FastAPI()
+_ids = count(1)
+uploads = {}  # upload_token -> içerik
+media_items = {}  # media_item_id -> media item
+albums = {}  # album_id -> {"album": ..., "items": [...]}
+request_log = []
+
+
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    request_log.append(f"{request.method} {request.url.path}")
+    return await call_next(request)
+
+
+@app.post("/v1/uploads")
+async def upload(request: Request):
+    content = await request.body()
+    token = f"upload-{next(_ids)}"
+    uploads[token] = content
+    return PlainTextResponse(token)
+
+
+@app.post("/v1/mediaItems:batchCreate")
+async def batch_create(body: dict):
+    results = []
+    for item in body["newMediaItems"]:
+        uploads.pop(item["simpleMediaItem"]["uploadToken"])
+        # Gerçek API gibi her media item (içerik aynı olsa bile) yeni ve rastgele bir id alır
+        media_id = uuid.uuid4().hex
+        media_items[media_id] = {
+            "id": media_id,
+            "description": item.get("description"),
+            "productUrl": f"https://photos.example/{media_id}"
+        }
+        results.append({"status": {"message": "Success"}, "mediaItem": media_items[media_id]})
+    return {"newMediaItemResults": results}
+
+
+@app.get("/v1/albums")
+async def list_albums(pageSize: int = 50):
+    return {"albums": [album["album"] for album in albums.values()][:pageSize]}
+
+
+@app.post("/v1/albums")
+async def create_album(body: dict):
+    album_id = f"album-{next(_ids)}"
+    albums[album_id] = {
+        "album": {"id": album_id, "title": body["album"]["title"], "isWriteable": True},
+        "items": []
+    }
+    return albums[album_id]["album"]
+
+
+@app.get("/v1/albums/{album_id}")
+async def get_album(album_id: str):
+    return albums[album_id]["album"]
+
+
+@app.post("/v1/albums/{album_id}:batchAddMediaItems")
+async def add_to_album(album_id: str, body: dict):
+    if album_id not in albums:
+        return JSONResponse({"error": {"code": 404, "message": "Album not found"}}, status_code=404)
+    albums[album_id]["items"].extend(body["mediaItemIds"])
+    return {}
+
+
+@app.post("/v1/albums/{album_id}:batchRemoveMediaItems")
+async def remove_from_album(album_id: str, body: dict):
+    items = albums[album_id]["items"]
+    albums[album_id]["items"] = [item for item in items if item not in body["mediaItemIds"]]
+    return {}
+
+
+@app.get("/v1/mediaItems/{media_item_id}")
+async def get_media_item(media_item_id: str):
+    return media_items[media_item_id]
+
+
+@app.patch("/v1/mediaItems/{media_item_id}")
+async def patch_media_item(media_item_id: str, body: dict, updateMask: str):
+    media_items[media_item_id]["description"] = body["description"]
+    return media_items[media_item_id]
+
+
+class _FakeCredentials:
+    token = "fake-token"
+    valid = True
+
+
+class _FakeTokenService:
+    """TokenService'in albüm kaydı kısmını bellekte tutar."""
+    def __init__(self):
+        self.album_id = None
+
+    async def get_album_id(self):
+        return self.album_id
+
+    async def save_album_id(self, album_id):
+        self.album_id = album_id
+
+    async def clear_album_id(self, album_id):
+        if self.album_id == album_id:
+            self.album_id = None
+
+
+async def main():
+    from services.google_photos_service import GooglePhotosService
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://photos.test/v1")
+    token_service = _FakeTokenService()
+    service = GooglePhotosService(token_service=token_service, http_client=client)
+    service.credentials = _FakeCredentials()
+
+    first = await service.upload_image(Image.new("RGB", (64, 64), "red"), 1, "instagram-post-square", None)
+    # Aynı içerik tekrar yüklense bile yeni bir media item oluşur ve eskisinin yerini alır
+    same = await service.upload_image(Image.new("RGB", (64, 64), "red"), 1, "instagram-post-square", first["id"])
+    second = await service.upload_image(Image.new("RGB", (64, 64), "blue"), 1, "instagram-post-square", same["id"])
+
+    # Kayıtlı albüm silinmişse yeniden çözülmeli
+    token_service.album_id = "album-deleted"
+    service.album_id = None
+    third = await service.upload_image(Image.new("RGB", (64, 64), "green"), 2, "instagram-post-square", None)
+    await service.aclose()
+
+    album = albums[token_service.album_id]
+    assert same["id"] != first["id"]
+    assert album["items"] == [second["id"], third["id"]]
+    assert media_items[first["id"]]["description"].startswith("İptal")
+    assert media_items[same["id"]]["description"].startswith("İptal")
+    print("\n".join(request_log))
+    print("✅ Sahte Photos API ile yükleme akışı başarılı")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
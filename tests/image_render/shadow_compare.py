@@ -0,0 +1,58 @@
+from services.image_renderer import ImageRenderer
+import numpy as np
+import time
+import os
+
+# Hızlı gölge yolunun (_create_frame_with_fast_shadows) mevcut yol ile
+# görsel olarak aynı olduğunu (SSIM) ve en az 10 kat hızlı olduğunu kontrol eder.
+SSIM_THRESHOLD = 0.99
+MIN_SPEEDUP = 10
+REPEAT = 10
+
+
+def ssim(a: np.ndarray, b: np.ndarray, block: int = 8) -> float:
+    """Gri tonlamalı iki görsel için blok tabanlı ortalama SSIM hesaplar."""
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    h = (a.shape[0] // block) * block
+    w = (a.shape[1] // block) * block
+    a = a[:h, :w].reshape(h // block, block, w // block, block).astype(np.float64)
+    b = b[:h, :w].reshape(h // block, block, w // block, block).astype(np.float64)
+
+    mu_a = a.mean(axis=(1, 3))
+    mu_b = b.mean(axis=(1, 3))
+    var_a = a.var(axis=(1, 3))
+    var_b = b.var(axis=(1, 3))
+    cov = (a * b).mean(axis=(1, 3)) - mu_a * mu_b
+
+    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim_map.mean())
+
+
+def timed(func):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func()
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+font_path = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "fonts", "OpenSans-VariableFont_wdth,wght.ttf")
+renderer = ImageRenderer(font_path)
+
+width, height = 1080, 1350
+frame_rect = [100, 135, 980, 1015]
+frame_radius = 20
+background = renderer._create_gradient_background(width, height, renderer.DEFAULT_COLORS)
+
+slow_time, slow = timed(lambda: renderer._create_frame_with_shadows(background.copy(), frame_rect, frame_radius))
+fast_time, fast = timed(lambda: renderer._create_frame_with_fast_shadows(background.copy(), frame_rect, frame_radius))
+
+score = ssim(np.asarray(slow.convert("L")), np.asarray(fast.convert("L")))
+speedup = slow_time / fast_time
+
+print(f"Mevcut yol: {slow_time * 1000:.1f} ms")
+print(f"Hızlı yol:  {fast_time * 1000:.1f} ms ({speedup:.1f}x)")
+print(f"SSIM: {score:.5f}")
+
+assert score >= SSIM_THRESHOLD, f"SSIM eşik altında: {score:.5f} < {SSIM_THRESHOLD}"
+assert speedup >= MIN_SPEEDUP, f"Hızlanma yetersiz: {speedup:.1f}x < {MIN_SPEEDUP}x"
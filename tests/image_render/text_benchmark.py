@@ -0,0 +1,53 @@
+from services.image_renderer import ImageRenderer
+from PIL import Image, ImageDraw, ImageFont
+import textwrap
+import time
+import os
+
+# Yorum satırı çiziminin satır başına maliyetini ölçer:
+# eski karakter karakter çizim ile parça (run) bazlı çizim karşılaştırılır.
+REPEAT = 20
+
+long_comment = (
+    "Pamuk şekeri gibi bir hoca. Öğretmez ama öğrenirsiniz, kırıcı konuşma, her yiğidin bir yoğurt "
+    "yiyişi var dedikleri gibi Süleyman hoca da diğer hocalardan farklı şekilde yoğurt yiyor. "
+    "Derslere düzenli katılım gösterirseniz, ödevlerinizi zamanında teslim ederseniz ve sınavlara "
+    "çalışırsanız geçmemeniz için hiçbir sebep yok. Üniversitedeki en güzel dönemlerimden biriydi, "
+    "herkese tavsiye ederim; özellikle ilk sınıftaki öğrencilerin bu hocanın dersini seçmesini öneririm."
+) * 2
+
+font_path = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "fonts", "OpenSans-VariableFont_wdth,wght.ttf")
+renderer = ImageRenderer(font_path)
+text_font = ImageFont.truetype(font_path, 40)
+lines = textwrap.wrap(long_comment, width=34)
+
+
+def draw_per_char(draw: ImageDraw.Draw, text: str, position: tuple) -> None:
+    """Önceki sürümdeki karakter karakter çizim."""
+    current_x, y = position
+    for char in text:
+        bbox = text_font.getbbox(char)
+        draw.text((current_x, y), char, font=text_font, fill=(30, 30, 30))
+        current_x += bbox[2]
+
+
+def draw_runs(draw: ImageDraw.Draw, text: str, position: tuple) -> None:
+    renderer._draw_text_with_emojis(draw, text, position, text_font, (30, 30, 30), 40)
+
+
+def per_line_ms(draw_func) -> float:
+    image = Image.new("RGBA", (1080, 1350), (255, 255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for i, line in enumerate(lines):
+            draw_func(draw, line, (150, 100 + i * 60))
+    return (time.perf_counter() - start) / (REPEAT * len(lines)) * 1000
+
+
+before = per_line_ms(draw_per_char)
+after = per_line_ms(draw_runs)
+
+print(f"{len(lines)} satır, ortalama {sum(len(l) for l in lines) / len(lines):.0f} karakter/satır")
+print(f"Karakter bazlı: {before:.3f} ms/satır")
+print(f"Parça bazlı:    {after:.3f} ms/satır ({before / after:.1f}x)")
@@ -0,0 +1,127 @@
+"""Aynı yeni comment_id'ler için eşzamanlı /shares/batch okumalarını dener.
+
+    python tests/share_service/concurrent_batch.py
+
+TEST_MONGO_URI verilirse gerçek bir MongoDB'de (geçici bir veritabanında) çalışır; eşzamanlı
+upsert yarışı gerçekte yalnızca burada oluşur. Verilmezse mongomock-motor kullanılır ve iki
+çağrı da yazmadan önce bekletilerek aynı eksik ID'leri yazmaya zorlanır; duplicate key
+hatası ayrıca taklit edilir.
+"""
+import asyncio
+import os
+import sys
+import uuid
+
+from pymongo.errors import BulkWriteError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from db.indexes import ensure_indexes  # noqa: E402
+from services.share_cache import InMemoryShareCache  # noqa: E402
+from services.share_service import ShareService  # noqa: E402
+
+COMMENT_IDS = list(range(1000, 1050))
+
+
+def create_service(db) -> ShareService:
+    # Her servis ayrı bir API süreci gibi kendi önbelleğine sahiptir
+    return ShareService(db, None, share_cache=InMemoryShareCache())
+
+
+async def check_documents(db) -> None:
+    for comment_id in COMMENT_IDS:
+        count = await db.shares.count_documents({"comment_id": comment_id})
+        assert count == 1, f"comment_id {comment_id} için {count} kayıt var"
+
+
+async def run_concurrent(db, mock: bool = False) -> None:
+    """İki servis aynı yeni ID'leri aynı anda ister; ikisi de hatasız tüm ID'leri döndürmeli."""
+    first, second = create_service(db), create_service(db)
+    if mock:
+        first.collection = _MockCollection(first.collection)
+        second.collection = _MockCollection(second.collection)
+    results = await asyncio.gather(
+        first.get_shares_batch_documents(COMMENT_IDS),
+        second.get_shares_batch_documents(COMMENT_IDS)
+    )
+    for result in results:
+        assert [share["comment_id"] for share in result] == COMMENT_IDS
+    await check_documents(db)
+    print("✅ Eşzamanlı batch okuması hatasız, her comment_id için tek kayıt")
+
+
+class _MockCollection:
+    """mongomock için bulk_write'ı tek tek update_one çağrılarıyla uygular (mongomock güncel pymongo'nun
+    UpdateOne'ını desteklemiyor). barrier verilirse yazma, iki çağrı da okumayı bitirene kadar bekletilir;
+    mongomock yarışı kendiliğinden oluşturmaz."""
+
+    def __init__(self, collection, barrier: asyncio.Barrier = None, error: BulkWriteError = None):
+        self._collection = collection
+        self._barrier = barrier
+        self._error = error
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def bulk_write(self, operations, ordered=True):
+        if self._barrier is not None:
+            await self._barrier.wait()
+        for operation in operations:
+            await self._collection.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+        if self._error is not None:
+            raise self._error
+
+
+def _bulk_write_error(code: int) -> BulkWriteError:
+    return BulkWriteError({"writeErrors": [{"index": 0, "code": code, "errmsg": "test"}], "writeConcernErrors": []})
+
+
+async def run_mock(db) -> None:
+    barrier = asyncio.Barrier(2)
+    first, second = create_service(db), create_service(db)
+    first.collection = _MockCollection(first.collection, barrier)
+    # Gerçek sunucuda yarışı kaybeden upsert E11000 alır
+    second.collection = _MockCollection(second.collection, barrier, _bulk_write_error(11000))
+    results = await asyncio.gather(
+        first.get_shares_batch_documents(COMMENT_IDS),
+        second.get_shares_batch_documents(COMMENT_IDS)
+    )
+    for result in results:
+        assert [share["comment_id"] for share in result] == COMMENT_IDS
+    await check_documents(db)
+    print("✅ Duplicate key (11000) hatası yutuldu, her comment_id için tek kayıt")
+
+    # Diğer yazma hataları yukarı iletilmeli
+    service = create_service(db)
+    service.collection = _MockCollection(service.collection, error=_bulk_write_error(121))
+    try:
+        await service.get_shares_batch_documents([2000])
+    except BulkWriteError:
+        print("✅ 11000 dışındaki yazma hataları yükseltiliyor")
+    else:
+        raise AssertionError("BulkWriteError yükseltilmedi")
+
+
+async def main() -> None:
+    mongo_uri = os.getenv("TEST_MONGO_URI")
+    if mongo_uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(mongo_uri)
+        db = client[f"graficast_test_{uuid.uuid4().hex[:8]}"]
+        try:
+            await ensure_indexes(db)
+            await run_concurrent(db)
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        db = AsyncMongoMockClient()["graficast_test"]
+        await ensure_indexes(db)
+        await run_mock(db)
+        await db.shares.delete_many({})
+        await run_concurrent(db, mock=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""İmzalı önizleme token'larının doğrulamasını dener.
+
+    python tests/share_service/preview_token.py
+
+Bozuk, süresi dolmuş ve çok uzun token'ların hem read_preview_token'da ValueError ile
+hem de API key istemeyen GET /shares/preview/{token} adresinde 403 ile reddedildiğini kontrol eder.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from api.routes import shares  # noqa: E402
+from core.config import get_settings  # noqa: E402
+from db.models import ApiShare  # noqa: E402
+from services import preview_token  # noqa: E402
+from services.preview_token import create_preview_token, read_preview_token  # noqa: E402
+
+api_share_data = ApiShare(
+    comment_id=1,
+    comment="Önizleme 😀",
+    comment_date=datetime(2024, 1, 2, 3, 4, 5),
+    writer_name="A",
+    uni_name="U",
+    image_template_type="instagram-post-square"
+)
+token = create_preview_token(api_share_data, "jpeg")
+body, _, signature = token.partition(".")
+
+# Geçerli token
+data, format, expires_at = read_preview_token(token)
+assert data == api_share_data and format == "jpeg" and expires_at > time.time()
+assert create_preview_token(api_share_data, "jpeg") == token, "Aynı girdiler aynı token'ı üretmeli"
+print("✅ Geçerli token okundu")
+
+invalid_tokens = {
+    "imza yok": body,
+    "yanlış imza": f"{body}.{signature[:-3]}abc",
+    "ASCII olmayan imza": "abc.é",
+    "ASCII olmayan gövde": f"é{body}.{signature}",
+    "boş imza": f"{body}.",
+    "çok uzun": "a" * (get_settings().PREVIEW_TOKEN_MAX_LENGTH + 1) + ".x",
+}
+for name, invalid in invalid_tokens.items():
+    try:
+        read_preview_token(invalid)
+    except ValueError:
+        continue
+    raise AssertionError(f"Token reddedilmedi: {name}")
+with mock.patch.object(preview_token.time, "time", return_value=expires_at + 1):
+    try:
+        read_preview_token(token)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Süresi dolmuş token reddedilmedi")
+print("✅ Bozuk, süresi dolmuş ve çok uzun token'lar ValueError ile reddedildi")
+
+# Public GET: render'a ulaşmadan 403 dönmeli (share_service hiç kullanılmaz)
+app = FastAPI()
+app.include_router(shares.public_router)
+app.state.share_service = None
+client = TestClient(app)
+for name, invalid in invalid_tokens.items():
+    response = client.get(f"/shares/preview/{invalid}")
+    assert response.status_code == 403, f"{name}: {response.status_code}"
+print("✅ GET /shares/preview/{token} bozuk token'larda 403 döndü")
@@ -0,0 +1,93 @@
+"""Redis önbelleğinin worker'lar arası geçersiz kılmalarda eski belgeyi geri yazmadığını dener.
+
+    python tests/share_service/redis_cache.py
+
+TEST_REDIS_URL verilirse gerçek bir Redis'te, verilmezse fakeredis ile çalışır. Mongo için
+mongomock-motor kullanılır. Bir servis Mongo'dan okurken ikinci bir servis (başka bir worker gibi)
+belgeyi güncelleyip önbelleği geçersiz kılar; ilk servisin okuduğu eski belge önbelleğe yazılmamalı.
+"""
+import asyncio
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from services import share_cache  # noqa: E402
+from services.share_cache import RedisShareCache  # noqa: E402
+from services.share_service import ShareService, _new_share_document  # noqa: E402
+
+COMMENT_IDS = [1, 2, 3]
+STALE_ID = 2
+
+
+class _RacingCollection:
+    """find sonucu okunduktan sonra, önbelleğe yazılmadan önce on_read'i çalıştırır."""
+
+    def __init__(self, collection, on_read):
+        self._collection = collection
+        self._on_read = on_read
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def find(self, *args, **kwargs):
+        cursor = self._collection.find(*args, **kwargs)
+        on_read = self._on_read
+
+        class _Cursor:
+            async def to_list(self, length=None):
+                documents = await cursor.to_list(length=length)
+                await on_read()
+                return documents
+
+        return _Cursor()
+
+
+def create_cache(url: str) -> RedisShareCache:
+    if os.getenv("TEST_REDIS_URL"):
+        return RedisShareCache(url, prefix="graficast-test:share:", version_prefix="graficast-test:share-version:")
+    import fakeredis
+    server = create_cache.server = getattr(create_cache, "server", None) or fakeredis.FakeServer()
+    with mock.patch.object(share_cache.redis, "from_url", lambda _: fakeredis.FakeAsyncRedis(server=server)):
+        return RedisShareCache(url)
+
+
+async def main() -> None:
+    from mongomock_motor import AsyncMongoMockClient
+    db = AsyncMongoMockClient()["graficast_test"]
+    for comment_id in COMMENT_IDS:
+        await db.shares.insert_one(_new_share_document(comment_id))
+
+    url = os.getenv("TEST_REDIS_URL", "redis://localhost")
+    reader_cache, writer_cache = create_cache(url), create_cache(url)
+    await reader_cache.clear()
+    reader = ShareService(db, None, share_cache=reader_cache)
+    writer = ShareService(db, None, share_cache=writer_cache)
+
+    async def update_from_other_worker():
+        await db.shares.update_one({"comment_id": STALE_ID}, {"$set": {"image_template_type": "landscape"}})
+        await writer._invalidate_cache(STALE_ID)
+
+    reader.collection = _RacingCollection(reader.collection, update_from_other_worker)
+    shares = await reader.get_shares_batch_documents(COMMENT_IDS)
+    assert [share["comment_id"] for share in shares] == COMMENT_IDS
+
+    cached = await reader_cache.get_many(COMMENT_IDS)
+    assert STALE_ID not in cached, "Başka worker'ın geçersiz kıldığı eski belge önbelleğe yazıldı"
+    assert sorted(cached) == [1, 3], cached
+    print("✅ Okuma sırasında başka worker'da geçersiz kılınan girdi önbelleğe yazılmadı")
+
+    # Sonraki okuma güncel belgeyi getirip önbelleğe yazmalı
+    reader.collection = db.shares
+    shares = await reader.get_shares_batch_documents([STALE_ID])
+    assert shares[0]["image_template_type"] == "landscape"
+    cached = await writer_cache.get_many([STALE_ID])
+    assert cached[STALE_ID][0]["image_template_type"] == "landscape"
+    print("✅ Sonraki okuma güncel belgeyi önbelleğe yazdı")
+
+    await reader_cache.clear()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())